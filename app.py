@@ -1,6 +1,15 @@
+import os
+
 import streamlit as st
 import pandas as pd
 
+from dashboard_data import DashboardData, count_in_range, date_window, load_run_frames, segment_frame, share_of_voice
+from voc_cluster import CLUSTER_COLUMN, collapse
+from voc_metrics import RUN_LOG_FILE
+from voc_schema import SOURCE_NAVER, SOURCE_YT_COMMENT, SOURCE_YT_VIDEO
+from voc_search import COUNT_CAP, SearchIndex
+from voc_store import STORE_DIR, VocStore
+
 # 1. 페이지 설정
 st.set_page_config(page_title="EV 충전소 여론 모니터링", layout="wide")
 
@@ -9,9 +18,15 @@ st.caption("전기차 동호회 및 유튜브의 실시간 반응을 분석합
 st.markdown("---")
 
 # 2. 데이터 불러오기
+#    로더는 세션 간 1개를 공유하고, 파일이 바뀐 경우에만(자란 만큼만) 다시 읽는다.
+#    정렬·SK/경쟁사/유튜브 분리·이슈 감지도 데이터가 바뀔 때 1회만 계산된 결과를 사용.
+@st.cache_resource
+def get_dashboard_data():
+    return DashboardData()
+
 try:
-    df = pd.read_csv("electlink_voc.csv")
-    df = df.sort_values(by="작성일", ascending=False)
+    views = get_dashboard_data().load()
+    df = views.df
     
     if "키워드" not in df.columns:
         st.error("⚠️ CSV 파일 양식이 오래되었습니다. 기존 CSV를 삭제 후 crawler.py를 다시 실행해주세요.")
@@ -21,21 +36,114 @@ except FileNotFoundError:
     st.stop()
 
 # ---------------------------------------------------------
-# [데이터 분리] SK vs 경쟁사 vs 유튜브
+# [기간 선택] 사이드바에서 고른 기간의 행만 화면으로 보냄 (기본: 최근 30일)
 # ---------------------------------------------------------
-# 1. SK (네이버 카페)
-sk_keywords = ["SK일렉링크", "일렉링크"]
-df_sk = df[df['키워드'].isin(sk_keywords)].copy()
+PAGE_SIZE = 50          # 표 한 페이지 행 수
+COMMENT_PAGE_SIZE = 20  # 댓글 피드 한 페이지 댓글 수
+DEFAULT_DAYS = 30
+
+dates = views.daily_counts.index
+first_day = pd.to_datetime(dates[0]).date() if len(dates) else pd.Timestamp.now().date()
+last_day = pd.to_datetime(dates[-1]).date() if len(dates) else first_day
+selected = st.sidebar.date_input(
+    "조회 기간",
+    value=(max(first_day, last_day - pd.Timedelta(days=DEFAULT_DAYS - 1)), last_day),
+    min_value=first_day,
+    max_value=last_day,
+)
+# 시작일만 고른 상태(선택 중)면 그 하루만 표시
+if isinstance(selected, (tuple, list)):
+    selected = tuple(selected) if len(selected) == 2 else (selected[0], selected[0])
+else:
+    selected = (selected, selected)
+date_from, date_to = (d.strftime("%Y-%m-%d") for d in selected)
+st.sidebar.caption(f"{date_from} ~ {date_to}")
+# 여러 카페에 올라온 같은 글·영상/댓글 중복을 1건으로 (voc_cluster 묶음 색인이 있을 때만)
+collapse_similar = st.sidebar.checkbox(
+    "유사 글 묶어 보기", value=False, disabled=CLUSTER_COLUMN not in df.columns,
+    help="제목이 거의 같은 글은 가장 최근 1건만 표시하고 건수도 1건으로 셉니다.",
+)
+
+
+def window(frame):
+    """기간으로 자른 프레임 (유사 글 묶기를 켜면 묶음마다 첫 행만)."""
+    frame = date_window(frame, date_from, date_to)
+    return collapse(frame) if collapse_similar else frame
+
+
+def count(segment):
+    """기간 내 건수 (날짜별 집계표의 구간 합 — 행을 다시 세지 않음. 유사 글 묶기를 켜면 묶음 수)."""
+    if collapse_similar:
+        return len(window(segment_frame(views, segment)))
+    return count_in_range(views, segment, date_from, date_to)
+
 
-# 2. 경쟁사 (네이버 카페)
-competitor_keywords = ["워터", "채비", "이브이시스"]
-df_comp = df[df['키워드'].isin(competitor_keywords)].copy()
+def paged_dataframe(frame, key, column_config, page_size=PAGE_SIZE):
+    """기간으로 자른 프레임에서 현재 페이지 행만 st.dataframe으로 전달."""
+    total = len(frame)
+    pages = max(1, -(-total // page_size))
+    page = st.number_input("페이지", min_value=1, max_value=pages, value=1, key=f"{key}_page") if pages > 1 else 1
+    start = (page - 1) * page_size
+    st.caption(f"총 {total}건 중 {start + 1 if total else 0}–{min(start + page_size, total)}건 ({page}/{pages} 페이지)")
+    st.dataframe(
+        frame.iloc[start:start + page_size][display_columns],
+        column_config={"작성일": st.column_config.DateColumn("작성일", format="YYYY-MM-DD"), **column_config},
+        hide_index=True,
+        use_container_width=True,
+    )
 
-# 3. 유튜브 (키워드에 '유튜브'가 포함된 모든 행)
-df_youtube = df[df['키워드'].str.contains("유튜브", na=False)].copy()
+
+# ---------------------------------------------------------
+# [데이터 분리] SK vs 경쟁사 vs 유튜브 (dashboard_data.build_views에서 미리 계산, 여기서는 기간만 잘라냄)
+# ---------------------------------------------------------
+df_sk = window(views.df_sk)
+df_comp = window(views.df_comp)
+df_youtube = window(views.df_youtube)
 
 # 화면에 보여줄 컬럼 설정
 display_columns = ["작성일", "키워드", "카페명", "제목", "링크"]
+link_config = {"링크": st.column_config.LinkColumn("바로가기", display_text="Link")}
+
+# =========================================================
+# [검색] 🔎 제목 검색 (voc_search 색인, 사이드바 기간 적용)
+# =========================================================
+SEARCH_SOURCES = {"네이버 카페": SOURCE_NAVER, "유튜브 영상": SOURCE_YT_VIDEO, "유튜브 댓글": SOURCE_YT_COMMENT}
+
+
+@st.cache_resource
+def get_search_index():
+    store = VocStore(STORE_DIR)
+    if not store.exists():
+        return None
+    # 색인 파일은 커밋하지 않으므로 앱이 뜰 때 저장소로 다시 만듦 (이후 검색 때는 새 행만 추가)
+    index = SearchIndex.of_store(store)
+    index.sync(store)
+    return index
+
+
+search_index = get_search_index()
+if search_index is not None:
+    query = st.text_input("🔎 제목 검색", placeholder="예: 충전 오류, 요금 인상, 고속도로 휴게소")
+    if query.strip():
+        search_col1, search_col2 = st.columns(2)
+        with search_col1:
+            search_keywords = st.multiselect("키워드", sorted(df["키워드"].dropna().unique().astype(str)))
+        with search_col2:
+            search_sources = st.multiselect("출처", list(SEARCH_SOURCES))
+        # 크롤러가 새 행을 추가했으면 그만큼만 색인에 반영 (상태 파일만 읽어 확인)
+        search_index.sync(VocStore(STORE_DIR))
+        found, total = search_index.search(
+            query, search_keywords, [SEARCH_SOURCES[s] for s in search_sources], date_from, date_to
+        )
+        total_text = f"{total}건 이상" if total >= COUNT_CAP else f"{total}건"
+        st.caption(f"'{query}' 검색 결과 {total_text} (최신 {len(found)}건 표시, {date_from} ~ {date_to})")
+        st.dataframe(
+            found[display_columns],
+            column_config={"작성일": st.column_config.DateColumn("작성일", format="YYYY-MM-DD"), **link_config},
+            hide_index=True,
+            use_container_width=True,
+        )
+    st.markdown("---")
 
 # =========================================================
 # [섹션 1] 🔵 SK일렉링크 (메인)
@@ -43,26 +151,23 @@ display_columns = ["작성일", "키워드", "카페명", "제목", "링크"]
 st.subheader("🔵 SK일렉링크 최신 여론 (Naver Cafe)")
 
 col1, col2, col3 = st.columns(3)
-issue_keywords = ["고장", "오류", "실패", "안됨", "불편", "느림", "점검", "대기", "화남", "비싸"]
-sk_issue_df = df_sk[df_sk['제목'].str.contains('|'.join(issue_keywords), na=False)]
 
 with col1:
-    st.metric("SK 수집 글", f"{len(df_sk)} 건")
+    st.metric("SK 수집 글", f"{count('sk')} 건")
 with col2:
-    st.metric("🚨 이슈 감지", f"{len(sk_issue_df)} 건", delta_color="inverse")
+    st.metric("🚨 이슈 감지", f"{count('sk_issue')} 건", delta_color="inverse")
 with col3:
-    last_time = df['수집시점'].iloc[0] if '수집시점' in df.columns and not df.empty else "-"
+    last_time = df['수집시점'].max() if '수집시점' in df.columns and not df.empty else None
+    last_time = last_time.strftime("%Y-%m-%d %H:%M") if pd.notna(last_time) else "-"
     st.write(f"최근 업데이트: {last_time}")
 
-st.dataframe(
-    df_sk[display_columns],
+paged_dataframe(
+    df_sk,
+    "sk",
     column_config={
         "링크": st.column_config.LinkColumn("바로가기", display_text="Link"),
         "제목": st.column_config.TextColumn("제목", width="large"),
     },
-    hide_index=True,
-    use_container_width=True,
-    height=300 
 )
 
 st.markdown("---")
@@ -72,34 +177,26 @@ st.markdown("---")
 # =========================================================
 st.subheader("⚔️ 경쟁사 최신 동향 (Naver Cafe)")
 
-if not df_comp.empty:
+if count("comp"):
     tab1, tab2, tab3, tab4 = st.tabs(["전체 보기", "워터(WATER)", "채비(CHAEVI)", "이브이시스(EVSIS)"])
     
     with tab1:
-        st.caption(f"총 {len(df_comp)}건의 경쟁사 글이 있습니다.")
-        st.dataframe(
-            df_comp[display_columns],
-            column_config={"링크": st.column_config.LinkColumn("바로가기", display_text="Link")},
-            hide_index=True, use_container_width=True, height=400
-        )
+        st.caption(f"총 {count('comp')}건의 경쟁사 글이 있습니다.")
+        paged_dataframe(df_comp, "comp", column_config=link_config)
 
-    def show_competitor(brand_list):
-        target_df = df_comp[df_comp['키워드'].isin(brand_list)]
-        if target_df.empty:
+    def show_competitor(brand):
+        if not count(brand):
             st.info("수집된 글이 없습니다.")
         else:
-            st.dataframe(
-                target_df[display_columns],
-                column_config={"링크": st.column_config.LinkColumn("바로가기", display_text="Link")},
-                hide_index=True, use_container_width=True, height=400
-            )
+            target_df = window(views.comp_by_keyword[brand])
+            paged_dataframe(target_df, f"comp_{brand}", column_config=link_config)
 
-    with tab2: show_competitor(["워터"])
-    with tab3: show_competitor(["채비"])
-    with tab4: show_competitor(["이브이시스"])
+    with tab2: show_competitor("워터")
+    with tab3: show_competitor("채비")
+    with tab4: show_competitor("이브이시스")
 
 else:
-    st.info("아직 수집된 경쟁사 데이터가 없습니다.")
+    st.info("선택한 기간에 수집된 경쟁사 데이터가 없습니다.")
 
 st.markdown("---")
 
@@ -108,16 +205,16 @@ st.markdown("---")
 # =========================================================
 st.subheader("📺 유튜브 여론 모니터링 (YouTube)")
 
-if not df_youtube.empty:
+if count("youtube"):
     # 데이터 분리 (영상 vs 댓글)
-    df_yt_videos = df_youtube[df_youtube['키워드'] == "유튜브(영상)"]
-    df_yt_comments = df_youtube[df_youtube['키워드'] == "유튜브(댓글)"]
+    df_yt_videos = window(views.df_yt_videos)
+    df_yt_comments = window(views.df_yt_comments)
     
     # 상단 통계
     c1, c2, c3 = st.columns(3)
-    with c1: st.metric("총 유튜브 데이터", f"{len(df_youtube)} 건")
-    with c2: st.metric("수집된 영상", f"{len(df_yt_videos)} 개")
-    with c3: st.metric("브랜드 언급 댓글", f"{len(df_yt_comments)} 개")
+    with c1: st.metric("총 유튜브 데이터", f"{count('youtube')} 건")
+    with c2: st.metric("수집된 영상", f"{count('yt_videos')} 개")
+    with c3: st.metric("브랜드 언급 댓글", f"{count('yt_comments')} 개")
     
     # 탭 분리: 영상 목록 / 댓글 반응
     yt_tab1, yt_tab2 = st.tabs(["🎥 수집된 영상 목록", "💬 주요 댓글 반응 (Key Comments)"])
@@ -125,39 +222,90 @@ if not df_youtube.empty:
     # [탭 1] 영상 목록 (기존처럼 테이블로)
     with yt_tab1:
         if not df_yt_videos.empty:
-            st.dataframe(
-                df_yt_videos[display_columns],
+            paged_dataframe(
+                df_yt_videos,
+                "yt_videos",
                 column_config={
                     "링크": st.column_config.LinkColumn("바로가기", display_text="Watch"),
                     "제목": st.column_config.TextColumn("제목 (내용)", width="large"),
                     "카페명": st.column_config.TextColumn("채널명"),
                     "키워드": st.column_config.TextColumn("구분"),
                 },
-                hide_index=True,
-                use_container_width=True
             )
         else:
-            st.info("최근 24시간 내 수집된 영상이 없습니다.")
+            st.info("선택한 기간에 수집된 영상이 없습니다.")
 
     # [탭 2] 댓글 반응 (✨ 볼드 처리를 위해 마크다운 사용)
+    #        댓글마다 위젯을 만들지 않고, 현재 페이지 댓글을 마크다운 1개로 묶어 출력
     with yt_tab2:
         if not df_yt_comments.empty:
             st.info("💡 댓글 내 '일렉링크', '채비', '워터', '이브이시스' 등 브랜드 키워드가 포함된 내용만 표시됩니다.")
-            
-            for index, row in df_yt_comments.iterrows():
-                # 스타일링된 카드 형태로 출력
-                with st.chat_message("user"):
-                    st.write(f"**{row['카페명']}** (작성일: {row['작성일']})")
-                    # 여기서 row['제목']에는 이미 '*브랜드*' 처리가 되어 있음 -> 마크다운이 볼드로 변환해줌
-                    # 제목 앞의 '💬 ' 아이콘 제거 후 출력
-                    clean_content = row['제목'].replace("💬 ", "")
-                    st.markdown(f"{clean_content}")
-                    st.caption(f"[원본 영상 보러가기]({row['링크']})")
+
+            total = len(df_yt_comments)
+            pages = max(1, -(-total // COMMENT_PAGE_SIZE))
+            page = st.number_input("페이지", min_value=1, max_value=pages, value=1, key="yt_comments_page") if pages > 1 else 1
+            start = (page - 1) * COMMENT_PAGE_SIZE
+            page_df = df_yt_comments.iloc[start:start + COMMENT_PAGE_SIZE]
+            st.caption(f"총 {total}개 중 {start + 1}–{start + len(page_df)}개 ({page}/{pages} 페이지)")
+
+            # 제목에는 이미 '*브랜드*' 처리가 되어 있음 -> 마크다운이 볼드로 변환 (앞의 '💬 ' 아이콘은 제거)
+            cards = [
+                f"💬 **{channel}** (작성일: {written})  \n{content}  \n[원본 영상 보러가기]({link})"
+                for channel, written, content, link in zip(
+                    page_df["카페명"], page_df["작성일"].dt.strftime("%Y-%m-%d"), page_df["제목"].str.replace("💬 ", "", regex=False), page_df["링크"]
+                )
+            ]
+            st.markdown("\n\n---\n\n".join(cards))
         else:
-            st.write("🤐 아직 브랜드가 언급된 주요 댓글이 없습니다.")
+            st.write("🤐 선택한 기간에 브랜드가 언급된 주요 댓글이 없습니다.")
+
+else:
+    st.info("📺 선택한 기간에 수집된 유튜브 데이터가 없습니다.")
+
+st.markdown("---")
 
+# =========================================================
+# [섹션 4] 📈 브랜드 언급 추이 (Share of Voice)
+# =========================================================
+st.subheader("📈 브랜드 언급 추이 (Share of Voice)")
+
+unit = st.radio("집계 단위", ["일", "주", "월"], index=1, horizontal=True)
+trend_counts, trend_share = share_of_voice(views, date_from, date_to, freq={"일": "D", "주": "W", "월": "MS"}[unit])
+
+if not trend_counts.empty and trend_counts.to_numpy().sum():
+    trend_tab1, trend_tab2 = st.tabs(["점유율 (%)", "언급 건수"])
+    with trend_tab1:
+        st.area_chart(trend_share)
+    with trend_tab2:
+        st.line_chart(trend_counts)
 else:
-    st.info("📺 최근 24시간 내 수집된 유튜브 데이터가 없습니다.")
+    st.info("선택한 기간에 집계된 언급이 없습니다.")
+
+st.markdown("---")
+
+# =========================================================
+# [섹션 5] ⏱️ 수집 실행 지표 (crawler.py 실행 보고서)
+# =========================================================
+@st.cache_data
+def get_run_frames(mtime):
+    return load_run_frames()
+
+
+run_log = os.path.join(STORE_DIR, RUN_LOG_FILE)
+runs = get_run_frames(os.path.getmtime(run_log)) if os.path.exists(run_log) else None
+with st.expander("⏱️ 수집 실행 지표", expanded=False):
+    if runs is None:
+        st.info("아직 기록된 수집 실행이 없습니다.")
+    else:
+        latest = runs.latest
+        st.caption(f"마지막 실행: {latest.get('started_at')} (실행ID {latest.get('run_id')}, {latest.get('wall_seconds', 0):.1f}초)")
+        run_tab1, run_tab2, run_tab3 = st.tabs(["단계별 소요 시간(초)", "키워드별 필터 결과 (마지막 실행)", "API 호출 수"])
+        with run_tab1:
+            st.bar_chart(runs.stages)
+        with run_tab2:
+            st.dataframe(runs.keywords, use_container_width=True)
+        with run_tab3:
+            st.line_chart(runs.api_calls)
 
 # ---------------------------------------------------------
 # 새로고침 버튼
@@ -0,0 +1,194 @@
+# 성능 측정 스크립트: 합성 데이터로 기존 경로와 개선 경로를 비교 (결과 동일성도 함께 확인)
+#   python benchmark.py filters --rows 1000000
+#   python benchmark.py extract
+#   python benchmark.py report --rows 50000
+#   python benchmark.py schema
+import argparse
+import random
+import time
+
+import pandas as pd
+
+from voc_filters import KEYWORD_RULES, classify_titles, is_excluded_post, is_relevant
+from voc_report import build_report, render_mrkdwn
+from voc_schema import read_voc_csv
+
+
+def _timed(label, fn):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    print(f"   {label}: {elapsed:.2f}초")
+    return result, elapsed
+
+
+# ======================================================
+# [1] voc_filters: 행 단위 map/apply vs classify_titles
+# ======================================================
+# 실데이터 제목 패턴을 흉내 낸 조각 (브랜드명·노이즈·판매어·충전 문맥·가격 화살표가 섞이도록)
+_TITLE_PARTS = [
+    "일렉링크", "SK일렉", "sk 일렉", "EVSIS", "이브이시스", "워터", "워터파크", "채비", "겨울 채비",
+    "채비를", "급속 충전", "완속", "로밍 요금", "NACS", "100kW", "충전기 고장", "앱 오류",
+    "포인트 팝니다", "쿠폰 양도", "코스닥 상장", "42,100 -> 32,000", "휴게소", "후기", "질문",
+    "아이오닉5", "테슬라 모델Y", "주말", "여행", "?", "ㅠㅠ",
+]
+
+
+def make_synthetic_titles(rows: int, seed: int = 0) -> pd.DataFrame:
+    rng = random.Random(seed)
+    keywords = list(KEYWORD_RULES) + ["유튜브(영상)"]
+    return pd.DataFrame({
+        "키워드": [rng.choice(keywords) for _ in range(rows)],
+        "제목": [" ".join(rng.sample(_TITLE_PARTS, rng.randint(1, 5))) for _ in range(rows)],
+    })
+
+
+def bench_filters(rows: int):
+    print(f"\n🧪 [voc_filters] 합성 제목 {rows:,}행")
+    df = make_synthetic_titles(rows)
+
+    def scalar():
+        # clean_history.py의 기존 방식 그대로
+        excluded = df['제목'].astype(str).map(is_excluded_post)
+        relevant = df.apply(lambda r: is_relevant(str(r['키워드']), str(r['제목'])), axis=1)
+        return excluded, relevant
+
+    (excluded, relevant), t_scalar = _timed("행 단위 map/apply", scalar)
+    verdict, t_batch = _timed("classify_titles", lambda: classify_titles(df['키워드'], df['제목']))
+
+    same = verdict['excluded'].equals(excluded.astype(bool)) and verdict['relevant'].equals(relevant.astype(bool))
+    print(f"   결과 일치: {same} / 속도 향상: {t_scalar / t_batch:.1f}배")
+
+
+# ======================================================
+# [2] 네이버 검색 결과 추출: 항목별 find_element vs execute_script 1회 (Chrome·네트워크 필요)
+# ======================================================
+def bench_extraction(rows):
+    import crawler
+    from webdriver_manager.chrome import ChromeDriverManager
+
+    keyword = crawler.DEEP_SEARCH_KEYWORDS[0]
+    print(f"\n🧪 [crawler] '{keyword}' 검색 결과 추출 (rows 인자는 사용하지 않음)")
+    driver = crawler._new_chrome_driver(ChromeDriverManager().install())
+    try:
+        driver.get(crawler.NAVER_SEARCH_URL + keyword)
+        crawler._load_results(driver, 15)
+        by_element, t_element = _timed("항목별 find_element", lambda: crawler._extract_items_by_element(driver))
+        by_script, t_script = _timed("execute_script 1회", lambda: crawler._extract_items_by_script(driver))
+    finally:
+        driver.quit()
+
+    # 저장될 레코드(수집시점 제외)가 같은지로 필드 의미 동일성 확인
+    def records(items):
+        return [
+            {k: v for k, v in r.items() if k not in ("작성일", "수집시점")}
+            for r in crawler.build_naver_records(keyword, items)
+        ]
+
+    same = records(by_element) == records(by_script)
+    print(f"   항목 {len(by_script)}개 / 레코드 일치: {same} / 속도 향상: {t_element / t_script:.1f}배")
+
+
+# ======================================================
+# [3] 슬랙 리포트: 브랜드별 반복 필터·iterrows·문자열 += vs build_report 1회 그룹핑
+# ======================================================
+_REPORT_SK = ["SK일렉링크", "일렉링크"]
+_REPORT_BRANDS = 30  # 앞으로 늘어날 경쟁 브랜드 수를 가정
+
+
+def _legacy_report(today_df, today_str, dashboard_url, sk_keywords, comp_keywords):
+    """기존 slack_sender.py의 메시지 작성 로직 그대로 (브랜드 목록만 인자로)."""
+    sk_df = today_df[today_df['키워드'].isin(sk_keywords)]
+    sk_count = len(sk_df)
+    comp_counts = []
+    for comp in comp_keywords:
+        count = len(today_df[today_df['키워드'] == comp])
+        comp_counts.append(f"{comp} {count}건")
+    comp_msg_str = ", ".join(comp_counts)
+    youtube_df = today_df[today_df['키워드'].str.contains("유튜브", na=False)]
+
+    message = f"📢 *[{today_str}] SK일렉링크 일일 모니터링*\n\n"
+    message += f"오늘자 SK일렉링크 커뮤니티 언급된 수는 *{sk_count}건*입니다\n"
+    message += f"({comp_msg_str})\n\n"
+    message += f"📊 *전체 현황 대시보드 보러가기*:\n{dashboard_url}\n\n"
+    message += "📝 *오늘자 당사로 언급된 키워드 (Community)*\n"
+    if sk_count > 0:
+        for index, row in sk_df.iterrows():
+            message += f"• <{row['링크']}|{row['제목']}>\n"
+    else:
+        message += "• (특이 사항 없음)\n"
+    comp_exists = False
+    comp_section_msg = ""
+    for comp in comp_keywords:
+        target_comp_df = today_df[today_df['키워드'] == comp]
+        if not target_comp_df.empty:
+            comp_exists = True
+            comp_section_msg += f"\n🔹 *[{comp}]*\n"
+            for index, row in target_comp_df.iterrows():
+                comp_section_msg += f"• <{row['링크']}|{row['제목']}>\n"
+    if comp_exists:
+        message += "\n⚔️ *오늘자 경쟁사 언급 현황*\n"
+        message += comp_section_msg
+    message += "\n📺 *[유튜브] 모니터링 이슈 (Video/Comment)*\n"
+    if not youtube_df.empty:
+        for index, row in youtube_df.iterrows():
+            message += f"• <{row['링크']}|{row['제목']}>\n"
+    else:
+        message += "• (특이 사항 없음)\n"
+    return message
+
+
+def bench_report(rows: int):
+    brands = [f"브랜드{i:02d}" for i in range(_REPORT_BRANDS)]
+    print(f"\n🧪 [slack 리포트] 신규 {rows:,}행 / 경쟁 브랜드 {len(brands)}개")
+    rng = random.Random(0)
+    keywords = _REPORT_SK + brands + ["유튜브(영상)", "유튜브(댓글)"]
+    df = make_synthetic_titles(rows).assign(
+        키워드=[rng.choice(keywords) for _ in range(rows)],
+        링크=[f"https://cafe.naver.com/sample/{i}" for i in range(rows)],
+    )
+    args = (df, "2026-01-01", "https://example.com/", _REPORT_SK, brands)
+
+    legacy, t_legacy = _timed("브랜드별 필터 + iterrows", lambda: _legacy_report(*args))
+    grouped, t_grouped = _timed("build_report + render_mrkdwn", lambda: render_mrkdwn(build_report(*args)))
+    print(f"   결과 일치: {legacy == grouped} / 속도 향상: {t_legacy / t_grouped:.1f}배")
+
+
+# ======================================================
+# [4] 실데이터 로딩: 기본 read_csv(문자열) vs voc_schema.read_voc_csv(타입·category)
+# ======================================================
+def bench_schema(rows, path="electlink_voc.csv", repeat=5):
+    print(f"\n🧪 [voc_schema] {path} 로딩 (rows 인자는 사용하지 않음, {repeat}회 평균)")
+
+    def average(fn):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            result = fn()
+        return result, (time.perf_counter() - start) / repeat
+
+    plain, t_plain = average(lambda: pd.read_csv(path))
+    schema, t_schema = average(lambda: read_voc_csv(path))
+    mem_plain = plain.memory_usage(deep=True).sum() / 1024 / 1024
+    mem_schema = schema.memory_usage(deep=True).sum() / 1024 / 1024
+    print(f"   행 {len(plain):,}개")
+    print(f"   기본 read_csv : {t_plain * 1000:.1f}ms / 메모리 {mem_plain:.2f}MB")
+    print(f"   read_voc_csv  : {t_schema * 1000:.1f}ms / 메모리 {mem_schema:.2f}MB ({mem_schema / mem_plain:.0%})")
+
+    for col in schema.columns:
+        before = f"{plain[col].memory_usage(deep=True) / 1024:.0f}KB" if col in plain else "파생 컬럼"
+        print(f"     {col}: {schema[col].dtype} {schema[col].memory_usage(deep=True) / 1024:.0f}KB (기본 {before})")
+
+
+BENCHMARKS = {
+    "filters": bench_filters,
+    "extract": bench_extraction,
+    "report": bench_report,
+    "schema": bench_schema,
+}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="sk-electlink-monitor 성능 측정")
+    parser.add_argument("target", nargs="?", choices=sorted(BENCHMARKS), default="filters")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+    BENCHMARKS[args.target](args.rows)
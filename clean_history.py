@@ -1,45 +1,162 @@
-# 기존 electlink_voc.csv를 voc_filters 규칙으로 1회 소급 정리하는 스크립트 (실행 전 백업 생성)
+# 기존 electlink_voc.csv를 voc_filters 규칙으로 소급 정리하는 스크립트 (실행 전 백업 생성)
+#  - 청크 단위 스트리밍: 한 번에 chunksize행만 메모리에 올리고, 결과는 임시 파일에 이어 쓴 뒤 교체
+#  - 청크 간 중복 제거 상태는 임시 SQLite 인덱스(voc_store.DedupIndex)에 보관
+#    python clean_history.py                       # 정리 실행
+#    python clean_history.py --dry-run             # 결과 집계만 출력 (파일·저장소 변경 없음)
+#    python clean_history.py --workers 4 --chunksize 50000   # 청크 판정을 프로세스 4개로 병렬 처리
+import argparse
+import os
 import shutil
+import tempfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 
 import pandas as pd
 
-from voc_filters import is_excluded_post, is_relevant, canonicalize_link
+from voc_filters import classify_titles, canonicalize_link
+from voc_schema import read_voc_csv, to_storage, typed
+from voc_store import DedupIndex, VocStore, STORE_DIR
 
 FILE_NAME = "electlink_voc.csv"
 BACKUP_NAME = "electlink_voc.cleanup-bak.csv"
+CHUNK_ROWS = 100_000
 
-df = pd.read_csv(FILE_NAME)
-shutil.copyfile(FILE_NAME, BACKUP_NAME)
-print(f"백업 생성: {BACKUP_NAME} ({len(df)}행)")
 
-before_counts = df['키워드'].value_counts()
+def classify_chunk(df):
+    """청크 1개 정리 (중복 제거 전 단계). (남길 행, 판매/거래/주식 제거 수, 브랜드 무관 제거 수).
 
-# 1) 링크 정규화 (?art= 토큰 제거)
-df['링크'] = df['링크'].astype(str).map(canonicalize_link)
+    프로세스 풀에서도 호출되므로 모듈 최상위 함수로 둔다.
+    """
+    # 1) 링크 정규화 (?art= 토큰 제거)
+    df = df.assign(링크=df['링크'].astype(str).map(canonicalize_link))
 
-# 2) 필터 적용 — 유튜브(영상/댓글) 행은 주제 검색 기반이라 제외, 네이버 행만 판정
-is_naver = ~df['키워드'].astype(str).str.contains("유튜브", na=False)
-titles = df['제목'].astype(str)
+    # 2) 필터 적용 — 유튜브(영상/댓글) 행은 주제 검색 기반이라 제외, 네이버 행만 판정
+    is_naver = ~df['키워드'].astype(str).str.contains("유튜브", na=False)
+    verdict = classify_titles(df['키워드'], df['제목'])
 
-sale_mask = is_naver & titles.map(is_excluded_post)
-relevant_mask = df.apply(lambda r: is_relevant(str(r['키워드']), str(r['제목'])), axis=1)
-irrelevant_mask = is_naver & ~sale_mask & ~relevant_mask
+    sale_mask = is_naver & verdict['excluded']
+    relevant_mask = verdict['relevant']
+    irrelevant_mask = is_naver & ~sale_mask & ~relevant_mask
+    return df[~(sale_mask | irrelevant_mask)], int(sale_mask.sum()), int(irrelevant_mask.sum())
 
-df_kept = df[~(sale_mask | irrelevant_mask)].copy()
 
-# 3) 중복 제거 — (키워드, 링크) 기준, 먼저 수집된 행 유지
-dup_before = len(df_kept)
-df_kept = df_kept.drop_duplicates(subset=['키워드', '링크'], keep='first')
-dup_removed = dup_before - len(df_kept)
+def _classified(chunks, workers):
+    """청크 순서를 유지하며 classify_chunk 적용. 병렬일 때도 동시에 떠 있는 청크는 workers*2개까지."""
+    if workers <= 1:
+        for chunk in chunks:
+            yield chunk, classify_chunk(chunk)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append((chunk, executor.submit(classify_chunk, chunk)))
+            if len(pending) >= workers * 2:
+                chunk, future = pending.popleft()
+                yield chunk, future.result()
+        while pending:
+            chunk, future = pending.popleft()
+            yield chunk, future.result()
 
-df_kept.to_csv(FILE_NAME, index=False, encoding="utf-8-sig")
 
-print(f"\n판매/거래/주식 글 제거: {sale_mask.sum()}행")
-print(f"브랜드 무관 글 제거: {irrelevant_mask.sum()}행")
-print(f"중복 제거: {dup_removed}행")
-print(f"합계: {len(df)}행 -> {len(df_kept)}행")
+def _add_counts(total, df):
+    counts = df['키워드'].astype(str).value_counts(sort=False)
+    return counts if total is None else total.add(counts, fill_value=0)
 
-print("\n[키워드별 변화]")
-after_counts = df_kept['키워드'].value_counts()
-for kw in before_counts.index:
-    print(f"  {kw}: {before_counts[kw]} -> {after_counts.get(kw, 0)}")
+
+def clean(chunks, out_path=None, workers=1):
+    """청크 반복자를 정리해 out_path(없으면 dry-run)에 이어 씀. 집계 dict 반환."""
+    stats = {"rows": 0, "kept": 0, "sale": 0, "irrelevant": 0, "dup": 0, "before": None, "after": None}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # 3) 중복 제거 — (키워드, 링크) 기준, 먼저 수집된 행 유지 (청크를 넘어서도 유지)
+        seen = DedupIndex(os.path.join(tmp_dir, "seen.sqlite3"))
+        try:
+            for chunk, (kept, sale, irrelevant) in _classified(chunks, workers):
+                stats["rows"] += len(chunk)
+                stats["sale"] += sale
+                stats["irrelevant"] += irrelevant
+                stats["before"] = _add_counts(stats["before"], chunk)
+
+                unique = kept.drop_duplicates(subset=['키워드', '링크'], keep='first')
+                keys = DedupIndex.keys_of(unique)
+                is_dup = seen.contains(keys)
+                unique = unique[[not dup for dup in is_dup]]
+                seen.add([key for key, dup in zip(keys, is_dup) if not dup])
+                stats["dup"] += len(kept) - len(unique)
+                stats["kept"] += len(unique)
+                stats["after"] = _add_counts(stats["after"], unique)
+
+                if out_path:
+                    to_storage(unique).to_csv(
+                        out_path, mode="a", header=not os.path.exists(out_path), index=False, encoding="utf-8-sig"
+                    )
+        finally:
+            seen.close()
+    return stats
+
+
+def print_report(stats):
+    print(f"\n판매/거래/주식 글 제거: {stats['sale']}행")
+    print(f"브랜드 무관 글 제거: {stats['irrelevant']}행")
+    print(f"중복 제거: {stats['dup']}행")
+    print(f"합계: {stats['rows']}행 -> {stats['kept']}행")
+
+    print("\n[키워드별 변화]")
+    before = stats["before"] if stats["before"] is not None else pd.Series(dtype=int)
+    after = stats["after"] if stats["after"] is not None else pd.Series(dtype=int)
+    for kw, count in before.sort_values(ascending=False, kind="stable").items():
+        print(f"  {kw}: {int(count)} -> {int(after.get(kw, 0))}")
+
+
+def _store_chunks(store, chunksize):
+    """저장소 파티션을 chunksize행씩 (dry-run용 — CSV export 없이 읽기만)."""
+    for part in store:
+        for start in range(0, len(part), chunksize):
+            yield typed(part.iloc[start:start + chunksize])
+
+
+def main(chunksize=CHUNK_ROWS, workers=1, dry_run=False):
+    store = VocStore(STORE_DIR)
+    if dry_run:
+        chunks = _store_chunks(store, chunksize) if store.exists() else read_voc_csv(FILE_NAME, chunksize=chunksize)
+        print_report(clean(chunks, workers=workers))
+        print("\n(dry-run: 파일·저장소는 변경하지 않았습니다)")
+        return
+
+    # 저장소가 원본 — 최신 상태를 CSV로 내보낸 뒤 백업·정리 (수집순번·보고 위치는 유지)
+    if store.exists():
+        store.export_csv(FILE_NAME)
+    shutil.copyfile(FILE_NAME, BACKUP_NAME)
+    if not store.exists():
+        # CSV만 있으면 먼저 저장소로 이관 (예전 '(New)' 표시가 미보고 행으로 보존되도록)
+        store = VocStore.import_csv(FILE_NAME, STORE_DIR)
+        store.export_csv(FILE_NAME)
+    reported_seq = store.state["reported_seq"]
+    print(f"백업 생성: {BACKUP_NAME} ({store.total_rows()}행)")
+
+    # 정리 결과는 임시 파일에 쓰고 끝까지 성공했을 때만 교체 (도중에 실패해도 원본 유지)
+    tmp_path = f"{FILE_NAME}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    try:
+        stats = clean(read_voc_csv(FILE_NAME, chunksize=chunksize), tmp_path, workers)
+        if not os.path.exists(tmp_path):
+            # 남은 행이 없으면 헤더만 있는 파일
+            pd.DataFrame(columns=pd.read_csv(FILE_NAME, nrows=0).columns).to_csv(tmp_path, index=False, encoding="utf-8-sig")
+        os.replace(tmp_path, FILE_NAME)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    # 정리 결과로 파티션·상태·중복 인덱스를 다시 구성 (다음 크롤링의 export가 정리 전으로 되돌리지 않도록)
+    VocStore.import_csv(FILE_NAME, STORE_DIR, replace=True, reported_seq=reported_seq, chunksize=chunksize)
+    print(f"저장소 재구성: {STORE_DIR}/")
+    print_report(stats)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="VoC 이력 소급 정리")
+    parser.add_argument("--chunksize", type=int, default=CHUNK_ROWS, help="한 번에 처리할 행 수")
+    parser.add_argument("--workers", type=int, default=1, help="청크 판정에 쓸 프로세스 수")
+    parser.add_argument("--dry-run", action="store_true", help="집계만 출력하고 파일·저장소는 그대로 둠")
+    args = parser.parse_args()
+    main(args.chunksize, args.workers, args.dry_run)
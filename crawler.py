@@ -1,6 +1,8 @@
 import time
 import os
-import pandas as pd
+import json
+import queue
+import threading
 import subprocess 
 from datetime import datetime, timedelta
 
@@ -10,26 +12,61 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.common.keys import Keys
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException, WebDriverException
 
 # [유튜브용 라이브러리]
 from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
+from youtube_api import QUOTA_COST, QuotaMeter, YouTubeClient, YouTubeCrawlState
 
 # [VoC 필터] 판매·주식글 배제 / 브랜드 관련성 판정 / 링크 정규화 (규칙은 voc_filters.py에서 관리)
-from voc_filters import is_excluded_post, is_relevant, contains_brand, canonicalize_link
+from voc_filters import contains_brand, canonicalize_link
+# [네이버 HTTP 백엔드] 브라우저 없이 검색 결과 HTML을 받아 파싱
+from naver_fetchers import HttpFetcher, new_session
+# [저장소] 월별 파티션 append-only 저장 + 호환용 CSV export
+from voc_schema import kst_now, new_record, records_frame
+from voc_store import VocStore, STORE_DIR, new_run_id
+from voc_rules import seed_baseline
+from voc_search import SearchIndex
+from voc_cluster import ClusterIndex
+# [수집기] 출처별 플러그인(Collector)을 동시에 실행하는 스케줄러 + VoC 필터 단계
+from voc_collectors import Collector, filter_records, run_collectors, unit_key
+# [중간 결과 보관] 키워드별 결과를 JSON lines로 남겨 실패 시 --resume으로 이어서 수집
+from voc_spool import CrawlSpool
+# [계측] 단계별 시간·키워드별 카운터·API 호출 수 → 실행 보고서 (voc_store/crawl_runs.jsonl)
+from voc_metrics import RUN_LOG_FILE, RunMetrics
 
 # ======================================================
 # [설정 1] 공통 및 파일 설정
 # ======================================================
 FILE_NAME = "electlink_voc.csv"
+RUN_LOG = os.path.join(STORE_DIR, RUN_LOG_FILE)
+# 이번 실행의 계측 (모든 수집 함수가 함께 기록, 메인에서 실행ID를 붙여 저장)
+metrics = RunMetrics()
 
 # ======================================================
 # [설정 2] 네이버 카페 설정
 # ======================================================
+NAVER_SEARCH_URL = "https://search.naver.com/search.naver?ssc=tab.cafe.all&st=date&nso=so%3Add%2Cp%3Aall&query="
 NAVER_SEARCH_KEYWORDS = ["일렉링크", "워터", "채비", "이브이시스"]
 DEEP_SEARCH_KEYWORDS = ["워터", "채비"]
 # 판매글 단어 목록·브랜드별 수집 규칙은 voc_filters.py의 EXCLUDE_WORDS / KEYWORD_RULES에서 관리
 TARGET_CAFE_KEYWORDS = ["테슬라", "전기차", "EV", "아이오닉"]
+# 수집 백엔드: selenium(기본, 브라우저) / http(브라우저 없이 HTTP, 실패한 키워드만 Selenium으로 재시도)
+NAVER_BACKEND = os.environ.get("NAVER_BACKEND", "selenium")
+# 동시에 띄울 브라우저 수 (1이면 기존처럼 순차 실행)와 같은 도메인 요청 사이 최소 간격(초)
+NAVER_WORKERS = int(os.environ.get("NAVER_WORKERS", "1"))
+NAVER_DOMAIN_INTERVAL = float(os.environ.get("NAVER_DOMAIN_INTERVAL", "1.0"))
+# 수집 대상 최근 글 표기, 첫 결과 대기 / 스크롤 후 추가 로딩 대기 한도(초)
+FRESH_MARKERS = ["분 전", "시간 전", "방금 전"]
+NAVER_PAGE_TIMEOUT = 10
+NAVER_SCROLL_TIMEOUT = 3
+# 검색 결과 추출 방식: script(한 번의 JS 호출로 전체 추출) / element(항목별 find_element, 기존 방식)
+NAVER_EXTRACT_MODE = os.environ.get("NAVER_EXTRACT_MODE", "script")
+# 상주 실행(--daemon)의 하루 검색 횟수 예산 (키워드 전체 합, 기본: 키워드 수 = 하루 1회 실행과 같은 비용)
+#  새 글이 잦은 키워드에 더 많이 배분. 최근 글 표기('시간 전')가 24시간 이내뿐이라 키워드마다 하루 1회 이상은 검색
+NAVER_DAEMON_POLLS = os.environ.get("NAVER_DAEMON_POLLS_PER_DAY")
 
 # ======================================================
 # [설정 3] 유튜브 설정
@@ -37,54 +74,139 @@ TARGET_CAFE_KEYWORDS = ["테슬라", "전기차", "EV", "아이오닉"]
 YOUTUBE_API_KEY = os.environ.get("YOUTUBE_API_KEY") 
 YOUTUBE_SEARCH_TOPICS = ["전기차 충전", "고속도로 충전", "전기차 요금", "급속 충전", "휴게소 충전"]
 TARGET_BRANDS = ["SK일렉링크", "일렉링크", "에스에스차저", "SS차저", "워터", "채비", "이브이시스"]
+# 검색 영상 수 상한 (50개 넘으면 nextPageToken으로 이어서 조회), 댓글 동시 조회 수
+YOUTUBE_MAX_VIDEOS = int(os.environ.get("YOUTUBE_MAX_VIDEOS", "30"))
+YOUTUBE_WORKERS = int(os.environ.get("YOUTUBE_WORKERS", "8"))
+# 실행 1회 쿼터 예산 (일일 한도 10,000 unit 중 이 실행이 쓸 수 있는 양; search.list 1회 = 100 unit)
+YOUTUBE_QUOTA_BUDGET = int(os.environ.get("YOUTUBE_QUOTA_BUDGET", "1500"))
+YOUTUBE_QUOTA_LOG = os.path.join(STORE_DIR, "youtube_quota.jsonl")
+# 증분 수집: 검색 커서·영상별 댓글 워터마크 저장 위치, 영상 추적 기간(일), 커서 겹침(분, 검색 색인 지연 대비)
+YOUTUBE_STATE_FILE = os.path.join(STORE_DIR, "youtube_state.json")
+YOUTUBE_TRACK_DAYS = int(os.environ.get("YOUTUBE_TRACK_DAYS", "7"))
+YOUTUBE_CURSOR_OVERLAP_MIN = 30
+# 영상당 댓글 조회: 페이지 크기(최대 100), 최대 페이지 수 (페이지마다 1 unit)
+YOUTUBE_COMMENT_PAGE_SIZE = 100
+YOUTUBE_MAX_COMMENT_PAGES = 2
+# 상주 실행(--daemon)의 하루 쿼터 예산(unit) — 주제별 검색(1회 ≈ 101 unit) + 추적 영상 댓글 확인을 합한 값
+#  기본: 하루 1회 실행과 같은 비용 (주제를 묶은 검색 1회 + 추적 영상 댓글 확인 1회)
+YOUTUBE_DAEMON_QUOTA = os.environ.get("YOUTUBE_DAEMON_QUOTA_PER_DAY")
 
 # ======================================================
 # [기능 1] 유튜브 크롤링 함수
 # ======================================================
-def crawl_youtube():
+def _record_youtube_quota(meter):
+    """이번 실행의 쿼터 사용량 출력 + 저장소의 실행별 기록(JSON lines)에 추가."""
+    summary = meter.summary()
+    print(f"   📊 YouTube API 쿼터 사용: {summary['units']} units (예산 {summary['budget']}) {summary['calls']}")
+    try:
+        os.makedirs(os.path.dirname(YOUTUBE_QUOTA_LOG), exist_ok=True)
+        with open(YOUTUBE_QUOTA_LOG, "a", encoding="utf-8") as f:
+            summary["run_at"] = kst_now().strftime("%Y-%m-%d %H:%M")
+            f.write(json.dumps(summary, ensure_ascii=False) + "\n")
+    except OSError as e:
+        print(f"⚠️ 쿼터 기록 실패: {e}")
+
+
+def _comment_records(vid_id, comments, now):
+    """댓글 중 브랜드 언급이 있는 것만 레코드로 변환 (브랜드명 *강조*, 80자 자르기).
+
+    링크에 댓글 ID(&lc=)를 붙여 댓글마다 중복 제거 키가 달라지게 함 (같은 영상의 나중 댓글도 저장되도록).
+    """
+    records = []
+    for c_item in comments:
+        comment_id = c_item['snippet']['topLevelComment'].get('id') or c_item['id']
+        comment = c_item['snippet']['topLevelComment']['snippet']
+        text = comment['textDisplay'].replace('\n', ' ').strip()
+        author = comment['authorDisplayName']
+
+        found_brand_in_comment = False
+        for brand in TARGET_BRANDS:
+            # 동음이의어 배제 판정 (예: '미네랄워터'만 있는 댓글은 워터 언급으로 안 침)
+            if contains_brand(text, brand):
+                text = text.replace(brand, f"*{brand}*")
+                found_brand_in_comment = True
+        
+        if found_brand_in_comment:
+            if len(text) > 80: text = text[:80] + "..."
+            records.append(new_record(
+                "유튜브(댓글)", f"[YouTube] {author}", f"💬 {text}",
+                f"https://www.youtube.com/watch?v={vid_id}&lc={comment_id}", now,
+            ))
+    return records
+
+
+def crawl_youtube(service_factory=None, topic=None, search=True, refresh_tracked=True):
+    """영상 검색 → 상세 조회 → 조회수 10회↑ 영상의 댓글을 병렬 조회해 레코드 목록으로 반환.
+
+    증분 수집: 지난 실행 이후 올라온 영상만 검색하고, 추적 기간(YOUTUBE_TRACK_DAYS) 안의
+    영상은 댓글 워터마크 이후의 새 댓글만 다시 확인한다 (상태는 YOUTUBE_STATE_FILE).
+
+    service_factory: YouTube 서비스 객체를 만드는 함수 (기본: API 키로 googleapiclient build).
+    로컬 가짜 객체를 넣으면 네트워크·API 키 없이 실행할 수 있다.
+    topic: 이 주제만 검색하고 커서도 주제별로 따로 둠 (기본: YOUTUBE_SEARCH_TOPICS 전체를 한 번에)
+    search / refresh_tracked: 새 영상 검색 / 추적 중 영상의 새 댓글 확인 중 하나만 할 때 False (상주 실행)
+
+    반환: (레코드 목록, 상태 저장 함수 또는 None). 커서·댓글 워터마크는 레코드를 저장소에 반영한 뒤
+    상태 저장 함수를 불러야 옮겨진다 (그 전에 죽으면 다음 실행이 같은 구간을 다시 수집 → 중복은 저장소가 제거).
+    """
     print(f"\n📺 [YouTube] 크롤링 시작 (조회수 10회↑, 브랜드 강조)...")
     results = []
     
-    if not YOUTUBE_API_KEY:
-        print("⚠️ [YouTube] API 키가 없습니다. (GitHub Secrets 확인 필요)")
-        return []
-
+    if service_factory is None:
+        if not YOUTUBE_API_KEY:
+            print("⚠️ [YouTube] API 키가 없습니다. (GitHub Secrets 확인 필요)")
+            return [], None
+        service_factory = lambda: build('youtube', 'v3', developerKey=YOUTUBE_API_KEY, cache_discovery=False)
+
+    meter = QuotaMeter(budget=YOUTUBE_QUOTA_BUDGET)
+    client = YouTubeClient(service_factory, meter)
+    state = YouTubeCrawlState(YOUTUBE_STATE_FILE)
+    horizon = timedelta(days=YOUTUBE_TRACK_DAYS)
+    now = datetime.utcnow()
+    save_state = None
     try:
-        youtube = build('youtube', 'v3', developerKey=YOUTUBE_API_KEY)
-        
-        # 24시간 이내
-        search_date = datetime.utcnow() - timedelta(days=1) 
-        published_after = search_date.strftime("%Y-%m-%dT%H:%M:%SZ")
-        query = "|".join(YOUTUBE_SEARCH_TOPICS)
-
-        # 1. 영상 검색
-        search_response = youtube.search().list(
-            q=query, part="id", order="date",
-            publishedAfter=published_after, type="video",
-            maxResults=30 
-        ).execute()
-
+        # 지난 실행의 검색 시각(커서) 이후 영상만 검색 — 첫 실행은 24시간 이내
+        published_after = state.published_after(
+            now, timedelta(days=1), timedelta(minutes=YOUTUBE_CURSOR_OVERLAP_MIN), topic=topic
+        )
+        tracked = state.tracked(now, horizon) if refresh_tracked else {}
+        query = topic or "|".join(YOUTUBE_SEARCH_TOPICS)
+
+        # 1. 영상 검색 (YOUTUBE_MAX_VIDEOS개까지 페이지를 이어서 조회, 이미 추적 중인 영상 제외)
         video_ids = []
-        seen_ids = set()
-        for item in search_response.get("items", []):
-            vid_id = item['id']['videoId']
-            if vid_id not in seen_ids:
-                video_ids.append(vid_id)
-                seen_ids.add(vid_id)
-
-        if not video_ids:
-            print("   💨 최근 24시간 내 검색 결과 없음")
-            return []
+        if search:
+            with metrics.stage("youtube_api"):
+                video_ids = client.search_video_ids(
+                    YOUTUBE_MAX_VIDEOS, q=query, order="date", publishedAfter=published_after
+                )
+        video_ids = [vid for vid in video_ids if vid not in state.videos]
+        metrics.count("유튜브(영상)", "seen", len(video_ids))
 
         # 2. 상세 정보 조회
-        video_response = youtube.videos().list(
-            id=','.join(video_ids), part='snippet,statistics'
-        ).execute()
-
-        items = video_response.get("items", [])
+        with metrics.stage("youtube_api"):
+            items = client.videos(video_ids) if video_ids else []
         items.sort(key=lambda x: int(x['statistics'].get('viewCount', 0)), reverse=True)
+        items = [item for item in items if int(item['statistics'].get('viewCount', 0)) >= 10]
 
-        print(f"   🔎 1차 검색된 영상 {len(items)}개 분석 중...")
+        if not items and not tracked:
+            print(f"   💨 {published_after} 이후 새 검색 결과 없음")
+        print(f"   🔎 새 영상 {len(items)}개 + 추적 중 영상 {len(tracked)}개 분석 중...")
+
+        # 3. 댓글 수집 — 새 영상은 최신 댓글부터, 추적 중 영상은 워터마크 이후 새 댓글만
+        #    (후보 영상 전체를 동시에 조회, 동시 요청 수는 YOUTUBE_WORKERS로 제한)
+        watermarks = dict(tracked)
+        for item in items:
+            state.track(item['id'], now)
+            watermarks[item['id']] = None
+        with metrics.stage("youtube_api"):
+            comments_by_video, truncated = client.comment_threads_many(
+                watermarks, page_size=YOUTUBE_COMMENT_PAGE_SIZE, max_pages=YOUTUBE_MAX_COMMENT_PAGES,
+                workers=YOUTUBE_WORKERS,
+            )
+        metrics.count("유튜브(댓글)", "seen", sum(len(comments) for comments in comments_by_video.values()))
+
+        # [날짜] 한국 시간 기준 적용
+        collected_at = kst_now()
 
         for item in items:
             vid_id = item['id']
@@ -92,74 +214,99 @@ def crawl_youtube():
             snippet = item['snippet']
             
             view_count = int(stats.get('viewCount', 0))
-            if view_count < 10: continue
-
             raw_title = snippet['title']
             channel = snippet['channelTitle']
 
             title_display = raw_title
-            brand_detected = False
             for brand in TARGET_BRANDS:
                 if brand in raw_title:
                     title_display = title_display.replace(brand, f"*{brand}*")
-                    brand_detected = True
-            
-            # [날짜] 한국 시간 기준 적용
-            kst_now = datetime.now() + timedelta(hours=9)
-            date_str = kst_now.strftime("%Y-%m-%d") + " (New)"
-
-            results.append({
-                "작성일": date_str,
-                "키워드": "유튜브(영상)",
-                "카페명": f"[YouTube] {channel}",
-                "제목": f"[영상] {title_display} (조회수 {view_count}회)",
-                "링크": f"https://www.youtube.com/watch?v={vid_id}",
-                "수집시점": kst_now.strftime("%Y-%m-%d %H:%M")
-            })
-
-            # 3. 댓글 수집
-            try:
-                comment_response = youtube.commentThreads().list(
-                    videoId=vid_id, part="snippet", textFormat="plainText", maxResults=5
-                ).execute()
-                
-                for c_item in comment_response.get("items", []):
-                    comment = c_item['snippet']['topLevelComment']['snippet']
-                    text = comment['textDisplay'].replace('\n', ' ').strip()
-                    author = comment['authorDisplayName']
-
-                    found_brand_in_comment = False
-                    for brand in TARGET_BRANDS:
-                        # 동음이의어 배제 판정 (예: '미네랄워터'만 있는 댓글은 워터 언급으로 안 침)
-                        if contains_brand(text, brand):
-                            text = text.replace(brand, f"*{brand}*")
-                            found_brand_in_comment = True
-                    
-                    if found_brand_in_comment:
-                        if len(text) > 80: text = text[:80] + "..."
-                        results.append({
-                            "작성일": date_str,
-                            "키워드": "유튜브(댓글)",
-                            "카페명": f"[YouTube] {author}",
-                            "제목": f"💬 {text}",
-                            "링크": f"https://www.youtube.com/watch?v={vid_id}",
-                            "수집시점": kst_now.strftime("%Y-%m-%d %H:%M")
-                        })
-            except HttpError: pass 
+
+            results.append(new_record(
+                "유튜브(영상)", f"[YouTube] {channel}", f"[영상] {title_display} (조회수 {view_count}회)",
+                f"https://www.youtube.com/watch?v={vid_id}", collected_at,
+            ))
+            results.extend(_comment_records(vid_id, comments_by_video.get(vid_id, []), collected_at))
+
+        # 추적 중인 예전 영상에 새로 달린 브랜드 언급 댓글
+        for vid_id in tracked:
+            results.extend(_comment_records(vid_id, comments_by_video.get(vid_id, []), collected_at))
+
+        # 페이지가 중간에 끊긴 영상(오류·쿼터 예산 초과)은 워터마크를 그대로 둠
+        # → 다음 실행이 예전 워터마크부터 다시 읽어 못 받은 댓글을 채움 (다시 받은 댓글은 저장소가 중복 제거)
+        if truncated:
+            print(f"   ⚠️ 댓글을 다 못 읽은 영상 {len(truncated)}개 — 다음 수집에서 다시 확인")
+        for vid_id, comments in comments_by_video.items():
+            if vid_id not in truncated:
+                state.advance_watermark(vid_id, comments)
+        save_state = lambda: state.save(now, horizon, topic=topic, advance=search)
 
     except Exception as e:
+        # 실패는 호출한 쪽(수집기 스케줄러)으로 올림 → 보관함에 완료로 남지 않아 --resume·상주 실행이 다시 수집
         print(f"❌ [YouTube] 에러 발생: {e}")
-    
+        raise
+    finally:
+        _record_youtube_quota(meter)
+        for method, calls in meter.summary()["calls"].items():
+            metrics.api(f"youtube.{method}", calls)
+        metrics.info["youtube_units"] = metrics.info.get("youtube_units", 0) + meter.units
+
     print(f"   ✅ 유튜브 데이터 {len(results)}건 수집 완료")
-    return results
+    return results, save_state
+
+
+class YouTubeCollector(Collector):
+    """YouTube 수집기. 기본은 검색 주제 전체를 한 번에 조회하는 단위 1개 (검색 1회 = 100 unit이라 묶어서 조회).
+
+    per_topic=True(상주 실행)면 주제마다 따로 검색하는 단위 + 추적 영상 새 댓글 확인 단위("tracked")로 나눠
+    단위별 주기로 돌린다. 증분 상태 파일을 함께 쓰므로 단위는 한 번에 1개씩 처리.
+    """
+
+    name = "youtube"
+
+    def __init__(self, service_factory=None, per_topic=False):
+        super().__init__()
+        self.service_factory = service_factory
+        self.per_topic = per_topic
+        self._save_state = {}  # 단위 → 저장소 반영 뒤 부를 상태 저장 함수
+
+    def units(self):
+        return YOUTUBE_SEARCH_TOPICS + ["tracked"] if self.per_topic else ["topics"]
+
+    def fetch(self, unit):
+        if unit == "topics":
+            records, save_state = crawl_youtube(self.service_factory)
+        elif unit == "tracked":
+            records, save_state = crawl_youtube(self.service_factory, search=False)
+        else:
+            records, save_state = crawl_youtube(self.service_factory, topic=unit, refresh_tracked=False)
+        if save_state:
+            self._save_state[unit] = save_state
+        return records
+
+    def unit_cost(self, unit):
+        """쿼터 unit 기준 1회 비용 (새 영상 댓글 조회는 빼고 어림)."""
+        if unit == "tracked":
+            # 추적 중인 영상마다 댓글 1페이지 이상 (commentThreads.list 1 unit)
+            tracked = YouTubeCrawlState(YOUTUBE_STATE_FILE).tracked(datetime.utcnow(), timedelta(days=YOUTUBE_TRACK_DAYS))
+            return max(1.0, float(len(tracked) * QUOTA_COST["commentThreads.list"]))
+        return float(QUOTA_COST["search.list"] + QUOTA_COST["videos.list"])
+
+    def daily_cost(self):
+        if YOUTUBE_DAEMON_QUOTA:
+            return float(YOUTUBE_DAEMON_QUOTA)
+        # 하루 1회 실행과 같은 비용: 주제를 묶은 검색 1회 + 추적 영상 댓글 확인 1회
+        return self.unit_cost("topics") + self.unit_cost("tracked")
+
+    def commit(self, unit):
+        save_state = self._save_state.pop(unit, None)
+        if save_state:
+            save_state()
 
 # ======================================================
 # [기능 2] 네이버 카페 크롤링 함수
 # ======================================================
-def crawl_naver():
-    print(f"\n🚀 [Naver] 고성능 크롤러 시작")
-    data_list = []
-
+def _new_chrome_driver(driver_path):
     options = webdriver.ChromeOptions()
     options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
     options.add_argument("--headless") 
@@ -167,167 +314,445 @@ def crawl_naver():
     options.add_argument("--disable-dev-shm-usage")
     options.add_argument("--disable-gpu")
 
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
-    time.sleep(2)
+    with metrics.stage("driver_startup"):
+        driver = webdriver.Chrome(service=Service(driver_path), options=options)
+        time.sleep(2)
+    return driver
 
-    try:
-        for keyword in NAVER_SEARCH_KEYWORDS:
-            print(f"   🔍 '{keyword}' 검색 중...")
-            base_url = "https://search.naver.com/search.naver?ssc=tab.cafe.all&st=date&nso=so%3Add%2Cp%3Aall&query="
-            driver.get(base_url + keyword)
-            time.sleep(3) 
-
-            if keyword in DEEP_SEARCH_KEYWORDS:
-                print(f"      👉 심층 검색 진행 (15 pg)")
-                scroll_times = 15 
-            else:
-                scroll_times = 3 
 
-            body = driver.find_element(By.TAG_NAME, "body")
-            for i in range(scroll_times):
-                body.send_keys(Keys.END)
-                time.sleep(1.2)
-            time.sleep(2)
+# 검색 결과 개수와 마지막(가장 오래된) 항목의 텍스트를 한 번의 호출로 조회
+_RESULT_STATE_JS = """
+var items = document.querySelectorAll('li.bx');
+return [items.length, items.length ? items[items.length - 1].innerText : ''];
+"""
 
-            articles = driver.find_elements(By.CSS_SELECTOR, "li.bx")
-            keyword_count = 0
-            
-            for article in articles:
-                try:
-                    cafe_name = ""
-                    try: cafe_name = article.find_element(By.CSS_SELECTOR, "a.txt_name").text
-                    except: 
-                        try: cafe_name = article.find_element(By.CSS_SELECTOR, "a.name").text
-                        except: pass
-
-                    if not any(target in cafe_name for target in TARGET_CAFE_KEYWORDS): continue
-                    if not any(x in article.text for x in ["분 전", "시간 전", "방금 전"]): continue
-                    
-                    try:
-                        title_ele = article.find_element(By.CSS_SELECTOR, "a.title_link")
-                        title = title_ele.text
-                        link = canonicalize_link(title_ele.get_attribute("href"))
-                    except: continue
-
-                    # [VoC 필터] 포인트/카드 판매·거래 글, 주식/상장 글 배제
-                    if is_excluded_post(title): continue
-                    # [VoC 필터] 브랜드 무관 글 배제 (워터 동음이의어, 관용구 '채비', 본문만 매칭된 글 등)
-                    if not is_relevant(keyword, title): continue
-
-                    # [날짜] 한국 시간 기준 적용
-                    kst_now = datetime.now() + timedelta(hours=9)
-                    date_str = kst_now.strftime("%Y-%m-%d") + " (New)"
-
-                    data_list.append({
-                        "작성일": date_str,
-                        "키워드": keyword, 
-                        "카페명": cafe_name,
-                        "제목": title,
-                        "링크": link,
-                        "수집시점": kst_now.strftime("%Y-%m-%d %H:%M")
-                    })
-                    keyword_count += 1
-                except Exception: continue
-            
-            print(f"      ✨ 수집: {keyword_count}건")
-            time.sleep(1)
 
-    except Exception as e:
-        print(f"에러 발생: {e}")
-    finally:
-        driver.quit()
-    
+def _is_fresh(text):
+    """'분 전/시간 전/방금 전' 표기 = 수집 대상 최근 글."""
+    return any(marker in text for marker in FRESH_MARKERS)
+
+
+def _load_results(driver, max_scrolls):
+    """결과가 실제로 늘어날 때만 기다리며 스크롤. (스크롤 횟수, 소요 초, 종료 사유) 반환.
+
+    고정 sleep 대신 결과 개수 변화를 WebDriverWait로 기다리고, 새 항목이 더 이상
+    안 붙거나 가장 오래된 항목이 최근 글 범위를 벗어나면 바로 멈춘다 (최신순 정렬이라 더 내려가도 오래된 글뿐).
+    """
+    start = time.monotonic()
+    try:
+        with metrics.stage("page_load"):
+            WebDriverWait(driver, NAVER_PAGE_TIMEOUT).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, "li.bx"))
+            )
+    except TimeoutException:
+        return 0, time.monotonic() - start, "결과 없음"
+    scroll_start = time.monotonic()
+
+    body = driver.find_element(By.TAG_NAME, "body")
+    count, last_text = driver.execute_script(_RESULT_STATE_JS)
+    scrolls = 0
+    stop_reason = "최대 스크롤"
+    while scrolls < max_scrolls:
+        if not _is_fresh(last_text):
+            stop_reason = "최근 글 범위 벗어남"
+            break
+        body.send_keys(Keys.END)
+        scrolls += 1
+        try:
+            count, last_text = WebDriverWait(driver, NAVER_SCROLL_TIMEOUT, poll_frequency=0.2).until(
+                lambda d: _grown_state(d, count)
+            )
+        except TimeoutException:
+            stop_reason = "추가 로딩 없음"
+            break
+    metrics.add_time("scroll", time.monotonic() - scroll_start)
+    metrics.api("naver.scroll", scrolls)
+    return scrolls, time.monotonic() - start, stop_reason
+
+
+def _grown_state(driver, previous_count):
+    state = driver.execute_script(_RESULT_STATE_JS)
+    return state if state[0] > previous_count else False
+
+
+def _crawl_naver_keyword(driver, keyword, limiter):
+    """키워드 1개 검색 결과를 스크롤해 후보 레코드 목록으로 반환 (판매글·브랜드 무관 판정은 수집기 필터 단계에서)."""
+    print(f"   🔍 '{keyword}' 검색 중...")
+    limiter.wait(NAVER_SEARCH_URL)
+    with metrics.stage("page_load"):
+        driver.get(NAVER_SEARCH_URL + keyword)
+    metrics.api("naver.page_load")
+
+    max_scrolls = _max_scrolls(keyword)
+    scrolls, elapsed, stop_reason = _load_results(driver, max_scrolls)
+    print(f"      📜 스크롤 {scrolls}/{max_scrolls}회, {elapsed:.1f}초 ({stop_reason})")
+
+    with metrics.stage("extract"):
+        if NAVER_EXTRACT_MODE == "element":
+            items = _extract_items_by_element(driver)
+        else:
+            items = _extract_items_by_script(driver)
+    data_list = naver_candidates(keyword, items)
+
+    print(f"      ✨ '{keyword}' 후보: {len(data_list)}건 (항목 {len(items)}개)")
     return data_list
 
+
+def naver_candidates(keyword, items):
+    """추출한 검색 결과 항목(dict: cafe_name, title, href, text) 중 대상 카페의 최근 글을 레코드로 변환."""
+    metrics.count(keyword, "seen", len(items))
+    now = kst_now()
+    candidates = []
+    for item in items:
+        if not any(target in item["cafe_name"] for target in TARGET_CAFE_KEYWORDS):
+            metrics.count(keyword, "off_cafe")
+            continue
+        if not _is_fresh(item["text"]):
+            metrics.count(keyword, "stale")
+            continue
+        if item["title"] is None:
+            metrics.count(keyword, "no_title")
+            continue
+        candidates.append(new_record(keyword, item["cafe_name"], item["title"], canonicalize_link(item["href"]), now))
+    return candidates
+
+
+def build_naver_records(keyword, items):
+    """후보 변환 + [VoC 필터] 판매·거래/주식 글 배제 + 브랜드 무관 글 배제 (수집기 실행과 같은 결과, 벤치마크용)."""
+    return filter_records(naver_candidates(keyword, items), metrics)
+
+
+# 검색 결과 전체를 한 번의 execute_script로 추출 (항목·필드마다 chromedriver를 왕복하지 않음)
+#  - cafe_name: a.txt_name → a.name 순 / title·href: a.title_link (없으면 null) / text: 항목 전체 텍스트
+_EXTRACT_ITEMS_JS = """
+return Array.prototype.map.call(document.querySelectorAll('li.bx'), function (li) {
+    var cafe = li.querySelector('a.txt_name') || li.querySelector('a.name');
+    var title = li.querySelector('a.title_link');
+    return {
+        cafe_name: cafe ? cafe.innerText.trim() : '',
+        title: title ? title.innerText.trim() : null,
+        href: title ? title.href : null,
+        text: li.innerText
+    };
+});
+"""
+
+
+def _extract_items_by_script(driver):
+    return driver.execute_script(_EXTRACT_ITEMS_JS)
+
+
+def _extract_items_by_element(driver):
+    """기존 방식: 항목·필드마다 find_element 호출 (비교·호환용, NAVER_EXTRACT_MODE=element)."""
+    items = []
+    for article in driver.find_elements(By.CSS_SELECTOR, "li.bx"):
+        try:
+            cafe_name = ""
+            try: cafe_name = article.find_element(By.CSS_SELECTOR, "a.txt_name").text
+            except: 
+                try: cafe_name = article.find_element(By.CSS_SELECTOR, "a.name").text
+                except: pass
+
+            try:
+                title_ele = article.find_element(By.CSS_SELECTOR, "a.title_link")
+                title, href = title_ele.text, title_ele.get_attribute("href")
+            except: title, href = None, None
+
+            items.append({"cafe_name": cafe_name, "title": title, "href": href, "text": article.text})
+        except Exception: continue
+    return items
+
+
+def _max_scrolls(keyword):
+    return 15 if keyword in DEEP_SEARCH_KEYWORDS else 3
+
+
+class NaverCafeCollector(Collector):
+    """네이버 카페 검색 수집기: 키워드 1개 = 수집 단위 1개, workers개 키워드를 동시에 처리.
+
+    backend="http"면 브라우저 없이 HTTP로 먼저 받고, 실패한(또는 결과를 못 읽은) 키워드만
+    Selenium으로 다시 수집한다. 브라우저는 처음 필요할 때 띄워(최대 workers개) 키워드끼리 돌려 씀.
+    """
+
+    name = "naver"
+    min_interval = NAVER_DOMAIN_INTERVAL
+    voc_filter = True
+    max_interval = 86400  # 최근 글('시간 전')만 수집하므로 하루보다 길게 두면 글을 놓침
+
+    def __init__(self, keywords=None, workers=None, backend=None):
+        super().__init__()
+        self.keywords = list(NAVER_SEARCH_KEYWORDS if keywords is None else keywords)
+        self.workers = max(1, workers or NAVER_WORKERS)
+        self.backend = backend or NAVER_BACKEND
+        self.fetcher = None
+        self._driver_path = None
+        self._drivers = []
+        self._pool = queue.Queue()
+        self._driver_lock = threading.Lock()
+
+    def units(self):
+        return self.keywords
+
+    def daily_cost(self):
+        return float(NAVER_DAEMON_POLLS) if NAVER_DAEMON_POLLS else float(len(self.keywords))
+
+    def open(self):
+        print(f"\n🚀 [Naver] 고성능 크롤러 시작 ({self.backend}, 워커 {self.workers}개)")
+        if self.backend == "http":
+            self.fetcher = HttpFetcher(
+                NAVER_SEARCH_URL, session=new_session(self.workers), limiter=self.limiter, is_fresh=_is_fresh,
+                metrics=metrics,
+            )
+
+    def fetch(self, keyword):
+        if self.fetcher is not None:
+            items = self._fetch_http(keyword)
+            if items:
+                data_list = naver_candidates(keyword, items)
+                print(f"      ✨ '{keyword}' 후보: {len(data_list)}건 (항목 {len(items)}개)")
+                return data_list
+            print(f"   ↩️ '{keyword}' HTTP 수집 실패 → Selenium으로 재시도")
+        driver = self._borrow_driver()
+        try:
+            data_list = _crawl_naver_keyword(driver, keyword, self.limiter)
+        except WebDriverException:
+            # 브라우저가 죽었거나 응답이 없으면 버리고 다음 키워드에서 새로 띄움 (상주 실행에서 계속 쓰므로)
+            self._discard_driver(driver)
+            raise
+        except Exception:
+            self._pool.put(driver)
+            raise
+        self._pool.put(driver)
+        return data_list
+
+    def _fetch_http(self, keyword):
+        """HTTP로 검색 결과 항목 조회. 실패하거나 결과 구조를 못 읽으면(차단·마크업 변경 등) 빈 목록."""
+        print(f"   🔍 '{keyword}' 검색 중... (HTTP)")
+        try:
+            # 첫 페이지 + 스크롤 1회당 1페이지
+            items = self.fetcher.fetch_items(keyword, max_pages=_max_scrolls(keyword) + 1)
+        except Exception as e:
+            print(f"에러 발생 ('{keyword}', HTTP): {e}")
+            return []
+        if not items:
+            print(f"      ⚠️ '{keyword}' HTTP 응답에서 검색 결과를 찾지 못함")
+        return items
+
+    def _borrow_driver(self):
+        """쉬는 브라우저를 빌림. 모두 사용 중이고 workers개보다 적게 떠 있으면 새로 띄움."""
+        with self._driver_lock:
+            if self._pool.empty() and len(self._drivers) < self.workers:
+                if self._driver_path is None:
+                    with metrics.stage("driver_startup"):
+                        self._driver_path = ChromeDriverManager().install()  # 드라이버 경로는 1회만 확인해 공유
+                driver = _new_chrome_driver(self._driver_path)
+                self._drivers.append(driver)
+                return driver
+        return self._pool.get()
+
+    def _discard_driver(self, driver):
+        with self._driver_lock:
+            self._drivers.remove(driver)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def close(self):
+        for driver in self._drivers:
+            driver.quit()
+        self._drivers = []
+        self._pool = queue.Queue()
+
+
+def collectors(per_topic=False):
+    """이번 실행의 수집기 목록. 새 출처는 Collector 하위 클래스를 만들어 여기에 추가 (모두 동시에 실행됨).
+
+    per_topic: 유튜브를 주제별 단위로 나눔 (상주 실행)
+    """
+    return [NaverCafeCollector(), YouTubeCollector(per_topic=per_topic)]
+
 # ======================================================
-# [기능 3] 메인 실행 및 저장 (초기화 로직 적용 ✨)
+# [기능 3] 저장소 반영 및 GitHub 업로드
 # ======================================================
-if __name__ == "__main__":
-    # 1. 수집
-    naver_data = crawl_naver()
-    youtube_data = crawl_youtube()
-    
-    # 2. 합치기
-    all_data = naver_data + youtube_data
-    
-    # 3. 데이터 처리 및 저장
-    df_new = pd.DataFrame(all_data)
-    if not df_new.empty:
-        df_new = df_new[["작성일", "키워드", "카페명", "제목", "링크", "수집시점"]]
-        # 줄바꿈/캐리지리턴 제거 (CSV 깨짐 방지 → 다음 실행의 read_csv 실패 예방)
-        for col in df_new.columns:
-            df_new[col] = df_new[col].astype(str).str.replace(r"[\r\n]+", " ", regex=True).str.strip()
-
-    if os.path.exists(FILE_NAME):
+def save_records(store, records, run_id):
+    """수집 레코드 중 신규 행만 저장소에 추가하고 CSV export·색인 갱신. (저장소, 추가된 행) 반환.
+
+    저장소가 아직 없으면 기존 CSV를 먼저 이관하므로 반환된 저장소 객체를 계속 써야 한다.
+    """
+    # 제목·카페명·링크의 줄바꿈/캐리지리턴 제거 (CSV 깨짐 방지 → 다음 실행의 read_csv 실패 예방)
+    with metrics.stage("merge"):
+        df_new = records_frame(records)
+        # 최초 1회: 기존 CSV를 월별 파티션 저장소로 이관 (이후로는 CSV를 읽지 않음)
+        if not store.exists() and os.path.exists(FILE_NAME):
+            store = VocStore.import_csv(FILE_NAME, STORE_DIR)
+            print(f"📦 기존 CSV를 저장소로 이관 완료 ({STORE_DIR}/)")
+
+        # ✅ 중복 제거 후 신규 행만 해당 월 파티션 끝에 추가 (기존 행은 다시 쓰지 않음)
+        #    (키워드, 정규화 링크) 키는 저장소의 중복 인덱스로 배치 크기만큼만 조회
+        #    새 행에는 수집순번·실행ID가 붙고, 슬랙 리포트는 마지막 보고 순번 이후 행을 읽음
+        df_added = store.append_unique(df_new, run_id)
+        # 대시보드 호환용 CSV export (지난 export 뒤에 새 행만 이어 씀)
+        store.export_csv(FILE_NAME)
+    kept_counts = df_added["키워드"].value_counts()
+    for keyword, collected in df_new["키워드"].value_counts().items():
+        metrics.count(keyword, "dup", collected - kept_counts.get(keyword, 0))
+        metrics.count(keyword, "kept", kept_counts.get(keyword, 0))
+
+    # 필터 규칙 기준표가 없으면 배포된 규칙으로 생성 (voc_store와 함께 커밋 → 규칙 수정 후 voc_rules.py diff의 비교 기준)
+    seed_baseline(store.root)
+    # 대시보드 제목 검색 색인에도 새 행만 추가
+    with metrics.stage("search_index"):
+        search = SearchIndex.of_store(store)
         try:
-            # 기존 데이터 읽기 (깨진 행이 있어도 죽지 않도록 견고하게)
-            try:
-                df_old = pd.read_csv(FILE_NAME)
-            except Exception as read_err:
-                print(f"⚠️ 기본 파서 실패 → 견고 모드로 재시도: {read_err}")
-                df_old = pd.read_csv(FILE_NAME, engine="python", on_bad_lines="skip")
+            search.sync(store)
+        finally:
+            search.close()
+    # 유사 글 묶음 배정 (새 행마다 LSH 버킷 조회 — 전체 행 수와 무관한 비용)
+    with metrics.stage("cluster"):
+        clusters = ClusterIndex.of_store(store)
+        try:
+            clusters.sync(store)
+        finally:
+            clusters.close()
+    return store, df_added
+
+
+def push_to_github():
+    print("\n🐙 GitHub 업로드 시작...")
+    subprocess.run(["git", "config", "--global", "user.name", "GitHub Action Bot"], check=False)
+    subprocess.run(["git", "config", "--global", "user.email", "actions@github.com"], check=False)
+    with metrics.stage("git_push"):
+        # 예전에 커밋된 sqlite 색인은 추적 해제 (.gitignore — 다음 실행에서 저장소로 다시 만듦)
+        subprocess.run(["git", "rm", "-q", "--cached", "--ignore-unmatch", os.path.join(STORE_DIR, "*.sqlite3")], check=False)
+        subprocess.run(["git", "add", FILE_NAME, STORE_DIR], check=True)
+        commit_msg = f"Update data: {datetime.now().strftime('%Y-%m-%d %H:%M')}"
+        try:
+            subprocess.run(["git", "commit", "-m", commit_msg], check=True)
+            subprocess.run(["git", "push"], check=True)
+            print("✅ GitHub Push 완료!")
+        except subprocess.CalledProcessError:
+            print("   -> (GitHub) 변경 사항 없음 (이미 최신)")
 
-            # 덮어쓰기 전 백업 (만일을 대비한 안전장치)
-            df_old.to_csv(f"{FILE_NAME}.bak", index=False, encoding="utf-8-sig")
 
-            # ✅ [핵심 수정] 기존 데이터에서 '(New)' 꼬리표 떼기! (초기화)
-            if '작성일' in df_old.columns:
-                df_old['작성일'] = df_old['작성일'].str.replace(" (New)", "", regex=False)
-            
-            # 구버전 파일 호환성 처리
-            if "키워드" not in df_old.columns:
-                # 파일 포맷이 다르면 그냥 덮어씀
-                if not df_new.empty:
-                    df_new.to_csv(FILE_NAME, mode='w', header=True, index=False, encoding="utf-8-sig")
+def write_run_report():
+    try:
+        metrics.write(RUN_LOG)
+        report = metrics.report()
+        stage_text = ", ".join(f"{name} {s['seconds']:.1f}초" for name, s in report["stages"].items())
+        print(f"\n⏱️ 실행 {report['wall_seconds']:.1f}초 ({stage_text}) → {RUN_LOG}")
+    except OSError as e:
+        print(f"⚠️ 실행 보고서 기록 실패: {e}")
+
+# ======================================================
+# [기능 4] 1회 실행 (신규 행만 저장소에 append ✨)
+# ======================================================
+def run_once(resume=False):
+    # 0. 중간 결과 보관함: 키워드가 끝날 때마다 기록 → 도중에 죽어도 끝난 키워드 결과는 남음
+    #    --resume: 마지막 미완료 실행의 실행ID·보관분을 이어받음 / 그 외 남은 보관분은 이번 실행에 합쳐 저장
+    leftovers = CrawlSpool.pending()
+    if resume and leftovers:
+        spool = leftovers.pop()
+        print(f"↩️ 실행 {spool.run_id} 이어서 수집 (완료된 단위 {len(spool.units)}개: {', '.join(spool.units)})")
+    else:
+        if resume:
+            print("↩️ 이어서 수집할 실행이 없어 새로 시작합니다.")
+        spool = CrawlSpool.create(new_run_id())
+    run_id = spool.run_id
+    metrics.run_id = run_id
+    metrics.info.update(naver_backend=NAVER_BACKEND, naver_workers=NAVER_WORKERS, resumed_units=len(spool.units))
+
+    # 1. 수집: 모든 수집기를 동시에 실행 (실행 시간 ≈ 가장 느린 수집기, 이미 끝난 단위는 건너뜀)
+    sources = collectors()
+    run_collectors(sources, on_batch=spool.record, skip=set(spool.units), metrics=metrics)
+
+    # 2. 합치기 (예전 미완료 실행분 → 이번 실행분, 각각 수집기 등록 순서 → 단위 순서)
+    order = [unit_key(source, unit) for source in sources for unit in source.units()]
+    all_data = [record for old in leftovers for record in old.records(order)] + spool.records(order)
+    if leftovers:
+        print(f"📥 병합하지 못했던 실행 {len(leftovers)}개의 보관분 {len(all_data) - len(spool.records())}건을 함께 저장")
+
+    # 3. 데이터 처리 및 저장
+    store = VocStore(STORE_DIR)
+    if not store.exists() and not os.path.exists(FILE_NAME) and not all_data:
+        print("\n💤 수집된 데이터가 없습니다.")
+        for finished in leftovers + [spool]:
+            finished.remove()
+    else:
+        try:
+            store, df_added = save_records(store, all_data, run_id)
+            added = len(df_added)
+            # 저장소에 반영된 단위만 증분 상태(유튜브 커서·댓글 워터마크)를 옮김
+            for source in sources:
+                for unit in source.units():
+                    source.commit(unit)
+            # 저장소에 반영됐으므로 보관분 삭제 (이후 git 단계가 실패해도 데이터는 저장소에 있음)
+            for finished in leftovers + [spool]:
+                finished.remove()
+            # 실행 보고서를 이번 커밋에 포함 (git push 시간은 아래에서 같은 줄을 고쳐 쓰고, 다음 실행 커밋에 반영)
+            metrics.write(RUN_LOG)
+
+            if added:
+                print(f"\n💾 로컬 저장 및 갱신 완료 ({added}건 신규 추가, 실행ID {run_id})")
             else:
-                # 중복 제거 후 병합 — 네이버 링크의 ?art= 토큰이 검색 시점마다 달라지므로
-                # 정규화한 링크 기준, 같은 글도 키워드별로는 각각 1건 허용: (키워드, 링크) 키
-                if '링크' in df_old.columns:
-                    df_old['링크'] = df_old['링크'].astype(str).map(canonicalize_link)
-                if not df_new.empty:
-                    df_new = df_new.drop_duplicates(subset=['키워드', '링크'])
-                    old_keys = set(zip(df_old['키워드'].astype(str), df_old['링크']))
-                    is_dup = df_new.apply(lambda r: (r['키워드'], r['링크']) in old_keys, axis=1)
-                    df_final = df_new[~is_dup]
-                else:
-                    df_final = pd.DataFrame()
-
-                # ✅ [핵심 수정] Old(태그 뗌) + New(태그 있음) 합치기
-                combined_df = pd.concat([df_old, df_final], ignore_index=True)
-                
-                # ✅ [핵심 수정] mode='w'로 전체 덮어쓰기 (그래야 태그 뗀 게 반영됨)
-                combined_df.to_csv(FILE_NAME, index=False, encoding="utf-8-sig")
-                
-                if not df_final.empty:
-                    print(f"\n💾 로컬 저장 및 갱신 완료 ({len(df_final)}건 신규 추가)")
-                else:
-                    print("\n💾 로컬 데이터 갱신 완료 (신규 데이터 없음, 태그만 정리됨)")
-
-                # GitHub 업로드 (파일 내용이 바뀌었으므로 무조건 시도)
-                print("\n🐙 GitHub 업로드 시작...")
-                subprocess.run(["git", "config", "--global", "user.name", "GitHub Action Bot"], check=False)
-                subprocess.run(["git", "config", "--global", "user.email", "actions@github.com"], check=False)
-                subprocess.run(["git", "add", FILE_NAME], check=True)
-                commit_msg = f"Update data: {datetime.now().strftime('%Y-%m-%d %H:%M')}"
-                try:
-                    subprocess.run(["git", "commit", "-m", commit_msg], check=True)
-                    subprocess.run(["git", "push"], check=True)
-                    print("✅ GitHub Push 완료!")
-                except subprocess.CalledProcessError:
-                    print("   -> (GitHub) 변경 사항 없음 (이미 최신)")
+                print("\n💾 로컬 데이터 갱신 완료 (신규 데이터 없음)")
+
+            push_to_github()
 
         except Exception as e:
             # ⛔ [중요] 여기서 절대 새 데이터만으로 덮어쓰지 않는다.
             #    과거 누적분 전체가 사라지는 초기화 사고의 직접 원인이었음.
             #    에러가 나면 기존 파일은 그대로 두고 종료한다.
             print(f"❌ 파일 처리 에러 (기존 데이터 보존, 덮어쓰기 안 함): {e}")
+
+    write_run_report()
+
+# ======================================================
+# [기능 5] 상주 실행 (브라우저·저장소를 띄워 둔 채 키워드·주제별 주기로 수집)
+# ======================================================
+def run_daemon():
+    """키워드·유튜브 주제마다 최근 새 글 수에 맞춘 주기로 계속 수집 (voc_daemon.py).
+
+    수집 단위마다 바로 저장소에 반영하고, DAEMON_FLUSH_INTERVAL마다 실행 보고서를 1줄 남기고
+    그 사이 새 행이 있었으면 GitHub에 올린다 (DAEMON_GIT_PUSH=0이면 올리지 않음).
+    """
+    from voc_daemon import DAEMON_GIT_PUSH, CrawlDaemon
+
+    def start_window():
+        metrics.restart(new_run_id())
+        metrics.info.update(mode="daemon", naver_backend=NAVER_BACKEND, naver_workers=NAVER_WORKERS)
+
+    store = VocStore(STORE_DIR)
+
+    def save(key, records):
+        nonlocal store
+        if not records:
+            return 0
+        if store.exists():
+            store.refresh()  # 슬랙 전송(slack_sender.py)이 옮긴 보고 위치를 덮어쓰지 않도록
+        store, df_added = save_records(store, records, metrics.run_id)
+        return len(df_added)
+
+    def flush(added):
+        metrics.write(RUN_LOG)
+        if added and DAEMON_GIT_PUSH:
+            push_to_github()
+        write_run_report()
+        start_window()
+
+    start_window()
+    CrawlDaemon(collectors(per_topic=True), save, flush, metrics).run()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="VoC 수집")
+    parser.add_argument("--resume", action="store_true", help="마지막 미완료 실행을 이어서 (끝난 키워드는 건너뜀)")
+    parser.add_argument("--daemon", action="store_true", help="상주 실행: 키워드·주제별 주기로 계속 수집 (/health, /metrics 제공)")
+    args = parser.parse_args()
+
+    if args.daemon:
+        run_daemon()
     else:
-        # 파일이 없을 때
-        if not df_new.empty:
-            df_new.to_csv(FILE_NAME, mode='w', header=True, index=False, encoding="utf-8-sig")
-            print(f"\n✅ 신규 파일 생성 완료.")
-            subprocess.run(["git", "add", FILE_NAME], check=True)
-            subprocess.run(["git", "commit", "-m", "Init data"], check=True)
-            subprocess.run(["git", "push"], check=True)
-        else:
-            print("\n💤 수집된 데이터가 없습니다.")
+        run_once(resume=args.resume)
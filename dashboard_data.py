@@ -0,0 +1,266 @@
+# 대시보드(app.py) 데이터 계층: 파일이 바뀔 때만 다시 읽고, 뒤에 붙은 행만 증분으로 읽어 구간별 뷰를 미리 계산
+#  - 저장소(voc_store/ 월 파티션)가 있으면 파티션을, 없으면 electlink_voc.csv를 읽는다
+#  - 파일 크기·수정 시각이 그대로면 파싱 없이 이전 결과 재사용
+#  - 파일이 뒤로만 자랐으면(append) 늘어난 꼬리 바이트만 파싱해 이어 붙임
+import io
+import os
+import threading
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from voc_cluster import CLUSTER_FILE, load_clusters, with_clusters
+from voc_metrics import COUNTERS, RUN_LOG_FILE, STAGES, read_run_reports
+from voc_rollup import ISSUE_KEYWORDS, ROLLUP_FILE, Rollup, rollup_counts
+from voc_schema import COLUMNS, KST, SEQ_COLUMN, SOURCE_COLUMN, SOURCE_NAVER, SOURCE_YT_COMMENT, SOURCE_YT_VIDEO, typed
+from voc_store import STORE_DIR
+
+CSV_FILE = "electlink_voc.csv"
+
+# 구간 정의 (SK / 경쟁사 / 유튜브). 이슈 감지 단어는 voc_rollup.ISSUE_KEYWORDS
+SK_KEYWORDS = ["SK일렉링크", "일렉링크"]
+COMPETITOR_KEYWORDS = ["워터", "채비", "이브이시스"]
+# 점유율 추이 차트의 브랜드 (daily_counts 컬럼명)
+SHARE_OF_VOICE = ["sk"] + COMPETITOR_KEYWORDS
+# 수집 실행 지표에 표시할 최근 실행 수
+RUN_HISTORY = 200
+
+# 증분 읽기 전, 이전 끝부분이 그대로인지 확인할 바이트 수 (중간이 고쳐 쓰였으면 전체 재로딩)
+_TAIL_CHECK_BYTES = 256
+
+DashboardViews = namedtuple(
+    "DashboardViews",
+    [
+        "version", "df", "df_sk", "df_comp", "comp_by_keyword", "df_youtube", "df_yt_videos", "df_yt_comments",
+        "sk_issue_df", "daily_counts",
+    ],
+)
+
+
+class IncrementalCsv:
+    """CSV 1개를 기억해 두고, 바뀐 만큼만 다시 읽는 리더."""
+
+    def __init__(self, path):
+        self.path = path
+        self.frame = None
+        self.offset = 0        # 지금까지 파싱한 바이트 위치 (항상 줄 끝)
+        self.mtime = None
+        self.tail_bytes = b""  # offset 직전 바이트 (증분 가능 여부 확인용)
+
+    def refresh(self):
+        """(DataFrame, 바뀌었는지) 반환."""
+        stat = os.stat(self.path)
+        if self.frame is not None and stat.st_size == self.offset and stat.st_mtime == self.mtime:
+            return self.frame, False
+        if self.frame is not None and stat.st_size > self.offset and self._prefix_unchanged():
+            self._read_tail(stat)
+        else:
+            self._read_full(stat)
+        return self.frame, True
+
+    def _prefix_unchanged(self):
+        if not self.tail_bytes.endswith(b"\n"):
+            return False
+        with open(self.path, "rb") as f:
+            f.seek(self.offset - len(self.tail_bytes))
+            return f.read(len(self.tail_bytes)) == self.tail_bytes
+
+    def _read_full(self, stat):
+        with open(self.path, "rb") as f:
+            raw = f.read()
+        self.frame = pd.read_csv(io.BytesIO(raw), dtype=str, keep_default_na=False, encoding="utf-8-sig")
+        self._remember(raw, stat)
+
+    def _read_tail(self, stat):
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            raw = f.read()
+        tail = pd.read_csv(
+            io.BytesIO(raw), header=None, names=list(self.frame.columns), dtype=str, keep_default_na=False
+        )
+        self.frame = pd.concat([self.frame, tail], ignore_index=True)
+        self._remember(raw, stat, base=self.offset)
+
+    def _remember(self, raw, stat, base=0):
+        self.offset = base + len(raw)
+        self.mtime = stat.st_mtime
+        self.tail_bytes = raw[-_TAIL_CHECK_BYTES:]
+
+
+class DashboardData:
+    """대시보드용 데이터 캐시 (Streamlit의 cache_resource로 세션 간 1개를 공유)."""
+
+    def __init__(self, store_dir=STORE_DIR, csv_file=CSV_FILE):
+        self.store_dir = store_dir
+        self.csv_file = csv_file
+        self._readers = {}
+        self._views = None
+        self._version = 0
+        self._clusters_mtime = None
+        self._lock = threading.Lock()
+
+    def _source_paths(self):
+        if os.path.isdir(self.store_dir):
+            partitions = sorted(
+                os.path.join(self.store_dir, name) for name in os.listdir(self.store_dir) if name.endswith(".csv")
+            )
+            if partitions:
+                return partitions
+        return [self.csv_file] if os.path.exists(self.csv_file) else []
+
+    def load(self) -> DashboardViews:
+        """바뀐 파일만 다시 읽고, 변경이 있을 때만 구간별 뷰를 다시 계산. 데이터가 없으면 FileNotFoundError."""
+        with self._lock:
+            paths = self._source_paths()
+            if not paths:
+                raise FileNotFoundError(self.csv_file)
+
+            changed = set(self._readers) != set(paths)
+            self._readers = {path: self._readers.get(path) or IncrementalCsv(path) for path in paths}
+            frames = []
+            for path in paths:
+                frame, was_changed = self._readers[path].refresh()
+                frames.append(frame)
+                changed = changed or was_changed
+
+            # 유사 글 묶음 색인은 크롤러가 파티션보다 늦게 갱신하므로 따로 변경 확인
+            changed = changed or self._clusters_mtime_now() != self._clusters_mtime
+
+            if changed or self._views is None:
+                self._version += 1
+                df = pd.concat(frames, ignore_index=True)
+                # 색인 파일은 커밋하지 않으므로 없으면 여기서 저장소로 다시 만듦 (있으면 새 행만 배정)
+                clusters = load_clusters(self.store_dir)
+                self._views = build_views(df, self._version, self._stored_rollup(len(df)), clusters)
+            self._clusters_mtime = self._clusters_mtime_now()
+            return self._views
+
+    def _clusters_mtime_now(self):
+        path = os.path.join(self.store_dir, CLUSTER_FILE)
+        return os.path.getmtime(path) if os.path.exists(path) else None
+
+    def _stored_rollup(self, rows):
+        """저장소의 일별 집계 (읽은 행 수와 맞을 때만; 아니면 None → build_views가 직접 집계)."""
+        path = os.path.join(self.store_dir, ROLLUP_FILE)
+        if not os.path.exists(path):
+            return None
+        rollup = Rollup(path)
+        return rollup.counts if rollup.synced_rows == rows else None
+
+
+def build_views(df, version=0, rollup=None, clusters=None) -> DashboardViews:
+    """정렬·구간 분리·이슈 감지를 한 번에 계산 (rerun마다 반복하지 않도록).
+
+    rollup: 저장소의 일별 집계 (voc_rollup). 없으면 df에서 한 번 집계.
+    clusters: 수집순번 → 유사 글 묶음 ID (voc_cluster). 있으면 클러스터 컬럼을 붙임.
+    """
+    if "키워드" in df.columns:
+        df = df.reindex(columns=list(dict.fromkeys(COLUMNS + list(df.columns))), fill_value="")
+    # 작성일은 KST datetime (voc_schema) — 내림차순 정렬해 두면 기간 필터를 이진 탐색으로 처리
+    df = typed(df)
+    if clusters is not None and SEQ_COLUMN in df.columns:
+        df = with_clusters(df, clusters)
+    df = df.sort_values(by="작성일", ascending=False, kind="stable", ignore_index=True)
+    if "키워드" not in df.columns:
+        return DashboardViews(version, df, *([None] * (len(DashboardViews._fields) - 2)))
+
+    keywords = df["키워드"]
+    df_sk = df[keywords.isin(SK_KEYWORDS)]
+    df_comp = df[keywords.isin(COMPETITOR_KEYWORDS)]
+    comp_by_keyword = {kw: df_comp[df_comp["키워드"] == kw] for kw in COMPETITOR_KEYWORDS}
+    df_youtube = df[df[SOURCE_COLUMN] != SOURCE_NAVER]
+    df_yt_videos = df_youtube[df_youtube[SOURCE_COLUMN] == SOURCE_YT_VIDEO]
+    df_yt_comments = df_youtube[df_youtube[SOURCE_COLUMN] == SOURCE_YT_COMMENT]
+    sk_issue_df = df_sk[df_sk["제목"].str.contains("|".join(ISSUE_KEYWORDS), na=False)]
+
+    # 날짜별 건수 (요약 지표·추이 차트는 행을 다시 세지 않고 이 표의 구간 합으로 계산)
+    daily_counts = daily_segment_counts(rollup if rollup is not None else rollup_counts(df))
+
+    return DashboardViews(
+        version, df, df_sk, df_comp, comp_by_keyword, df_youtube, df_yt_videos, df_yt_comments, sk_issue_df,
+        daily_counts,
+    )
+
+
+def daily_segment_counts(counts) -> pd.DataFrame:
+    """집계 행(date, keyword, source, issue, count) → 날짜 × 구간별 건수 표 (날짜 오름차순)."""
+    keyword, source = counts["keyword"], counts["source"]
+    is_sk = keyword.isin(SK_KEYWORDS)
+    masks = {
+        "all": pd.Series(True, index=counts.index),
+        "sk": is_sk,
+        "sk_issue": is_sk & (counts["issue"].astype(int) == 1),
+        "comp": keyword.isin(COMPETITOR_KEYWORDS),
+        "youtube": source.isin([SOURCE_YT_VIDEO, SOURCE_YT_COMMENT]),
+        "yt_videos": source == SOURCE_YT_VIDEO,
+        "yt_comments": source == SOURCE_YT_COMMENT,
+    }
+    masks.update({kw: keyword == kw for kw in COMPETITOR_KEYWORDS})
+    values = counts["count"].astype(int)
+    daily = pd.DataFrame({name: values.where(mask, 0) for name, mask in masks.items()})
+    return daily.groupby(counts["date"].rename("_date")).sum().sort_index()
+
+
+def share_of_voice(views, start, end, freq="D"):
+    """구간 내 브랜드별 건수와 점유율(%) — (counts, share), 인덱스는 날짜(freq 단위로 합산)."""
+    counts = views.daily_counts.loc[start:end, SHARE_OF_VOICE]
+    counts.index = pd.to_datetime(counts.index, errors="coerce")
+    counts = counts[counts.index.notna()]
+    if freq != "D":
+        counts = counts.resample(freq).sum()
+    counts = counts.rename(columns={"sk": "SK일렉링크"})
+    totals = counts.sum(axis=1).replace(0, np.nan)
+    share = counts.div(totals, axis=0).fillna(0) * 100
+    return counts, share
+
+
+def date_window(frame, start, end):
+    """작성일 내림차순 프레임에서 start~end(포함, 'YYYY-MM-DD') 구간 행만 잘라냄 (이진 탐색, 복사 없음).
+
+    작성일이 NaT인 행은 내림차순 정렬 시 맨 뒤에 있어 어떤 구간에도 포함되지 않는다.
+    """
+    ascending = frame["작성일"].iloc[::-1]
+    lo = ascending.searchsorted(pd.Timestamp(start, tz=KST), side="left")
+    hi = ascending.searchsorted(pd.Timestamp(end, tz=KST) + pd.Timedelta(days=1), side="left")
+    n = len(frame)
+    return frame.iloc[n - hi:n - lo]
+
+
+def segment_frame(views, segment):
+    """count_in_range의 구간 이름 → 해당 행 프레임 (작성일 내림차순)."""
+    frames = {
+        "sk": views.df_sk, "sk_issue": views.sk_issue_df, "comp": views.df_comp, "youtube": views.df_youtube,
+        "yt_videos": views.df_yt_videos, "yt_comments": views.df_yt_comments, **views.comp_by_keyword,
+    }
+    return frames[segment]
+
+
+def count_in_range(views, segment, start, end):
+    """views.daily_counts에서 구간 합계 (segment: sk / sk_issue / comp / youtube / 워터 ...)."""
+    counts = views.daily_counts
+    if counts is None or segment not in counts.columns:
+        return 0
+    return int(counts[segment].loc[start:end].sum())
+
+
+# ======================================================
+# 수집 실행 지표 (crawler.py가 남기는 voc_store/crawl_runs.jsonl)
+# ======================================================
+RunFrames = namedtuple("RunFrames", ["stages", "api_calls", "keywords", "latest"])
+
+
+def load_run_frames(path=os.path.join(STORE_DIR, RUN_LOG_FILE), limit=RUN_HISTORY):
+    """실행 보고서 → 차트용 프레임. stages·api_calls는 실행 시각 × 단계(호출 종류), keywords는 마지막 실행의 키워드 × 카운터."""
+    reports = read_run_reports(path, limit)
+    if not reports:
+        return None
+    index = pd.to_datetime([r.get("started_at") for r in reports], errors="coerce")
+    stages = pd.DataFrame(
+        [{name: s["seconds"] for name, s in r.get("stages", {}).items()} for r in reports], index=index
+    ).reindex(columns=[s for s in STAGES if any(s in r.get("stages", {}) for r in reports)]).fillna(0)
+    api_calls = pd.DataFrame([r.get("api_calls", {}) for r in reports], index=index).fillna(0).astype(int)
+    latest = reports[-1]
+    keywords = pd.DataFrame.from_dict(latest.get("keywords", {}), orient="index")
+    keywords = keywords.reindex(columns=[c for c in COUNTERS if c in keywords.columns]).fillna(0).astype(int)
+    return RunFrames(stages, api_calls, keywords, latest)
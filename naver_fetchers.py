@@ -0,0 +1,269 @@
+# 네이버 카페 검색 결과를 브라우저 없이 HTTP로 가져오는 백엔드 (crawler.py의 NAVER_BACKEND=http)
+#  - fetch_items(keyword) → crawler.naver_candidates가 받는 항목 dict 목록 (Selenium 추출과 같은 필드)
+#  - 저장해 둔 HTML로 오프라인 확인:  python naver_fetchers.py --html saved.html
+#  - 현재 검색 결과 HTML 저장:        python naver_fetchers.py 채비 --save saved.html
+#  - 저장된 fixture로 파서·페이지 넘김 확인: python naver_fetchers.py --fixtures
+import os
+from html.parser import HTMLParser
+from urllib.parse import parse_qs, urljoin, urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from voc_metrics import RunMetrics
+
+SEARCH_URL = "https://search.naver.com/search.naver?ssc=tab.cafe.all&st=date&nso=so%3Add%2Cp%3Aall&query="
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+HTTP_TIMEOUT = 10
+# 한 페이지 결과 수 (start 파라미터 증가 폭)
+PAGE_SIZE = 10
+# innerText처럼 앞뒤로 줄이 바뀌는 태그 (그 외 <mark> 등 인라인 태그는 글자를 붙여 씀)
+BLOCK_TAGS = {"br", "div", "p", "li", "ul", "ol", "dl", "dt", "dd", "section", "article", "header", "footer",
+              "h1", "h2", "h3", "h4", "h5", "h6", "table", "tr", "td", "th"}
+# Selenium 추출(crawler._EXTRACT_ITEMS_JS)이 돌려주는 항목 필드
+ITEM_FIELDS = ["cafe_name", "title", "href", "text"]
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+class _SearchResultParser(HTMLParser):
+    """li.bx 항목마다 cafe_name(a.txt_name → a.name), title·href(a.title_link), text(항목 전체 텍스트) 수집.
+
+    text는 innerText처럼 블록 태그 경계에서만 띄우고 공백을 하나로 줄임 (Selenium 추출과 공백만 다름).
+    """
+
+    def __init__(self, base_url):
+        super().__init__(convert_charrefs=True)
+        self.base_url = base_url
+        self.items = []
+        self._item = None
+        self._li_depth = 0
+        self._capture = []  # 현재 열려 있는 a 태그별 기록 대상 필드 (없으면 None)
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        classes = (attrs.get("class") or "").split()
+        if tag == "li":
+            if self._item is None and "bx" in classes:
+                self._item = {"txt_name": None, "name": None, "title": None, "href": None, "text": []}
+                self._li_depth = 1
+                return
+            elif self._item is not None:
+                self._li_depth += 1
+        if self._item is not None and tag in BLOCK_TAGS:
+            self._item["text"].append(" ")
+        if self._item is None or tag != "a":
+            return
+        field = None
+        if "title_link" in classes and self._item["title"] is None:
+            field = "title"
+            self._item["href"] = urljoin(self.base_url, attrs.get("href") or "")
+        elif "txt_name" in classes and self._item["txt_name"] is None:
+            field = "txt_name"
+        elif "name" in classes and self._item["name"] is None:
+            field = "name"
+        if field:
+            self._item[field] = []
+        self._capture.append(field)
+
+    def handle_endtag(self, tag):
+        if self._item is None:
+            return
+        if tag == "a" and self._capture:
+            self._capture.pop()
+        elif tag == "li":
+            self._li_depth -= 1
+            if self._li_depth == 0:
+                self._finish_item()
+                return
+        if tag in BLOCK_TAGS:
+            self._item["text"].append(" ")
+
+    def handle_data(self, data):
+        if self._item is None:
+            return
+        self._item["text"].append(data)
+        for field in self._capture:
+            if field:
+                self._item[field].append(data)
+
+    def _finish_item(self):
+        item = self._item
+        self._item, self._capture = None, []
+
+        def joined(parts):
+            # 제목 안의 <mark> 강조 등 인라인 조각은 붙여서, 앞뒤 공백만 정리 (WebElement.text와 같은 모양)
+            return " ".join("".join(parts).split()) if parts is not None else None
+
+        cafe_name = joined(item["txt_name"]) if item["txt_name"] is not None else joined(item["name"])
+        self.items.append({
+            "cafe_name": cafe_name or "",
+            "title": joined(item["title"]),
+            "href": item["href"],
+            "text": joined(item["text"]),
+        })
+
+
+def parse_search_results(html, base_url="https://search.naver.com/"):
+    """검색 결과 HTML → 항목 dict 목록 (cafe_name, title, href, text)."""
+    parser = _SearchResultParser(base_url)
+    parser.feed(html)
+    parser.close()
+    return parser.items
+
+
+def new_session(pool_size=4):
+    """커넥션을 재사용하는 세션 (일시적 5xx/429는 urllib3 Retry로 재시도)."""
+    session = requests.Session()
+    session.headers.update({"User-Agent": USER_AGENT, "Accept-Language": "ko-KR,ko;q=0.9"})
+    retry = Retry(total=3, backoff_factor=1.0, status_forcelist=[429, 500, 502, 503, 504], allowed_methods=["GET"])
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+class HttpFetcher:
+    """네이버 카페 검색 결과 페이지를 HTTP로 받아 파싱. 세션은 워커끼리 공유해도 됨."""
+
+    def __init__(self, search_url=SEARCH_URL, session=None, limiter=None, is_fresh=None, metrics=None):
+        self.search_url = search_url
+        self.session = session or new_session()
+        self.limiter = limiter
+        self.is_fresh = is_fresh
+        # 페이지 요청 시간(page_load)·파싱 시간(extract)·요청 수 기록 (없으면 버려지는 기록)
+        self.metrics = metrics or RunMetrics()
+
+    def fetch_html(self, keyword, page=0):
+        url = self.search_url + requests.utils.quote(keyword)
+        if page:
+            url += f"&start={page * PAGE_SIZE + 1}"
+        if self.limiter:
+            self.limiter.wait(url)
+        with self.metrics.stage("page_load"):
+            response = self.session.get(url, timeout=HTTP_TIMEOUT)
+        self.metrics.api("naver.http_page")
+        response.raise_for_status()
+        return response.text
+
+    def fetch_items(self, keyword, max_pages=1):
+        """최대 max_pages 페이지까지 수집. 새 항목이 없거나 마지막 항목이 최근 글이 아니면 중단."""
+        items = []
+        seen = set()
+        for page in range(max_pages):
+            html = self.fetch_html(keyword, page)
+            with self.metrics.stage("extract"):
+                page_items = [it for it in parse_search_results(html) if it["href"] not in seen]
+            if not page_items:
+                break
+            items.extend(page_items)
+            seen.update(it["href"] for it in page_items)
+            if self.is_fresh and not self.is_fresh(page_items[-1]["text"]):
+                break
+        return items
+
+
+# ======================================================
+# 저장된 fixture로 확인 (네트워크·브라우저 없이 파서 출력·start= 페이지 넘김 확인)
+# ======================================================
+# fixtures/naver_cafe_search_p1.expected.json : p1을 Selenium 추출(_EXTRACT_ITEMS_JS)로 읽었을 때의 값
+FIXTURE_PAGES = {1: "naver_cafe_search_p1.html", 11: "naver_cafe_search_p2.html"}  # start= 값 → 파일
+FIXTURE_EXPECTED = "naver_cafe_search_p1.expected.json"
+# crawler.FRESH_MARKERS와 같은 표기 (crawler는 selenium을 불러오므로 여기서 import하지 않음)
+FIXTURE_FRESH_MARKERS = ("분 전", "시간 전", "방금 전")
+EMPTY_RESULTS_HTML = '<html><body><ul class="lst_view"></ul></body></html>'
+
+
+class _FixtureResponse:
+    def __init__(self, text):
+        self.text = text
+
+    def raise_for_status(self):
+        pass
+
+
+class FixtureSession:
+    """start 값별로 저장된 HTML을 돌려주는 가짜 세션 (없는 페이지는 빈 결과). 요청한 start 값을 기록."""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.starts = []
+
+    def get(self, url, timeout=None):
+        start = int(parse_qs(urlparse(url).query).get("start", ["1"])[0])
+        self.starts.append(start)
+        return _FixtureResponse(self.pages.get(start, EMPTY_RESULTS_HTML))
+
+
+def check_fixtures(fixture_dir=FIXTURE_DIR):
+    """fixture로 파서·페이지 넘김 확인. 실패 설명 목록 (비었으면 통과).
+
+    - p1 파싱 결과가 Selenium 추출과 같은 필드·값인지 (text는 공백 차이만 허용)
+    - fetch_items: 2페이지(start=11)의 겹친 항목은 빼고, 마지막 항목이 최근 글이 아니면 멈춤
+    - 최근 글이 계속 나오면 빈 페이지(start=21)에서 멈춤
+    """
+    import json
+
+    pages = {}
+    for start, name in FIXTURE_PAGES.items():
+        with open(os.path.join(fixture_dir, name), encoding="utf-8") as f:
+            pages[start] = f.read()
+    with open(os.path.join(fixture_dir, FIXTURE_EXPECTED), encoding="utf-8") as f:
+        expected = json.load(f)
+
+    def normalized(item):
+        return dict(item, text=" ".join(item["text"].split()))
+
+    failures = []
+    parsed = parse_search_results(pages[1])
+    if len(parsed) != len(expected):
+        failures.append(f"p1 항목 수 {len(parsed)} (기대값 {len(expected)})")
+    for i, (got, want) in enumerate(zip(parsed, expected)):
+        if list(got) != ITEM_FIELDS:
+            failures.append(f"p1 #{i} 필드 {list(got)} (기대값 {ITEM_FIELDS})")
+        for field in ITEM_FIELDS:
+            if normalized(got).get(field) != normalized(want)[field]:
+                failures.append(f"p1 #{i} {field}: {got.get(field)!r} (기대값 {want[field]!r})")
+
+    def is_fresh(text):
+        return any(marker in text for marker in FIXTURE_FRESH_MARKERS)
+
+    p2_new = [it for it in parse_search_results(pages[11]) if it["href"] not in {p["href"] for p in parsed}]
+    for label, fresh, want_starts in (("최근 글 아님에서 멈춤", is_fresh, [1, 11]),
+                                      ("빈 페이지에서 멈춤", lambda text: True, [1, 11, 21])):
+        session = FixtureSession(pages)
+        items = HttpFetcher(session=session, is_fresh=fresh).fetch_items("채비", max_pages=5)
+        if session.starts != want_starts:
+            failures.append(f"{label}: 요청한 start {session.starts} (기대값 {want_starts})")
+        if [it["href"] for it in items] != [it["href"] for it in parsed + p2_new]:
+            failures.append(f"{label}: 항목 {len(items)}건 (기대값 {len(parsed + p2_new)}건, 겹친 항목 제외)")
+    return failures
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+    import sys
+
+    parser = argparse.ArgumentParser(description="네이버 카페 검색 HTTP 백엔드 확인")
+    parser.add_argument("keyword", nargs="?", default="채비")
+    parser.add_argument("--html", help="저장된 검색 결과 HTML 파일을 파싱 (네트워크 사용 안 함)")
+    parser.add_argument("--save", help="받아온 검색 결과 HTML을 이 경로에 저장")
+    parser.add_argument("--fixtures", action="store_true", help="fixtures/의 저장된 HTML로 파서·페이지 넘김 확인")
+    args = parser.parse_args()
+
+    if args.fixtures:
+        failures = check_fixtures()
+        for failure in failures:
+            print(f"❌ {failure}")
+        print("✅ fixture 확인 통과" if not failures else f"fixture 확인 실패 {len(failures)}건")
+        sys.exit(1 if failures else 0)
+    if args.html:
+        with open(args.html, encoding="utf-8") as f:
+            html = f.read()
+    else:
+        html = HttpFetcher().fetch_html(args.keyword)
+        if args.save:
+            with open(args.save, "w", encoding="utf-8") as f:
+                f.write(html)
+    print(json.dumps(parse_search_results(html), ensure_ascii=False, indent=1))
@@ -0,0 +1,206 @@
+# 슬랙 웹훅 전송 계층: 세션 재사용, 웹훅 동시 전송, 429(Retry-After)·5xx 재시도, 긴 리포트 분할 (slack_sender.py에서 사용)
+#  - build_payloads(text) : mrkdwn 리포트를 Block Kit section(≤3000자)·메시지(≤50블록) 한도 안으로 나눔
+#  - payloads_from_blocks(blocks, text) : 이미 만든 Block Kit 블록 목록을 메시지당 50블록씩 나눔
+#  - SlackDelivery.send(urls, payloads) : 웹훅별 결과(성공 여부, 상태 코드, 시도 수, 소요 시간) 반환
+#  - 로컬 스텁 서버로 확인:  python slack_delivery.py --stub --rows 400
+import random
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+HTTP_TIMEOUT = 10
+MAX_RETRIES = 3
+MAX_WORKERS = 4
+MAX_RETRY_AFTER = 60      # Retry-After가 이보다 길면 이 시간만 기다림 (초)
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Slack 한도: section 텍스트 3000자, 메시지당 블록 50개. 여유를 두고 자름
+SECTION_CHARS = 2900
+MESSAGE_CHARS = 12000
+MAX_BLOCKS = 50
+
+DeliveryResult = namedtuple("DeliveryResult", ["url", "ok", "status", "attempts", "latency", "error"])
+
+
+def mask_url(url):
+    """로그용 웹훅 주소 (비밀 토큰 부분은 끝 4자만)."""
+    head, _, token = url.rpartition("/")
+    return f"{head.split('//')[-1].split('/')[0]}/…{token[-4:]}" if token else url
+
+
+def split_lines(text, limit):
+    """줄 경계 기준으로 limit자 이하 덩어리로 나눔 (한 줄이 limit보다 길면 그 줄만 잘라냄)."""
+    chunks, current, size = [], [], 0
+    for line in text.split("\n"):
+        if len(line) > limit:
+            line = line[:limit - 1] + "…"
+        if current and size + len(line) + 1 > limit:
+            chunks.append("\n".join(current))
+            current, size = [], 0
+        current.append(line)
+        size += len(line) + 1
+    if current:
+        chunks.append("\n".join(current))
+    return [chunk for chunk in chunks if chunk.strip()]
+
+
+def build_payloads(text, message_chars=MESSAGE_CHARS, section_chars=SECTION_CHARS, **options):
+    """mrkdwn 리포트 1개 → 웹훅 payload 목록 (순서대로 보내야 원문 순서 유지).
+
+    메시지마다 section 블록으로 나누고, text(알림·미리보기용)에는 그 메시지의 첫 줄을 넣는다.
+    options는 payload에 그대로 추가 (unfurl_links 등).
+    """
+    payloads = []
+    for message in split_lines(text, message_chars):
+        sections = split_lines(message, section_chars)
+        for i in range(0, len(sections), MAX_BLOCKS):
+            blocks = [{"type": "section", "text": {"type": "mrkdwn", "text": s}} for s in sections[i:i + MAX_BLOCKS]]
+            payloads.append(dict(options, text=message.split("\n", 1)[0], blocks=blocks))
+    return payloads
+
+
+def payloads_from_blocks(blocks, text, **options):
+    """Block Kit 블록 목록 → 웹훅 payload 목록 (메시지당 최대 MAX_BLOCKS개). text는 알림·미리보기용."""
+    return [dict(options, text=text, blocks=blocks[i:i + MAX_BLOCKS]) for i in range(0, len(blocks), MAX_BLOCKS)]
+
+
+def new_session(pool_size=MAX_WORKERS):
+    """웹훅 호스트 커넥션을 재사용하는 세션 (재시도는 SlackDelivery가 직접 처리)."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+class SlackDelivery:
+    """웹훅 목록에 payload 목록을 동시에 전송 (웹훅 안에서는 payload 순서대로)."""
+
+    def __init__(self, session=None, workers=MAX_WORKERS, max_retries=MAX_RETRIES, timeout=HTTP_TIMEOUT):
+        self.session = session or new_session(workers)
+        self.workers = workers
+        self.max_retries = max_retries
+        self.timeout = timeout
+
+    def _retry_delay(self, response, attempt):
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after:
+            try:
+                return min(float(retry_after), MAX_RETRY_AFTER)
+            except ValueError:
+                pass
+        return 2 ** attempt + random.random()
+
+    def _post(self, url, payload):
+        """payload 1개 전송. (상태 코드, 시도 수, 오류 메시지)."""
+        status, error = None, ""
+        for attempt in range(self.max_retries + 1):
+            response = None
+            try:
+                response = self.session.post(url, json=payload, timeout=self.timeout)
+                status = response.status_code
+                if status == 200:
+                    return status, attempt + 1, ""
+                error = response.text[:200]
+                if status not in RETRY_STATUSES:
+                    break
+            except requests.RequestException as e:
+                status, error = None, str(e)
+            if attempt < self.max_retries:
+                time.sleep(self._retry_delay(response, attempt))
+        return status, attempt + 1, error
+
+    def deliver(self, url, payloads):
+        """웹훅 1곳에 payload들을 순서대로 전송. 하나라도 실패하면 그 뒤는 보내지 않음."""
+        started = time.perf_counter()
+        attempts, status, error = 0, None, ""
+        for payload in payloads:
+            status, tries, error = self._post(url, payload)
+            attempts += tries
+            if status != 200:
+                break
+        return DeliveryResult(url, status == 200, status, attempts, time.perf_counter() - started, error)
+
+    def send(self, urls, payloads):
+        """모든 웹훅에 동시 전송 (최대 workers개). 결과는 urls 순서."""
+        urls = [url for url in urls if url.startswith("http")]
+        if not urls:
+            return []
+        with ThreadPoolExecutor(max_workers=max(1, min(self.workers, len(urls)))) as executor:
+            return list(executor.map(lambda url: self.deliver(url, payloads), urls))
+
+
+def print_results(results):
+    for i, r in enumerate(results, 1):
+        if r.ok:
+            print(f"   ✅ [{i}] 전송 성공 ({mask_url(r.url)}, {r.latency:.2f}초, 시도 {r.attempts}회)")
+        else:
+            print(f"   ❌ [{i}] 전송 실패 ({mask_url(r.url)}, 상태 {r.status}, {r.latency:.2f}초, 시도 {r.attempts}회) {r.error}")
+
+
+# ======================================================
+# 로컬 스텁 서버 (실제 슬랙 없이 분할·재시도·동시 전송 확인)
+# ======================================================
+def start_stub_server(fail_first=1, retry_after=1, delay=0.2):
+    """경로별로 처음 fail_first번은 429(Retry-After)를 돌려주는 웹훅 스텁. (server, 받은 payload 목록)."""
+    import json
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    received = []
+    failures = {}
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            time.sleep(delay)
+            with lock:
+                failures[self.path] = failures.get(self.path, 0) + 1
+                limited = failures[self.path] <= fail_first
+                if not limited:
+                    received.append((self.path, json.loads(body)))
+            if limited:
+                self.send_response(429)
+                self.send_header("Retry-After", str(retry_after))
+                self.end_headers()
+                self.wfile.write(b"rate_limited")
+                return
+            self.send_response(200)
+            self.end_headers()
+            self.wfile.write(b"ok")
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, received
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="슬랙 웹훅 전송 확인")
+    parser.add_argument("--stub", action="store_true", help="로컬 스텁 서버로 전송 (필수 — 실제 웹훅으로는 보내지 않음)")
+    parser.add_argument("--hooks", type=int, default=3, help="스텁 웹훅 개수")
+    parser.add_argument("--rows", type=int, default=400, help="샘플 리포트 항목 수")
+    args = parser.parse_args()
+    if not args.stub:
+        parser.error("--stub 옵션으로만 실행할 수 있습니다")
+
+    server, received = start_stub_server()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    report = "📢 *샘플 리포트*\n" + "\n".join(
+        f"• <https://cafe.naver.com/sample/{i}|샘플 제목 {i} " + "가" * 40 + ">" for i in range(args.rows)
+    )
+    payloads = build_payloads(report, unfurl_links=False, unfurl_media=False)
+    print(f"리포트 {len(report)}자 → 메시지 {len(payloads)}개")
+
+    results = SlackDelivery().send([f"{base}/hook{i}/TOKEN{i:04d}" for i in range(args.hooks)], payloads)
+    print_results(results)
+    server.shutdown()
+    print(f"스텁이 받은 메시지: {len(received)}개 (기대값 {len(payloads) * args.hooks})")
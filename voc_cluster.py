@@ -0,0 +1,182 @@
+# 유사 글 묶기: 제목의 글자 3-gram MinHash + LSH 버킷으로 여러 카페에 올라온 같은 글·영상/댓글 중복을 한 묶음(클러스터)으로
+#  - voc_store/clusters.sqlite3 (커밋하지 않음 — 없으면 sync가 수집순번 순으로 다시 배정해 같은 클러스터 ID가 나옴)
+#      items   : 수집순번 → 클러스터 ID(묶음의 첫 글 수집순번)·정규화 제목
+#      buckets : LSH 버킷 → 수집순번 (밴드마다 1개)
+#  - 새 행 1개 처리 = 밴드 수만큼 버킷 조회 + 후보 몇 개와 실제 Jaccard 비교 (전체 행 수와 무관)
+#  - 한 번 정한 클러스터 ID는 바뀌지 않음 (나중 글이 가장 비슷한 기존 글의 클러스터에 합류)
+#    python voc_cluster.py sync          # 저장소의 새 행을 묶음에 배정
+#    python voc_cluster.py show --top 10 # 큰 묶음 확인
+import hashlib
+import os
+import re
+import sqlite3
+import zlib
+
+import numpy as np
+import pandas as pd
+
+from voc_schema import SEQ_COLUMN
+from voc_store import STORE_DIR, VocStore
+
+CLUSTER_FILE = "clusters.sqlite3"
+CLUSTER_COLUMN = "클러스터"  # 메모리에서만 붙이는 컬럼 (저장 CSV에는 없음)
+
+SHINGLE = 3
+NUM_PERM = 48
+BANDS, ROWS = 12, 4          # 48 = 12 × 4 → 후보가 될 확률이 Jaccard 0.54 부근에서 급격히 오름
+THRESHOLD = 0.6              # 후보 중 실제 Jaccard가 이 이상이면 같은 묶음
+MIN_SHINGLES = 5             # 이보다 짧은 제목('충전 질문' 등)은 묶지 않음 (다른 글도 같은 제목이 흔함)
+MAX_CANDIDATES = 50          # 버킷 1회 조회에서 비교할 최근 후보 수 (인기 버킷이 커져도 비용 일정)
+
+# 실행마다 같은 서명이 나오도록 고정 시드 (바꾸면 색인을 다시 만들어야 함)
+_rng = np.random.RandomState(20240601)
+_A = _rng.randint(1, 2 ** 63, size=NUM_PERM, dtype=np.uint64) | np.uint64(1)
+_B = _rng.randint(0, 2 ** 63, size=NUM_PERM, dtype=np.uint64)
+
+# 유튜브 레코드 장식: '[영상] ' 머리말·'(조회수 N회)' 꼬리말·'💬 ' 머리말·브랜드 강조 '*'·80자 자르기 '...'
+_DECORATION = re.compile(r"^\[영상\]\s*|\s*\(조회수 \d+회\)$|^💬\s*|\*|\.\.\.$")
+_NON_WORD = re.compile(r"[\W_]+")
+
+
+def normalize_title(title) -> str:
+    text = _DECORATION.sub("", str(title))
+    return " ".join(_NON_WORD.sub(" ", text.lower()).split())
+
+
+def shingles(text) -> set:
+    return {text[i:i + SHINGLE] for i in range(len(text) - SHINGLE + 1)}
+
+
+def jaccard(a, b) -> float:
+    return len(a & b) / len(a | b) if a or b else 0.0
+
+
+def signature(shingle_set) -> np.ndarray:
+    """MinHash 서명 (multiply-shift 해시 NUM_PERM개의 최솟값)."""
+    x = np.fromiter((zlib.crc32(s.encode("utf-8")) for s in shingle_set), dtype=np.uint64, count=len(shingle_set))
+    with np.errstate(over="ignore"):
+        hashed = (x[:, None] * _A + _B) >> np.uint64(32)
+    return hashed.min(axis=0)
+
+
+def band_keys(sig) -> list:
+    """밴드별 버킷 키 (밴드 번호 포함, 64비트 정수)."""
+    keys = []
+    for band in range(BANDS):
+        digest = hashlib.blake2b(bytes([band]) + sig[band * ROWS:(band + 1) * ROWS].tobytes(), digest_size=8).digest()
+        keys.append(int.from_bytes(digest, "little", signed=True))
+    return keys
+
+
+class ClusterIndex:
+    def __init__(self, path):
+        self.path = path
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.executescript(
+            "CREATE TABLE IF NOT EXISTS items (seq INTEGER PRIMARY KEY, cluster INTEGER, title TEXT);"
+            "CREATE TABLE IF NOT EXISTS buckets (bucket INTEGER, seq INTEGER, PRIMARY KEY (bucket, seq)) WITHOUT ROWID;"
+        )
+        self.conn.commit()
+
+    @classmethod
+    def of_store(cls, store):
+        os.makedirs(store.root, exist_ok=True)
+        return cls(os.path.join(store.root, CLUSTER_FILE))
+
+    def close(self):
+        self.conn.close()
+
+    def last_seq(self) -> int:
+        return self.conn.execute("SELECT COALESCE(MAX(seq), 0) FROM items").fetchone()[0]
+
+    def _assign(self, seq, title):
+        """행 1개의 클러스터를 정해 색인에 추가. 클러스터 ID 반환."""
+        text = normalize_title(title)
+        own = shingles(text)
+        if len(own) < MIN_SHINGLES:
+            self.conn.execute("INSERT OR REPLACE INTO items VALUES (?, ?, ?)", (seq, seq, text))
+            return seq
+        keys = band_keys(signature(own))
+        candidates = self.conn.execute(
+            f"SELECT DISTINCT i.seq, i.cluster, i.title FROM buckets b JOIN items i ON i.seq = b.seq "
+            f"WHERE b.bucket IN ({','.join('?' * len(keys))}) ORDER BY i.seq DESC LIMIT ?",
+            (*keys, MAX_CANDIDATES),
+        ).fetchall()
+        cluster, best = seq, THRESHOLD
+        for _, candidate_cluster, candidate_title in candidates:
+            score = jaccard(own, shingles(candidate_title))
+            if score >= best:
+                cluster, best = candidate_cluster, score
+        self.conn.execute("INSERT OR REPLACE INTO items VALUES (?, ?, ?)", (seq, cluster, text))
+        self.conn.executemany("INSERT OR IGNORE INTO buckets VALUES (?, ?)", ((key, seq) for key in keys))
+        return cluster
+
+    def sync(self, store: VocStore) -> int:
+        """저장소에서 아직 배정하지 않은 행(수집순번 순)을 묶음에 배정. 처리한 행 수."""
+        if store.last_seq() <= self.last_seq():
+            return 0
+        rows = store.rows_after(self.last_seq())
+        with self.conn:
+            for seq, title in zip(rows[SEQ_COLUMN].astype(int).tolist(), rows["제목"].astype(str).tolist()):
+                self._assign(seq, title)
+        return len(rows)
+
+    def clusters(self) -> pd.Series:
+        """수집순번 → 클러스터 ID."""
+        frame = pd.read_sql_query("SELECT seq, cluster FROM items", self.conn)
+        return pd.Series(frame["cluster"].to_numpy(), index=frame["seq"].to_numpy(), name=CLUSTER_COLUMN)
+
+
+def with_clusters(df, clusters) -> pd.DataFrame:
+    """df에 클러스터 컬럼을 붙임 (색인에 없는 행은 자기 수집순번 = 혼자인 묶음)."""
+    seqs = pd.to_numeric(df[SEQ_COLUMN], errors="coerce").astype("Int64")
+    mapped = seqs.map(clusters) if clusters is not None else seqs
+    return df.assign(**{CLUSTER_COLUMN: mapped.fillna(seqs).astype("Int64")})
+
+
+def collapse(df) -> pd.DataFrame:
+    """묶음마다 첫 행만 남김 (클러스터 컬럼이 없으면 그대로)."""
+    if CLUSTER_COLUMN not in df.columns:
+        return df
+    return df[~df[CLUSTER_COLUMN].duplicated() | df[CLUSTER_COLUMN].isna()]
+
+
+def load_clusters(store_dir=STORE_DIR):
+    """저장소의 클러스터 색인 → 수집순번 → 클러스터 ID Series (저장소가 없으면 None).
+
+    색인이 없거나 뒤처져 있으면 먼저 sync (처음이면 저장소 전체를 배정).
+    """
+    store = VocStore(store_dir)
+    if not store.exists():
+        return None
+    index = ClusterIndex.of_store(store)
+    try:
+        index.sync(store)
+        return index.clusters()
+    finally:
+        index.close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="유사 글 묶기")
+    parser.add_argument("command", choices=["sync", "show"])
+    parser.add_argument("--top", type=int, default=10, help="show: 표시할 묶음 수")
+    args = parser.parse_args()
+
+    store = VocStore(STORE_DIR)
+    index = ClusterIndex.of_store(store)
+    added = index.sync(store)
+    print(f"🧩 새 행 {added}건 배정")
+    if args.command == "show":
+        clusters = index.clusters()
+        sizes = clusters.value_counts()
+        print(f"   전체 {len(clusters)}행 → 묶음 {len(sizes)}개 (2건 이상 묶음 {int((sizes > 1).sum())}개)")
+        titles = dict(index.conn.execute("SELECT seq, title FROM items"))
+        for cluster, size in sizes[sizes > 1].head(args.top).items():
+            members = clusters.index[clusters == cluster][:3]
+            print(f"\n   [{cluster}] {size}건")
+            for seq in members:
+                print(f"     - {titles[seq]}")
+    index.close()
@@ -0,0 +1,147 @@
+# 수집기(collector) 플러그인 인터페이스와 동시 실행 스케줄러 (crawler.py에서 사용)
+#  - Collector: name, units() → 수집 단위 목록(키워드 등), fetch(unit) → 레코드(voc_schema.new_record) 반복자
+#  - 수집기마다 자체 요청 간격(min_interval → DomainRateLimiter)·단위 동시 처리 수(workers)를 가짐
+#  - run_collectors: 등록된 수집기를 모두 동시에 실행 → 실행 시간 ≈ 가장 오래 걸리는 수집기 1개
+#    단위가 끝날 때마다 voc_filters 판정(voc_filter=True인 수집기) → on_batch(수집 단위, 레코드)로 전달
+#  - 새 출처 추가 = Collector 하위 클래스 1개를 만들어 crawler.py의 collectors()에 등록
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import pandas as pd
+
+from voc_filters import classify_titles
+from voc_metrics import RunMetrics
+
+
+class DomainRateLimiter:
+    """도메인별 최소 요청 간격 보장 (여러 워커가 같은 사이트를 동시에 두드리지 않도록)."""
+
+    def __init__(self, min_interval):
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._next_slot = {}
+
+    def wait(self, url):
+        domain = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(domain, now))
+            self._next_slot[domain] = slot + self.min_interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class Collector:
+    """수집기 기본 클래스. 하위 클래스는 name과 fetch()를 정의하고, 필요하면 units()·open()·close()를 덮어씀."""
+
+    name = ""           # 수집 단위 이름의 앞부분 (보관 단위 = "name:unit")
+    workers = 1         # 이 수집기 안에서 동시에 처리할 단위 수
+    min_interval = 0.0  # 같은 도메인 요청 사이 최소 간격(초)
+    voc_filter = False  # True면 레코드를 voc_filters 판정(판매·거래 / 브랜드 무관 제외)에 통과시킴
+    max_interval = None   # 상주 실행(voc_daemon)에서 단위 수집 간격 상한(초, None이면 DAEMON_MAX_INTERVAL)
+
+    def __init__(self):
+        self.limiter = DomainRateLimiter(self.min_interval)
+
+    def units(self):
+        """수집 단위 목록 (기본: 단위 1개)."""
+        return ["all"]
+
+    def unit_cost(self, unit):
+        """단위 1회 수집 비용 (상주 실행의 예산 배분 기준, 기본 1)."""
+        return 1.0
+
+    def daily_cost(self):
+        """상주 실행의 하루 비용 예산 (기본: 하루 1회 실행과 같은 비용 = 단위마다 1회씩)."""
+        return sum(self.unit_cost(unit) for unit in self.units())
+
+    def open(self):
+        """실행 시작 시 1회 (브라우저·세션 준비 등)."""
+
+    def fetch(self, unit):
+        """단위 1개 수집 → 레코드 반복자. 예외가 나면 그 단위는 실패(보관 안 됨)."""
+        raise NotImplementedError
+
+    def commit(self, unit):
+        """단위 결과가 저장소에 반영된 뒤 호출 (증분 수집 상태를 이때 저장 — 반영 전에 죽으면 다음에 다시 수집)."""
+
+    def close(self):
+        """실행 끝에 1회 (예외가 나도 호출)."""
+
+
+def unit_key(collector, unit):
+    return f"{collector.name}:{unit}"
+
+
+def filter_records(records, metrics=None):
+    """voc_filters 판정 단계: 판매·거래/주식 글, 브랜드 무관 글을 빼고 남은 레코드 (키워드별 제외 수 기록)."""
+    metrics = metrics or RunMetrics()
+    if not records:
+        return []
+    keywords = [record["키워드"] for record in records]
+    with metrics.stage("filter"):
+        verdict = classify_titles(pd.Series(keywords), pd.Series([record["제목"] for record in records]))
+    kept = []
+    for record, keyword, excluded, relevant in zip(records, keywords, verdict["excluded"], verdict["relevant"]):
+        if excluded:
+            metrics.count(keyword, "sale")
+        elif not relevant:
+            metrics.count(keyword, "irrelevant")
+        else:
+            kept.append(record)
+    return kept
+
+
+def collect_unit(collector, unit, metrics=None):
+    """단위 1개 수집 + 필터 단계 → 레코드 목록 (예외는 그대로 올림)."""
+    metrics = metrics or RunMetrics()
+    records = list(collector.fetch(unit))
+    if collector.voc_filter:
+        records = filter_records(records, metrics)
+    for record in records:
+        metrics.count(record["키워드"], "collected")
+    return records
+
+
+def run_collectors(collectors, on_batch=None, skip=(), metrics=None):
+    """수집기들을 동시에 실행. {보관 단위: 레코드 목록} 반환 (실패한 단위는 빠짐).
+
+    skip: 건너뛸 보관 단위 ("name:unit", --resume에서 이미 끝난 단위)
+    on_batch(key, records): 단위 1개가 끝날 때마다 호출 (여러 스레드에서 호출됨)
+    """
+    metrics = metrics or RunMetrics()
+    results = {}
+    lock = threading.Lock()
+
+    def run_unit(collector, unit):
+        key = unit_key(collector, unit)
+        try:
+            records = collect_unit(collector, unit, metrics)
+        except Exception as e:
+            print(f"에러 발생 ('{key}'): {e}")
+            return
+        with lock:
+            results[key] = records
+        if on_batch:
+            on_batch(key, records)
+
+    def run_collector(collector):
+        units = [unit for unit in collector.units() if unit_key(collector, unit) not in skip]
+        if not units:
+            return
+        started = time.perf_counter()
+        try:
+            collector.open()
+            with ThreadPoolExecutor(max_workers=max(1, min(collector.workers, len(units)))) as executor:
+                list(executor.map(lambda unit: run_unit(collector, unit), units))
+        except Exception as e:
+            print(f"에러 발생 ('{collector.name}'): {e}")
+        finally:
+            collector.close()
+            metrics.add_time(f"collector.{collector.name}", time.perf_counter() - started)
+
+    with ThreadPoolExecutor(max_workers=max(1, len(collectors))) as executor:
+        list(executor.map(run_collector, collectors))
+    return results
@@ -0,0 +1,406 @@
+# 상주 실행 (python crawler.py --daemon): 브라우저·HTTP 세션·저장소를 띄워 둔 채 수집 단위(네이버 키워드·유튜브 주제)마다 따로 수집
+#  - 단위별 수집 빈도 = 수집기의 하루 비용 예산(daily_cost, 기본 = 하루 1회 실행과 같은 비용)을
+#    √(새 글 도착률 / 1회 비용)에 비례해 나눈 것 (같은 비용으로 평균 발견 지연이 가장 작아지는 배분)
+#    → 새 글이 잦은 키워드는 자주, 조용한 키워드는 드물게. 전체 수집 비용은 예산으로 고정
+#    간격은 DAEMON_MIN_INTERVAL ~ 수집기별 상한(max_interval, 기본 DAEMON_MAX_INTERVAL) 안에서 정하고,
+#    상한·하한에 걸린 단위의 몫은 나머지 단위에 다시 나눔 (모든 단위가 상한에 걸리면 그만큼은 예산을 넘음)
+#  - 도착률 = 수집 1회에 저장된 새 행 수 / 지난 수집 이후 시간의 이동 평균 → voc_store/daemon_schedule.json (재시작해도 이어서)
+#  - 실패한 단위는 간격보다 짧은 지수 백오프로 재시도, DAEMON_UNHEALTHY_FAILURES번 연속 실패하면 /health가 503
+#  - 같은 저장소를 쓰는 하루 1회 실행(crawler.py)과 동시에 돌리지 않음
+#    curl localhost:8765/health    # 상태 요약
+#    curl localhost:8765/metrics   # 현재 보고 구간의 실행 지표 + 단위별 일정
+#  - 스텁 수집기 2개로 확인 (임시 저장소, 수집기별 스레드에서 저장):  python voc_daemon.py --stub
+import json
+import math
+import os
+import signal
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from zoneinfo import ZoneInfo
+
+from voc_collectors import collect_unit, unit_key
+from voc_metrics import RunMetrics
+from voc_schema import KST
+from voc_store import STORE_DIR, atomic_write_text
+
+SCHEDULE_FILE = "daemon_schedule.json"
+DAEMON_HOST = os.environ.get("DAEMON_HOST", "127.0.0.1")
+DAEMON_PORT = int(os.environ.get("DAEMON_PORT", "8765"))
+# 단위별 수집 간격 범위(초)
+DAEMON_MIN_INTERVAL = float(os.environ.get("DAEMON_MIN_INTERVAL", "600"))
+DAEMON_MAX_INTERVAL = float(os.environ.get("DAEMON_MAX_INTERVAL", str(7 * 86400)))
+# 보고 구간(초): 구간마다 실행 보고서 1줄, 새 행이 있었으면 GitHub 업로드 (DAEMON_GIT_PUSH=0이면 업로드 안 함)
+DAEMON_FLUSH_INTERVAL = float(os.environ.get("DAEMON_FLUSH_INTERVAL", "3600"))
+DAEMON_GIT_PUSH = os.environ.get("DAEMON_GIT_PUSH", "1") == "1"
+DAEMON_UNHEALTHY_FAILURES = 3
+
+RATE_SMOOTHING = 0.3  # 도착률 이동 평균에서 이번 수집 1회의 비중
+PRIOR_RATE = 0.1      # 기록이 없는 단위의 도착률(건/시간) — 처음에는 모든 단위가 같은 몫
+RATE_FLOOR = 0.02     # 조용한 단위도 이만큼의 도착률(건/시간)은 있는 것으로 보고 몫을 줌
+MAX_IDLE_WAIT = 300   # 일정 확인 최대 대기(초)
+
+
+def _iso(timestamp):
+    return datetime.fromtimestamp(timestamp, ZoneInfo(KST)).isoformat(timespec="seconds") if timestamp else None
+
+
+class AdaptiveSchedule:
+    """수집 단위별 도착률·간격·다음 수집 시각 (스레드 안전, 바뀔 때마다 파일에 저장).
+
+    groups: {수집기 이름: {"keys": 단위 키 목록, "budget": () → 하루 비용 예산,
+                            "cost": (단위 키) → 1회 비용, "max_interval": 간격 상한(초)}}
+    """
+
+    def __init__(self, path, groups):
+        self.path = path
+        self.groups = groups
+        self._lock = threading.Lock()
+        saved = {}
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                saved = json.load(f).get("units", {})
+        self.units = {}
+        self._owner = {}
+        for name, group in groups.items():
+            for key in group["keys"]:
+                entry = saved.get(key, {})
+                self.units[key] = {
+                    "rate": entry.get("rate", PRIOR_RATE),
+                    "last_poll": entry.get("last_poll"),
+                    "next_due": entry.get("next_due", 0.0),
+                    "polls": entry.get("polls", 0),
+                    "last_new": entry.get("last_new"),
+                    "interval": group["max_interval"],
+                    "cost": 1.0,
+                    "failures": 0,
+                    "last_error": None,
+                }
+                self._owner[key] = name
+        for name in groups:
+            self._rebalance(name)
+
+    def _rebalance(self, name):
+        """수집기 예산을 단위별 √(도착률/비용)에 비례해 나눠 간격을 다시 정함 (최근 수집 시각 기준으로 다음 시각도 조정).
+
+        하루 수집 횟수 = clamp(scale × √(도착률/비용)), Σ 비용 × 횟수 = 예산이 되는 scale을 이분 탐색으로 찾음.
+        """
+        group = self.groups[name]
+        keys, budget = group["keys"], group["budget"]()
+        low, high = 86400 / group["max_interval"], 86400 / DAEMON_MIN_INTERVAL  # 하루 수집 횟수 범위
+        cost = {key: max(float(group["cost"](key)), 1e-6) for key in keys}
+        shape = {key: math.sqrt((self.units[key]["rate"] + RATE_FLOOR) / cost[key]) for key in keys}
+
+        def polls(scale):
+            return {key: min(high, max(low, scale * shape[key])) for key in keys}
+
+        def spend(scale):
+            return sum(cost[key] * n for key, n in polls(scale).items())
+
+        lo_scale, hi_scale = 0.0, high / min(shape.values())
+        if spend(hi_scale) <= budget:
+            lo_scale = hi_scale
+        else:
+            for _ in range(60):
+                mid = (lo_scale + hi_scale) / 2
+                if spend(mid) <= budget:
+                    lo_scale = mid
+                else:
+                    hi_scale = mid
+        for key, n in polls(lo_scale).items():
+            unit = self.units[key]
+            unit["interval"] = 86400 / n
+            unit["cost"] = cost[key]
+            if unit["last_poll"] and not unit["failures"]:
+                unit["next_due"] = unit["last_poll"] + unit["interval"]
+
+    def due(self, now, busy=()):
+        """지금 수집할 단위 (오래 기다린 것부터, 진행 중인 단위 제외)."""
+        with self._lock:
+            keys = [key for key, unit in self.units.items() if unit["next_due"] <= now and key not in busy]
+            return sorted(keys, key=lambda key: self.units[key]["next_due"])
+
+    def wait(self, now, busy=()):
+        """다음 수집까지 남은 초 (진행 중인 단위 제외, 없으면 inf)."""
+        with self._lock:
+            pending = [unit["next_due"] for key, unit in self.units.items() if key not in busy]
+        return max(0.0, min(pending) - now) if pending else math.inf
+
+    def polled(self, key, started, new):
+        """수집 1회 성공: 새 행 수로 도착률을 갱신하고 수집기 안의 간격을 다시 배분."""
+        with self._lock:
+            unit = self.units[key]
+            # 첫 수집은 지난 하루 1회 실행 이후 쌓인 글로 보고 하루로 나눔
+            hours = (started - unit["last_poll"] if unit["last_poll"] else 86400) / 3600
+            unit["rate"] = (1 - RATE_SMOOTHING) * unit["rate"] + RATE_SMOOTHING * new / max(hours, 1 / 60)
+            unit.update(last_poll=started, last_new=new, polls=unit["polls"] + 1, failures=0, last_error=None)
+            self._rebalance(self._owner[key])
+            self._save()
+            return unit["interval"]
+
+    def failed(self, key, now, error):
+        """수집 실패: 간격을 넘지 않는 지수 백오프 뒤 재시도 (도착률은 그대로)."""
+        with self._lock:
+            unit = self.units[key]
+            unit["failures"] += 1
+            unit["last_error"] = str(error)
+            unit["next_due"] = now + min(unit["interval"], DAEMON_MIN_INTERVAL * 2 ** (unit["failures"] - 1))
+            self._save()
+
+    def snapshot(self, now) -> dict:
+        with self._lock:
+            return {
+                key: {
+                    "interval_minutes": round(unit["interval"] / 60, 1),
+                    "cost_per_poll": round(unit["cost"], 1),
+                    "next_in_seconds": round(max(0.0, unit["next_due"] - now)),
+                    "rate_per_hour": round(unit["rate"], 3),
+                    "last_poll": _iso(unit["last_poll"]),
+                    "last_new": unit["last_new"],
+                    "polls": unit["polls"],
+                    "failures": unit["failures"],
+                    "last_error": unit["last_error"],
+                }
+                for key, unit in self.units.items()
+            }
+
+    def _save(self):
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        units = {
+            key: {field: unit[field] for field in ("rate", "last_poll", "next_due", "polls", "last_new")}
+            for key, unit in self.units.items()
+        }
+        atomic_write_text(self.path, json.dumps({"units": units}, ensure_ascii=False, indent=1, sort_keys=True))
+
+
+class CrawlDaemon:
+    """수집기를 열어 둔 채 단위별 일정에 맞춰 수집하고 save로 저장소에 반영.
+
+    save(key, records) → 새로 저장된 행 수 (한 번에 1단위씩 호출)
+    flush(added): 보고 구간 마감 — 실행 보고서 기록·업로드 (added = 구간 동안 저장된 행 수)
+    """
+
+    def __init__(self, collectors, save, flush=None, metrics=None, schedule_path=None):
+        self.collectors = list(collectors)
+        self.save = save
+        self.flush = flush
+        self.metrics = metrics or RunMetrics()
+        self._units = {unit_key(c, unit): (c, unit) for c in self.collectors for unit in c.units()}
+        self.schedule = AdaptiveSchedule(
+            schedule_path or os.path.join(STORE_DIR, SCHEDULE_FILE),
+            {
+                c.name: {
+                    "keys": [unit_key(c, unit) for unit in c.units()],
+                    "budget": c.daily_cost,
+                    "cost": lambda key: self._units[key][0].unit_cost(self._units[key][1]),
+                    "max_interval": c.max_interval or DAEMON_MAX_INTERVAL,
+                }
+                for c in self.collectors
+            },
+        )
+        self.started_at = time.time()
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._lock = threading.Lock()       # 진행 중 단위·구간 집계
+        self._save_lock = threading.Lock()  # 저장소 반영·보고 구간 마감은 한 번에 하나
+        self._running = set()
+        self._window_added = 0
+        self._last_saved_at = None
+        self._executors = {}
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def run(self, host=DAEMON_HOST, port=DAEMON_PORT):
+        server = ThreadingHTTPServer((host, port), _handler(self))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            signal.signal(signal.SIGTERM, lambda *_: self.stop())
+        except ValueError:
+            pass  # 메인 스레드가 아니면 종료 신호는 호출한 쪽에서 처리
+        print(f"🛰️ 상주 실행 시작: 수집 단위 {len(self._units)}개, 상태 확인 http://{host}:{server.server_address[1]}/health")
+
+        next_flush = time.time() + DAEMON_FLUSH_INTERVAL
+        try:
+            for collector in self.collectors:
+                collector.open()
+                self._executors[collector.name] = ThreadPoolExecutor(max_workers=max(1, collector.workers))
+            while not self._stop.is_set():
+                now = time.time()
+                with self._lock:
+                    busy = set(self._running)
+                for key in self.schedule.due(now, busy):
+                    self._submit(key)
+                    busy.add(key)
+                if now >= next_flush:
+                    self._flush()
+                    next_flush = now + DAEMON_FLUSH_INTERVAL
+                self._wake.wait(min(self.schedule.wait(time.time(), busy), next_flush - time.time(), MAX_IDLE_WAIT))
+                self._wake.clear()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            print("🛑 상주 실행 종료 중 (진행 중인 수집이 끝나길 기다림)...")
+            for executor in self._executors.values():
+                executor.shutdown(wait=True)
+            for collector in self.collectors:
+                try:
+                    collector.close()
+                except Exception as e:
+                    print(f"에러 발생 ('{collector.name}' 종료): {e}")
+            self._flush()
+            server.shutdown()
+            server.server_close()
+
+    def _submit(self, key):
+        collector, unit = self._units[key]
+        with self._lock:
+            self._running.add(key)
+        self._executors[collector.name].submit(self._poll, collector, unit, key)
+
+    def _poll(self, collector, unit, key):
+        started = time.time()
+        try:
+            records = collect_unit(collector, unit, self.metrics)
+            with self._save_lock:
+                added = self.save(key, records)
+            collector.commit(unit)
+        except Exception as e:
+            print(f"에러 발생 ('{key}'): {e}")
+            self.schedule.failed(key, time.time(), e)
+        else:
+            interval = self.schedule.polled(key, started, added)
+            with self._lock:
+                self._window_added += added
+                self._last_saved_at = time.time()
+            print(f"   🕒 '{key}' 새 글 {added}건 → {interval / 60:.0f}분 뒤 다시 수집")
+        finally:
+            with self._lock:
+                self._running.discard(key)
+            self._wake.set()
+
+    def _flush(self):
+        with self._save_lock:
+            with self._lock:
+                added, self._window_added = self._window_added, 0
+            if self.flush:
+                try:
+                    self.flush(added)
+                except Exception as e:
+                    print(f"⚠️ 보고 구간 마감 실패: {e}")
+
+    # --------------------------------------------------
+    # 상태 확인 (HTTP)
+    # --------------------------------------------------
+    def health(self):
+        """(HTTP 상태 코드, 본문). 연속 실패가 많은 단위가 있으면 503."""
+        now = time.time()
+        units = self.schedule.snapshot(now)
+        failing = sorted(key for key, unit in units.items() if unit["failures"] >= DAEMON_UNHEALTHY_FAILURES)
+        with self._lock:
+            running, last_saved_at = sorted(self._running), self._last_saved_at
+        body = {
+            "status": "degraded" if failing else "ok",
+            "started_at": _iso(self.started_at),
+            "uptime_seconds": round(now - self.started_at),
+            "last_saved_at": _iso(last_saved_at),
+            "running": running,
+            "failing": failing,
+            "next_in_seconds": min((unit["next_in_seconds"] for unit in units.values()), default=None),
+        }
+        return (503 if failing else 200), body
+
+    def metrics_report(self) -> dict:
+        return {**self.metrics.report(), "schedule": self.schedule.snapshot(time.time())}
+
+
+def _handler(daemon):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            path = self.path.split("?", 1)[0]
+            if path == "/health":
+                code, body = daemon.health()
+            elif path == "/metrics":
+                code, body = 200, daemon.metrics_report()
+            else:
+                code, body = 404, {"error": "not found", "paths": ["/health", "/metrics"]}
+            data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+            self.send_response(code)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass  # 요청마다 콘솔에 찍지 않음
+
+    return Handler
+
+
+# ======================================================
+# 스텁 수집기로 확인 (브라우저·API 없이 수집기별 스레드에서 같은 저장소에 저장)
+# ======================================================
+def run_stub(seconds=3.0, collectors=2):
+    """스텁 수집기 collectors개를 임시 저장소로 seconds초 돌림. (단위별 일정, 저장한 스레드 수, 저장소 행 수)."""
+    import tempfile
+
+    import pandas as pd
+
+    from voc_collectors import Collector
+    from voc_schema import COLUMNS, DATE_FORMAT, TIMESTAMP_FORMAT
+    from voc_store import VocStore
+
+    class StubCollector(Collector):
+        def __init__(self, name):
+            self.name = name
+            super().__init__()
+
+        def units(self):
+            return ["a", "b"]
+
+        def fetch(self, unit):
+            now = datetime.now(ZoneInfo(KST))
+            return [{
+                "작성일": now.strftime(DATE_FORMAT), "키워드": f"{self.name}-{unit}", "카페명": "stub",
+                "제목": f"{self.name} {unit} 샘플 글", "링크": f"https://example.com/{self.name}/{unit}/{time.time_ns()}",
+                "수집시점": now.strftime(TIMESTAMP_FORMAT),
+            }]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = VocStore(os.path.join(tmp_dir, "store"))
+        threads = set()
+
+        def save(key, records):
+            threads.add(threading.get_ident())
+            return len(store.append_unique(pd.DataFrame(records, columns=COLUMNS), "stub"))
+
+        daemon = CrawlDaemon([StubCollector(f"stub{i}") for i in range(collectors)], save,
+                             schedule_path=os.path.join(tmp_dir, SCHEDULE_FILE))
+        threading.Timer(seconds, daemon.stop).start()
+        daemon.run(port=0)
+        rows = store.total_rows()
+        return daemon.schedule.snapshot(time.time()), len(threads), rows
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description="상주 실행 확인")
+    parser.add_argument("--stub", action="store_true", help="스텁 수집기로 확인 (필수 — 실제 수집은 crawler.py --daemon)")
+    parser.add_argument("--seconds", type=float, default=3.0, help="실행 시간(초)")
+    args = parser.parse_args()
+    if not args.stub:
+        parser.error("--stub 옵션으로만 실행할 수 있습니다 (실제 수집은 python crawler.py --daemon)")
+
+    units, threads, rows = run_stub(args.seconds)
+    failed = {key: unit["last_error"] for key, unit in units.items() if unit["failures"] or not unit["polls"]}
+    for key, error in failed.items():
+        print(f"❌ '{key}': {error or '수집 안 됨'}")
+    print(f"저장한 스레드 {threads}개, 저장소 {rows}행 (기대값 {len(units)}행)")
+    sys.exit(1 if failed or rows != len(units) else 0)
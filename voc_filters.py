@@ -1,5 +1,43 @@
 # VoC 수집 필터: 판매글 배제, 브랜드별 관련성 판정, 네이버 링크 정규화 공용 모듈 (crawler.py / clean_history.py에서 사용)
 import re
+from collections import namedtuple
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+# ======================================================
+# [0] 규칙 컴파일 — 단어 목록별 정규식 1개로 제목을 한 번만 훑음
+# ======================================================
+# 규칙표(EXCLUDE_WORDS, KEYWORD_RULES 등)의 현재 내용을 튜플로 만든 값이 캐시 키라서,
+# 목록을 수정·재할당하면 다음 호출에서 자동으로 다시 컴파일된다.
+_NEVER_RE = re.compile(r"(?!)")
+
+# 판정 사유 (classify_title / 배치 판정의 reason 값)
+REASON_KEPT = "kept"
+REASON_PRICE_ARROW = "price_arrow"  # 가격 화살표 (포인트 거래글)
+REASON_SALE = "sale"                # EXCLUDE_WORDS
+REASON_FINANCE = "finance"          # FINANCE_WORDS
+REASON_NO_BRAND = "no_brand"        # 노이즈 제거 후 제목에 브랜드명 없음
+REASON_NO_CONTEXT = "no_context"    # 충전 문맥 단어 없음
+
+Verdict = namedtuple("Verdict", ["excluded", "relevant", "reason", "matched"])
+_KeywordMatcher = namedtuple("_KeywordMatcher", ["name_re", "noise_re", "noise", "in_title", "context"])
+_DEFAULT_RULE = {}
+
+
+@lru_cache(maxsize=256)
+def _compile_words(words: tuple):
+    """단어 목록 중 하나라도 포함되면 매칭되는 정규식 (빈 목록은 절대 매칭 안 됨)."""
+    if not words:
+        return _NEVER_RE
+    return re.compile("|".join(re.escape(w) for w in words))
+
+
+@lru_cache(maxsize=8)
+def _compile_context(kr_words: tuple, en_words: tuple):
+    return _compile_words(kr_words), _compile_words(en_words)
+
 
 # ======================================================
 # [1] VoC가 아닌 글 배제 (판매/거래/주식)
@@ -22,10 +60,23 @@ FINANCE_WORDS = ["공모주", "공모가", "코스닥", "상장", "주가 종합
 
 def is_excluded_post(title: str) -> bool:
     """포인트/카드 판매·거래 글, 주식/상장 글 등 VoC가 아닌 글이면 True."""
-    title = str(title)
+    return _exclusion_reason(str(title)) is not None
+
+
+def _exclusion_reason(title: str):
+    """배제 규칙에 걸리면 (사유, 매칭 단어), 아니면 None."""
     if PRICE_ARROW_RE.search(title):
-        return True
-    return any(word in title for word in EXCLUDE_WORDS + FINANCE_WORDS)
+        return REASON_PRICE_ARROW, ""
+    match = _compile_exclusion(tuple(EXCLUDE_WORDS), tuple(FINANCE_WORDS)).search(title)
+    if match is None:
+        return None
+    word = match.group(0)
+    return (REASON_SALE if word in EXCLUDE_WORDS else REASON_FINANCE), word
+
+
+@lru_cache(maxsize=8)
+def _compile_exclusion(exclude_words: tuple, finance_words: tuple):
+    return _compile_words(exclude_words + finance_words)
 
 
 # ======================================================
@@ -80,51 +131,157 @@ KEYWORD_RULES = {
 def has_charging_context(title: str) -> bool:
     """제목에 충전 관련 문맥 단어가 있으면 True."""
     title = str(title)
-    lower = title.lower()
-    return any(w in title for w in CHARGING_CONTEXT_KR) or any(w in lower for w in CHARGING_CONTEXT_EN)
+    kr_re, en_re = _compile_context(tuple(CHARGING_CONTEXT_KR), tuple(CHARGING_CONTEXT_EN))
+    return kr_re.search(title) is not None or en_re.search(title.lower()) is not None
 
 
-def _strip_noise(text: str, noise_words) -> str:
+def _strip_noise(text: str, noise_re, noise_words: tuple) -> str:
+    # 노이즈 단어가 하나도 없으면(대부분의 제목) 그대로 반환, 있을 때만 기존 순차 치환
+    # (순차 치환은 제거 후 새로 붙는 표기까지 기존과 똑같이 재현하기 위함)
+    if noise_re.search(text) is None:
+        return text
     for word in noise_words:
         text = text.replace(word, "")
     return text
 
 
-def _contains_name(text: str, names) -> bool:
+@lru_cache(maxsize=64)
+def _compile_names(names: tuple):
+    return _compile_words(tuple(name.lower() for name in names))
+
+
+@lru_cache(maxsize=64)
+def _compile_keyword(names: tuple, noise: tuple, in_title: bool, context: bool):
+    return _KeywordMatcher(_compile_names(names), _compile_words(noise), noise, in_title, context)
+
+
+def _keyword_matcher(keyword: str):
+    """KEYWORD_RULES 항목의 현재 내용으로 컴파일된 매처 (규칙표가 바뀌면 캐시 키도 바뀜)."""
+    rule = KEYWORD_RULES.get(keyword, _DEFAULT_RULE)
+    return _compile_keyword(
+        tuple(rule.get("names", (keyword,))),
+        tuple(rule.get("noise", ())),
+        bool(rule.get("in_title")),
+        bool(rule.get("context")),
+    )
+
+
+def _brand_in_text(matcher, text: str) -> bool:
     # 대소문자 무시 비교 (한글은 lower()에 영향 없음, "SK일렉"/"sk일렉"/"EVSIS"/"evsis" 모두 인식)
-    lower = text.lower()
-    return any(name.lower() in lower for name in names)
+    stripped = _strip_noise(text, matcher.noise_re, matcher.noise)
+    return matcher.name_re.search(stripped.lower()) is not None
 
 
-def is_relevant(keyword: str, title: str) -> bool:
-    """검색 키워드(브랜드) 기준으로 제목이 VoC 수집 대상이면 True."""
-    title = str(title)
-    rule = KEYWORD_RULES.get(keyword, {})
-    names = rule.get("names", [keyword])
-    stripped = _strip_noise(title, rule.get("noise", []))
-    brand_in_title = _contains_name(stripped, names)
+def _relevance_reason(keyword: str, title: str):
+    """브랜드 관련성 규칙에 걸리면 사유, 수집 대상이면 None."""
+    matcher = _keyword_matcher(keyword)
+    brand_in_title = _brand_in_text(matcher, title)
 
-    if rule.get("in_title"):
+    if matcher.in_title:
         # 일반명사와 겹치는 브랜드: 노이즈 제거 후에도 제목에 브랜드명이 남아야 함
         if not brand_in_title:
-            return False
-        return has_charging_context(title) if rule.get("context") else True
+            return REASON_NO_BRAND
+        if matcher.context and not has_charging_context(title):
+            return REASON_NO_CONTEXT
+        return None
 
     # 고유 브랜드명: 제목에 있으면 수집, 없으면(본문 매칭) 충전 관련 제목일 때만 수집
-    return brand_in_title or has_charging_context(title)
+    if brand_in_title or has_charging_context(title):
+        return None
+    return REASON_NO_CONTEXT
+
+
+def is_relevant(keyword: str, title: str) -> bool:
+    """검색 키워드(브랜드) 기준으로 제목이 VoC 수집 대상이면 True."""
+    return _relevance_reason(keyword, str(title)) is None
 
 
 def contains_brand(text: str, brand: str) -> bool:
     """유튜브 댓글 등 자유 텍스트에 브랜드 언급이 있으면 True (동음이의어 노이즈 제거 후 판정)."""
-    text = str(text)
-    rule = KEYWORD_RULES.get(brand, {})
-    stripped = _strip_noise(text, rule.get("noise", []))
-    return _contains_name(stripped, rule.get("names", [brand]))
+    return _brand_in_text(_keyword_matcher(brand), str(text))
+
+
+def classify_title(keyword: str, title: str) -> Verdict:
+    """제목 1건을 배제 → 관련성 순으로 판정하고, 처음 걸린 규칙을 함께 반환.
+
+    excluded / relevant는 각각 is_excluded_post / is_relevant와 항상 같은 값이다.
+    """
+    title = str(title)
+    excluded = _exclusion_reason(title)
+    not_relevant = _relevance_reason(keyword, title)
+    if excluded is not None:
+        reason, matched = excluded
+    elif not_relevant is not None:
+        reason, matched = not_relevant, ""
+    else:
+        reason, matched = REASON_KEPT, ""
+    return Verdict(excluded is not None, not_relevant is None, reason, matched)
+
+
+def classify_titles(keywords: pd.Series, titles: pd.Series) -> pd.DataFrame:
+    """classify_title의 배치판 — 키워드별로 묶어 정규식 str.contains로 한 번에 판정.
+
+    titles와 같은 인덱스의 DataFrame(excluded, relevant, reason, matched)을 반환하며,
+    각 행은 classify_title(keyword, title)과 항상 같다.
+    """
+    index = titles.index
+    # 스칼라 함수와 같은 str() 변환 (NaN → "nan")
+    titles = pd.Series(titles.to_numpy(dtype=object), dtype=object).map(str)
+    keywords = pd.Series(keywords.to_numpy(dtype=object), dtype=object).map(str)
+    lower = titles.str.lower()
+
+    # [1] 배제: 가격 화살표 → 판매/주식 단어 (정규식 search와 같은 가장 왼쪽 매칭 단어를 사유로 기록)
+    price = titles.str.contains(PRICE_ARROW_RE, na=False).to_numpy(dtype=bool)
+    exclusion_re = _compile_exclusion(tuple(EXCLUDE_WORDS), tuple(FINANCE_WORDS))
+    matched = titles.str.extract(re.compile(f"({exclusion_re.pattern})"), expand=False)
+    matched = matched.to_numpy(dtype=object)
+    word_hit = pd.notna(matched)
+    excluded = price | word_hit
+
+    # [2] 관련성: 충전 문맥은 공통, 브랜드명·노이즈는 키워드별 매처로 판정
+    kr_re, en_re = _compile_context(tuple(CHARGING_CONTEXT_KR), tuple(CHARGING_CONTEXT_EN))
+    context = (titles.str.contains(kr_re, na=False) | lower.str.contains(en_re, na=False)).to_numpy(dtype=bool)
+    brand = np.zeros(len(titles), dtype=bool)
+    rule_reason = np.empty(len(titles), dtype=object)
+    rule_reason[:] = None
+    for keyword, positions in keywords.groupby(keywords, sort=False).indices.items():
+        matcher = _keyword_matcher(keyword)
+        sub_titles = titles.iloc[positions]
+        sub_brand = np.array(lower.iloc[positions].str.contains(matcher.name_re, na=False), dtype=bool)
+        # 노이즈 단어가 있는 제목만 스칼라 경로로 재판정 (순차 치환 결과를 그대로 재현)
+        noisy = sub_titles.str.contains(matcher.noise_re, na=False).to_numpy(dtype=bool)
+        if noisy.any():
+            sub_brand[noisy] = [_brand_in_text(matcher, t) for t in sub_titles[noisy]]
+        brand[positions] = sub_brand
+
+        sub_context = context[positions]
+        if matcher.in_title:
+            sub_reason = np.where(
+                ~sub_brand, REASON_NO_BRAND,
+                np.where(matcher.context & ~sub_context, REASON_NO_CONTEXT, None),
+            )
+        else:
+            sub_reason = np.where(sub_brand | sub_context, None, REASON_NO_CONTEXT)
+        rule_reason[positions] = sub_reason
+    relevant = pd.isna(rule_reason)
+
+    reason = np.where(relevant, REASON_KEPT, rule_reason).astype(object)
+    sale = np.array([w in EXCLUDE_WORDS for w in matched[word_hit]], dtype=bool)
+    reason[word_hit] = np.where(sale, REASON_SALE, REASON_FINANCE)
+    reason[price] = REASON_PRICE_ARROW
+    matched = np.where(word_hit & ~price, matched, "").astype(object)
+
+    return pd.DataFrame(
+        {"excluded": excluded, "relevant": relevant, "reason": reason, "matched": matched}, index=index
+    )
 
 
 # ======================================================
 # [3] 네이버 링크 정규화
 # ======================================================
+ART_TOKEN_RE = re.compile(r"\?art=.*$")
+
+
 def canonicalize_link(url: str) -> str:
     """네이버 검색이 붙이는 ?art=<토큰>을 제거 (검색 시점마다 달라져 중복 제거를 방해함)."""
-    return re.sub(r"\?art=.*$", "", str(url))
+    return ART_TOKEN_RE.sub("", str(url))
@@ -0,0 +1,112 @@
+# 크롤링 실행 계측: 단계별 소요 시간, 키워드별 필터 카운터, API 호출 수 → 실행 1회 = JSON 1줄 (voc_store/crawl_runs.jsonl)
+#  - 여러 스레드(네이버 워커, 유튜브 댓글 조회)가 함께 기록. 단계 시간은 스레드별 시간의 합이라 실행 전체 시간보다 클 수 있음
+#  - 대시보드(app.py)의 '수집 실행 지표'에서 실행별 추이로 표시
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+from voc_schema import KST
+
+RUN_LOG_FILE = "crawl_runs.jsonl"
+
+# 표시 순서 (계측하지 않은 단계는 보고서에 나오지 않음)
+STAGES = [
+    "driver_startup", "page_load", "scroll", "extract", "filter", "youtube_api",
+    "merge", "search_index", "cluster", "git_push",
+]
+# 키워드별 카운터: 검색 결과 → 대상 카페 아님 / 최근 글 아님 / 제목 없음 / 판매·주식 / 브랜드 무관 → 수집 → 기존 중복 / 저장
+COUNTERS = ["seen", "off_cafe", "stale", "no_title", "sale", "irrelevant", "collected", "dup", "kept"]
+
+
+class RunMetrics:
+    """실행 1회 동안의 단계 시간·카운터·API 호출 수 (스레드 안전)."""
+
+    def __init__(self, run_id=None):
+        self.run_id = run_id
+        self.started_at = datetime.now(ZoneInfo(KST))
+        self._started = time.perf_counter()
+        self.stages = {}     # 단계 → [초, 횟수]
+        self.counters = {}   # 키워드 → {카운터: 값}
+        self.api_calls = {}  # 호출 종류 → 횟수
+        self.info = {}       # 백엔드·워커 수 등 실행 설정
+        self._lock = threading.Lock()
+        self._log_offset = None
+
+    def restart(self, run_id=None):
+        """새 실행으로 다시 시작 (상주 실행의 보고 구간마다). 다음 write()는 새 줄을 추가."""
+        with self._lock:
+            self.run_id = run_id
+            self.started_at = datetime.now(ZoneInfo(KST))
+            self._started = time.perf_counter()
+            self.stages, self.counters, self.api_calls, self.info = {}, {}, {}, {}
+            self._log_offset = None
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - start)
+
+    def add_time(self, name, seconds, calls=1):
+        with self._lock:
+            total = self.stages.setdefault(name, [0.0, 0])
+            total[0] += seconds
+            total[1] += calls
+
+    def count(self, keyword, counter, n=1):
+        with self._lock:
+            counts = self.counters.setdefault(keyword, {})
+            counts[counter] = counts.get(counter, 0) + int(n)
+
+    def api(self, name, n=1):
+        with self._lock:
+            self.api_calls[name] = self.api_calls.get(name, 0) + int(n)
+
+    def report(self) -> dict:
+        order = {name: i for i, name in enumerate(STAGES)}
+        with self._lock:
+            stages = {
+                name: {"seconds": round(seconds, 3), "calls": calls}
+                for name, (seconds, calls) in sorted(self.stages.items(), key=lambda kv: order.get(kv[0], len(order)))
+            }
+            keywords = {kw: {c: counts[c] for c in COUNTERS if c in counts} for kw, counts in self.counters.items()}
+            return {
+                "run_id": self.run_id,
+                "started_at": self.started_at.isoformat(timespec="seconds"),
+                "wall_seconds": round(time.perf_counter() - self._started, 3),
+                "stages": stages,
+                "keywords": keywords,
+                "api_calls": dict(self.api_calls),
+                **self.info,
+            }
+
+    def write(self, path):
+        """보고서를 JSON lines 파일 끝에 1줄 추가. 같은 실행에서 다시 부르면 그 줄을 최신 값으로 교체."""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        line = json.dumps(self.report(), ensure_ascii=False) + "\n"
+        with open(path, "a+b") as f:
+            if self._log_offset is None:
+                self._log_offset = f.seek(0, os.SEEK_END)
+            f.truncate(self._log_offset)
+            f.seek(self._log_offset)
+            f.write(line.encode("utf-8"))
+
+
+def read_run_reports(path, limit=None) -> list:
+    """실행 보고서 목록 (오래된 것부터, limit이면 마지막 limit개). 깨진 줄은 건너뜀."""
+    if not os.path.exists(path):
+        return []
+    reports = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                reports.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return reports[-limit:] if limit else reports
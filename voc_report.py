@@ -0,0 +1,162 @@
+# 일일 리포트 생성: 신규 행을 키워드별로 한 번만 묶고(build_report), 그 결과를 형식별 렌더러로 출력
+#  - 렌더러: mrkdwn(슬랙 텍스트) / blocks(Block Kit) / plain(일반 텍스트) / html(메일)
+#  - 브랜드가 늘어도 행 스캔은 1회 (브랜드별 필터링 없음)
+#  - collapse=True면 유사 글 묶음(voc_cluster)마다 첫 글 1건만 싣고 건수도 묶음 수로 셈
+import html
+from collections import namedtuple
+
+import numpy as np
+
+from slack_delivery import SECTION_CHARS, split_lines
+from voc_cluster import CLUSTER_COLUMN
+
+Report = namedtuple(
+    "Report", ["date", "dashboard_url", "sk_count", "comp_counts", "sk_items", "comp_items", "youtube_items"]
+)
+# 항목 1개 = (링크, 제목)
+
+EMPTY_LINE = "(특이 사항 없음)"
+
+
+def build_report(df, date, dashboard_url, sk_keywords, comp_keywords, collapse=False) -> Report:
+    """신규 행 DataFrame → Report. 각 구간의 항목 순서는 원래 행 순서를 유지.
+
+    collapse: 클러스터 컬럼이 있으면 구간마다 묶음의 첫 글만 남기고 제목 뒤에 묶인 건수를 붙임.
+    """
+    positions = df.groupby("키워드", sort=False, observed=True).indices
+    links = df["링크"].tolist()
+    titles = df["제목"].tolist()
+    clusters = df[CLUSTER_COLUMN].tolist() if collapse and CLUSTER_COLUMN in df.columns else None
+
+    def rows_of(keywords):
+        found = [positions[kw] for kw in keywords if kw in positions]
+        return np.sort(np.concatenate(found)) if found else np.array([], dtype=int)
+
+    def items(rows):
+        if clusters is None:
+            return [(links[i], titles[i]) for i in rows]
+        first, sizes = {}, {}
+        for i in rows:
+            first.setdefault(clusters[i], i)
+            sizes[clusters[i]] = sizes.get(clusters[i], 0) + 1
+        return [
+            (links[i], titles[i] if sizes[c] == 1 else f"{titles[i]} (유사 글 {sizes[c]}건)") for c, i in first.items()
+        ]
+
+    youtube_keywords = [kw for kw in positions if "유튜브" in str(kw)]
+    sk_items = items(rows_of(sk_keywords))
+    comp_items = {comp: items(rows_of([comp])) for comp in comp_keywords}
+    return Report(
+        date=date,
+        dashboard_url=dashboard_url,
+        sk_count=len(sk_items),
+        comp_counts={comp: len(rows) for comp, rows in comp_items.items()},
+        sk_items=sk_items,
+        comp_items=comp_items,
+        youtube_items=items(rows_of(youtube_keywords)),
+    )
+
+
+def _comp_summary(report):
+    return ", ".join(f"{comp} {count}건" for comp, count in report.comp_counts.items())
+
+
+# ======================================================
+# 렌더러
+# ======================================================
+def render_mrkdwn(report) -> str:
+    """슬랙 mrkdwn 텍스트 (기존 slack_sender 메시지와 같은 형식)."""
+    def bullets(items):
+        return "".join(f"• <{link}|{title}>\n" for link, title in items) if items else f"• {EMPTY_LINE}\n"
+
+    parts = [
+        f"📢 *[{report.date}] SK일렉링크 일일 모니터링*\n\n",
+        f"오늘자 SK일렉링크 커뮤니티 언급된 수는 *{report.sk_count}건*입니다\n",
+        f"({_comp_summary(report)})\n\n",
+        f"📊 *전체 현황 대시보드 보러가기*:\n{report.dashboard_url}\n\n",
+        "📝 *오늘자 당사로 언급된 키워드 (Community)*\n",
+        bullets(report.sk_items),
+    ]
+    comp_sections = [f"\n🔹 *[{comp}]*\n" + bullets(items) for comp, items in report.comp_items.items() if items]
+    if comp_sections:
+        parts.append("\n⚔️ *오늘자 경쟁사 언급 현황*\n")
+        parts.extend(comp_sections)
+    parts.append("\n📺 *[유튜브] 모니터링 이슈 (Video/Comment)*\n")
+    parts.append(bullets(report.youtube_items))
+    return "".join(parts)
+
+
+def render_blocks(report) -> list:
+    """Block Kit 블록 목록 (목록이 길면 section 한도에 맞춰 여러 section으로 나눔)."""
+    def sections(title, items):
+        lines = [title] + ([f"• <{link}|{text}>" for link, text in items] if items else [f"• {EMPTY_LINE}"])
+        return [{"type": "section", "text": {"type": "mrkdwn", "text": chunk}}
+                for chunk in split_lines("\n".join(lines), SECTION_CHARS)]
+
+    blocks = [
+        {"type": "header", "text": {"type": "plain_text", "text": f"📢 [{report.date}] SK일렉링크 일일 모니터링"}},
+        {"type": "section", "text": {"type": "mrkdwn", "text": (
+            f"오늘자 SK일렉링크 커뮤니티 언급된 수는 *{report.sk_count}건*입니다\n({_comp_summary(report)})"
+        )}},
+        {"type": "section", "text": {"type": "mrkdwn", "text": f"📊 <{report.dashboard_url}|*전체 현황 대시보드 보러가기*>"}},
+        {"type": "divider"},
+    ]
+    blocks += sections("📝 *오늘자 당사로 언급된 키워드 (Community)*", report.sk_items)
+    comps = [(comp, items) for comp, items in report.comp_items.items() if items]
+    if comps:
+        blocks.append({"type": "divider"})
+        for comp, items in comps:
+            blocks += sections(f"⚔️ *[{comp}]*", items)
+    blocks.append({"type": "divider"})
+    blocks += sections("📺 *[유튜브] 모니터링 이슈 (Video/Comment)*", report.youtube_items)
+    return blocks
+
+
+def render_plain(report) -> str:
+    """일반 텍스트 (링크는 제목 뒤 괄호)."""
+    def bullets(items):
+        return [f"- {title} ({link})" for link, title in items] if items else [f"- {EMPTY_LINE}"]
+
+    lines = [
+        f"[{report.date}] SK일렉링크 일일 모니터링",
+        "",
+        f"오늘자 SK일렉링크 커뮤니티 언급 수: {report.sk_count}건 ({_comp_summary(report)})",
+        f"대시보드: {report.dashboard_url}",
+        "",
+        "[당사 언급 (Community)]",
+        *bullets(report.sk_items),
+    ]
+    for comp, items in report.comp_items.items():
+        if items:
+            lines += ["", f"[경쟁사: {comp}]", *bullets(items)]
+    lines += ["", "[유튜브 (Video/Comment)]", *bullets(report.youtube_items)]
+    return "\n".join(lines) + "\n"
+
+
+def render_html(report) -> str:
+    """메일 본문용 HTML (제목·링크는 이스케이프)."""
+    esc = html.escape
+
+    def bullets(items):
+        if not items:
+            return f"<ul><li>{EMPTY_LINE}</li></ul>"
+        rows = "".join(f'<li><a href="{esc(str(link))}">{esc(str(title))}</a></li>' for link, title in items)
+        return f"<ul>{rows}</ul>"
+
+    parts = [
+        f"<h2>📢 [{esc(report.date)}] SK일렉링크 일일 모니터링</h2>",
+        f"<p>오늘자 SK일렉링크 커뮤니티 언급된 수는 <b>{report.sk_count}건</b>입니다<br>({esc(_comp_summary(report))})</p>",
+        f'<p>📊 <a href="{esc(report.dashboard_url)}">전체 현황 대시보드 보러가기</a></p>',
+        "<h3>📝 오늘자 당사로 언급된 키워드 (Community)</h3>",
+        bullets(report.sk_items),
+    ]
+    comps = [(comp, items) for comp, items in report.comp_items.items() if items]
+    if comps:
+        parts.append("<h3>⚔️ 오늘자 경쟁사 언급 현황</h3>")
+        parts += [f"<h4>🔹 {esc(comp)}</h4>" + bullets(items) for comp, items in comps]
+    parts.append("<h3>📺 [유튜브] 모니터링 이슈 (Video/Comment)</h3>")
+    parts.append(bullets(report.youtube_items))
+    return "\n".join(parts)
+
+
+RENDERERS = {"mrkdwn": render_mrkdwn, "blocks": render_blocks, "plain": render_plain, "html": render_html}
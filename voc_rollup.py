@@ -0,0 +1,71 @@
+# 일별 집계(rollup): (작성일, 키워드, 출처, 이슈 여부) → 건수
+#  - voc_store/rollup.json : 집계표 + 마지막 동기화 시점의 저장소 행 수
+#  - VocStore.append가 새 행만 더해 갱신 (원본 행을 다시 읽지 않음), 어긋나면 저장소에서 재구성
+#  - 대시보드 지표·추이 차트, 슬랙 요약 건수가 이 표를 사용
+import json
+import os
+
+import pandas as pd
+
+from voc_schema import DATE_FORMAT, source_of
+
+ROLLUP_FILE = "rollup.json"
+ROLLUP_COLUMNS = ["date", "keyword", "source", "issue", "count"]
+
+# 이슈 감지 단어 (대시보드 '이슈 감지'와 같은 기준)
+ISSUE_KEYWORDS = ["고장", "오류", "실패", "안됨", "불편", "느림", "점검", "대기", "화남", "비싸"]
+
+
+def rollup_counts(df) -> pd.DataFrame:
+    """VoC 행(문자열 또는 voc_schema 타입) → 집계 행 (ROLLUP_COLUMNS). 문자열 작성일은 앞 10자리만 사용."""
+    if df is None or df.empty:
+        return pd.DataFrame(columns=ROLLUP_COLUMNS)
+    dates = df["작성일"]
+    if isinstance(dates.dtype, pd.DatetimeTZDtype):
+        dates = dates.dt.strftime(DATE_FORMAT)
+    keywords = df["키워드"].astype(str)
+    keys = pd.DataFrame({
+        "date": dates.astype(str).str[:10],
+        "keyword": keywords,
+        "source": source_of(keywords),
+        "issue": df["제목"].astype(str).str.contains("|".join(ISSUE_KEYWORDS), na=False).astype(int),
+    })
+    return keys.groupby(ROLLUP_COLUMNS[:-1], sort=True).size().reset_index(name="count")
+
+
+def merge_counts(frames) -> pd.DataFrame:
+    """집계 행 여러 묶음을 같은 키끼리 합산."""
+    frames = [f for f in frames if f is not None and not f.empty]
+    if not frames:
+        return pd.DataFrame(columns=ROLLUP_COLUMNS)
+    merged = pd.concat(frames, ignore_index=True)
+    return merged.groupby(ROLLUP_COLUMNS[:-1], sort=True)["count"].sum().reset_index()
+
+
+class Rollup:
+    """rollup.json 1개. counts는 (date, keyword, source, issue) 정렬된 DataFrame."""
+
+    def __init__(self, path):
+        self.path = path
+        self.synced_rows = None
+        self.counts = pd.DataFrame(columns=ROLLUP_COLUMNS)
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            self.synced_rows = data.get("rows")
+            self.counts = pd.DataFrame(data.get("counts", []), columns=ROLLUP_COLUMNS)
+
+    def add(self, df, synced_rows):
+        """새로 저장된 행만 집계에 더함."""
+        self.counts = merge_counts([self.counts, rollup_counts(df)])
+        self.synced_rows = synced_rows
+
+    def rebuild(self, frames, synced_rows):
+        """VoC 행 DataFrame 순회(파티션 단위 등)로 처음부터 다시 집계."""
+        self.counts = merge_counts([rollup_counts(df) for df in frames])
+        self.synced_rows = synced_rows
+
+    def to_json(self) -> str:
+        """저장용 JSON (쓰기는 VocStore가 atomic_write_text로)."""
+        rows = self.counts.astype({"issue": int, "count": int}).values.tolist()
+        return json.dumps({"rows": self.synced_rows, "counts": rows}, ensure_ascii=False, separators=(",", ":"))
@@ -0,0 +1,374 @@
+# 필터 규칙 버전 관리: 행별 판정을 규칙 해시와 함께 저장하고, 규칙을 고치면 영향받는 행만 재판정해 미리보기
+#  - voc_store/rules.json : 판정 기준 규칙표 (마지막 apply 시점, 규칙 수정과 함께 커밋하는 작은 파일)
+#      없으면 crawler.py가 배포된 규칙으로 만들어 커밋 — 기준 없이 diff하면 고친 규칙끼리 비교하게 되므로 오류
+#  - voc_store/verdicts.sqlite3 (커밋하지 않음 — 없으면 저장소와 rules.json으로 다시 만듦)
+#      verdicts : 수집순번별 키워드·제목·판정(사유, 유지 여부)·규칙 해시
+#      grams    : 소문자 제목의 2글자 조각 → 수집순번 (역색인, 단어가 들어 있는 제목 후보 찾기)
+#      rules    : 규칙 해시 → 그 시점의 규칙표(JSON)
+#  - 규칙 수정 → 기준 규칙표와 현재 voc_filters 규칙을 비교해 바뀐 단어·키워드만 추림
+#    → 역색인으로 후보 행만 골라 재판정 → 유지/삭제가 뒤집히는 행 목록(diff)
+#    python voc_rules.py init                 # 기준 규칙표가 없을 때 현재 규칙으로 생성 (규칙을 고치기 전에)
+#    python voc_rules.py sync                 # 저장소의 새 행을 기준 규칙으로 판정해 색인
+#    python voc_rules.py diff --out diff.csv  # 규칙 수정의 영향 미리보기 (데이터는 그대로)
+#    python voc_rules.py apply                # 저장된 판정·rules.json을 현재 규칙 기준으로 갱신 (실제 삭제는 clean_history.py)
+import hashlib
+import json
+import os
+import re
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime
+
+import pandas as pd
+
+import voc_filters
+from voc_filters import classify_titles
+from voc_schema import SEQ_COLUMN
+from voc_store import STORE_DIR, VocStore, atomic_write_text
+
+VERDICTS_FILE = "verdicts.sqlite3"
+RULES_FILE = "rules.json"
+SYNC_CHUNK_ROWS = 50_000
+DIFF_COLUMNS = [SEQ_COLUMN, "키워드", "제목", "이전 사유", "새 사유", "이전 유지", "새 유지"]
+
+
+# ======================================================
+# [1] 규칙표 스냅샷·해시
+# ======================================================
+def _keyword_rule(snapshot, keyword):
+    """스냅샷에서 키워드 규칙 (없으면 voc_filters 기본 규칙과 같은 값)."""
+    rule = snapshot["keywords"].get(keyword, {})
+    return {
+        "names": sorted(rule.get("names", [keyword])),
+        "noise": list(rule.get("noise", [])),
+        "in_title": bool(rule.get("in_title")),
+        "context": bool(rule.get("context")),
+    }
+
+
+def rules_snapshot():
+    """현재 voc_filters 규칙표 (해시·비교용 JSON 호환 dict)."""
+    return {
+        "price_arrow": voc_filters.PRICE_ARROW_RE.pattern,
+        "exclude": list(voc_filters.EXCLUDE_WORDS),
+        "finance": list(voc_filters.FINANCE_WORDS),
+        "context_kr": list(voc_filters.CHARGING_CONTEXT_KR),
+        "context_en": list(voc_filters.CHARGING_CONTEXT_EN),
+        "keywords": {kw: dict(rule) for kw, rule in voc_filters.KEYWORD_RULES.items()},
+    }
+
+
+def rules_hash(snapshot) -> str:
+    text = json.dumps(snapshot, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:12]
+
+
+@contextmanager
+def rules_applied(snapshot):
+    """voc_filters 규칙표를 잠시 snapshot 내용으로 바꿈 (규칙표 내용이 캐시 키라 바로 다시 컴파일됨).
+
+    모듈 전역을 바꾸므로 필터를 쓰는 다른 스레드가 없을 때(이 스크립트)만 사용.
+    """
+    if rules_hash(snapshot) == rules_hash(rules_snapshot()):
+        yield
+        return
+    saved = {name: getattr(voc_filters, name) for name in
+             ("PRICE_ARROW_RE", "EXCLUDE_WORDS", "FINANCE_WORDS", "CHARGING_CONTEXT_KR", "CHARGING_CONTEXT_EN", "KEYWORD_RULES")}
+    voc_filters.PRICE_ARROW_RE = re.compile(snapshot["price_arrow"], saved["PRICE_ARROW_RE"].flags)
+    voc_filters.EXCLUDE_WORDS = list(snapshot["exclude"])
+    voc_filters.FINANCE_WORDS = list(snapshot["finance"])
+    voc_filters.CHARGING_CONTEXT_KR = list(snapshot["context_kr"])
+    voc_filters.CHARGING_CONTEXT_EN = list(snapshot["context_en"])
+    voc_filters.KEYWORD_RULES = {kw: dict(rule) for kw, rule in snapshot["keywords"].items()}
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            setattr(voc_filters, name, value)
+
+
+def changed_terms(old, new):
+    """두 규칙표의 차이 → (모든 키워드에 영향 주는 단어, {키워드: 단어}, 전체 재판정할 키워드, 전체 재판정 여부)."""
+    if old["price_arrow"] != new["price_arrow"]:
+        return set(), {}, set(), True
+    global_terms = set()
+    for name in ("exclude", "finance", "context_kr", "context_en"):
+        global_terms |= set(old[name]) ^ set(new[name])
+
+    keyword_terms, whole_keywords = {}, set()
+    for keyword in set(old["keywords"]) | set(new["keywords"]):
+        before, after = _keyword_rule(old, keyword), _keyword_rule(new, keyword)
+        if before == after:
+            continue
+        if before["in_title"] != after["in_title"] or before["context"] != after["context"]:
+            whole_keywords.add(keyword)
+            continue
+        # 노이즈는 순서대로 치환되므로 순서만 바뀌어도 해당 단어가 든 제목은 다시 봄
+        noise = set(before["noise"]) ^ set(after["noise"])
+        if before["noise"] != after["noise"] and not noise:
+            noise = set(after["noise"])
+        keyword_terms[keyword] = noise | (set(before["names"]) ^ set(after["names"]))
+    return global_terms, keyword_terms, whole_keywords, False
+
+
+def write_baseline(path, snapshot):
+    atomic_write_text(path, json.dumps(
+        {"hash": rules_hash(snapshot), "applied": datetime.now().isoformat(timespec="seconds"), "snapshot": snapshot},
+        ensure_ascii=False, indent=1, sort_keys=True,
+    ))
+
+
+def seed_baseline(root=STORE_DIR) -> bool:
+    """기준 규칙표가 없으면 현재 규칙으로 만듦 (crawler.py가 매 실행 호출 — 배포된 규칙이 기준). 만들었으면 True."""
+    path = os.path.join(root, RULES_FILE)
+    if os.path.exists(path):
+        return False
+    os.makedirs(root, exist_ok=True)
+    write_baseline(path, rules_snapshot())
+    return True
+
+
+# ======================================================
+# [2] 판정 색인
+# ======================================================
+def title_grams(title):
+    """소문자 제목의 2글자 조각 (끝에 공백을 붙여 모든 글자가 어떤 조각의 첫 글자가 되도록)."""
+    text = str(title).lower() + " "
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+def _is_naver(keywords):
+    return ~keywords.astype(str).str.contains("유튜브", na=False)
+
+
+def _verdicts(df):
+    """keyword·title 컬럼 DataFrame → 현재 규칙 판정 (clean_history.py와 같은 유지 기준)."""
+    verdict = classify_titles(df["keyword"], df["title"])
+    naver = _is_naver(df["keyword"]).to_numpy()
+    kept = ~(naver & (verdict["excluded"].to_numpy() | ~verdict["relevant"].to_numpy()))
+    return verdict.assign(kept=kept)
+
+
+class VerdictIndex:
+    def __init__(self, path, rules_path=None):
+        self.path = path
+        self.rules_path = rules_path or os.path.join(os.path.dirname(path) or ".", RULES_FILE)
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(
+            "CREATE TABLE IF NOT EXISTS verdicts (seq INTEGER PRIMARY KEY, keyword TEXT, title TEXT, "
+            "reason TEXT, matched TEXT, kept INTEGER, rules_hash TEXT);"
+            "CREATE INDEX IF NOT EXISTS verdicts_keyword ON verdicts (keyword);"
+            "CREATE INDEX IF NOT EXISTS verdicts_hash ON verdicts (rules_hash);"
+            "CREATE TABLE IF NOT EXISTS grams (gram TEXT, seq INTEGER, PRIMARY KEY (gram, seq)) WITHOUT ROWID;"
+            "CREATE TABLE IF NOT EXISTS rules (hash TEXT PRIMARY KEY, snapshot TEXT, created TEXT);"
+        )
+        self.conn.commit()
+
+    @classmethod
+    def of_store(cls, store):
+        os.makedirs(store.root, exist_ok=True)
+        return cls(os.path.join(store.root, VERDICTS_FILE))
+
+    def close(self):
+        self.conn.close()
+
+    def _register_rules(self, snapshot):
+        digest = rules_hash(snapshot)
+        self.conn.execute(
+            "INSERT OR IGNORE INTO rules VALUES (?, ?, ?)",
+            (digest, json.dumps(snapshot, ensure_ascii=False, sort_keys=True), datetime.now().isoformat(timespec="seconds")),
+        )
+        return digest
+
+    def baseline(self):
+        """판정 기준 규칙표 (rules.json). 없으면 FileNotFoundError (현재 규칙으로 대신하면 diff가 항상 비어 보임)."""
+        if not os.path.exists(self.rules_path):
+            raise FileNotFoundError(
+                f"기준 규칙표가 없습니다: {self.rules_path} — git에서 받아오거나, "
+                "규칙을 고치기 전 상태에서 'python voc_rules.py init'으로 만드세요"
+            )
+        with open(self.rules_path, encoding="utf-8") as f:
+            return json.load(f)["snapshot"]
+
+    def _snapshot(self, digest):
+        row = self.conn.execute("SELECT snapshot FROM rules WHERE hash = ?", (digest,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def last_seq(self) -> int:
+        return self.conn.execute("SELECT COALESCE(MAX(seq), 0) FROM verdicts").fetchone()[0]
+
+    def sync(self, store: VocStore, chunksize=SYNC_CHUNK_ROWS) -> int:
+        """저장소에서 아직 색인하지 않은 행(수집순번 기준)을 기준 규칙(rules.json)으로 판정해 추가. 추가한 행 수.
+
+        색인 파일이 없으면 전체를 다시 판정 — 규칙을 고친 뒤라도 기준 규칙으로 판정하므로 diff가 그대로 나옴.
+        """
+        rows = store.rows_after(self.last_seq())
+        if rows.empty:
+            return 0
+        baseline = self.baseline()
+        with self.conn, rules_applied(baseline):
+            digest = self._register_rules(baseline)
+            for start in range(0, len(rows), chunksize):
+                chunk = rows.iloc[start:start + chunksize]
+                df = pd.DataFrame({
+                    "seq": chunk[SEQ_COLUMN].astype(int).to_numpy(),
+                    "keyword": chunk["키워드"].astype(str).to_numpy(),
+                    "title": chunk["제목"].astype(str).to_numpy(),
+                })
+                verdict = _verdicts(df)
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO verdicts VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    zip(df["seq"].tolist(), df["keyword"], df["title"], verdict["reason"], verdict["matched"],
+                        verdict["kept"].astype(int).tolist(), [digest] * len(df)),
+                )
+                self.conn.executemany(
+                    "INSERT OR IGNORE INTO grams VALUES (?, ?)",
+                    ((gram, seq) for seq, title in zip(df["seq"].tolist(), df["title"]) for gram in title_grams(title)),
+                )
+        return len(rows)
+
+    # --------------------------------------------------
+    # 후보 찾기 (역색인)
+    # --------------------------------------------------
+    def _containing(self, term, digest, keyword=None):
+        """제목(소문자)에 term이 들어 있는, digest 규칙으로 판정된 행의 수집순번."""
+        term = term.lower()
+        if len(term) >= 2:
+            grams = sorted({term[i:i + 2] for i in range(len(term) - 1)})
+            found = self.conn.execute(
+                f"SELECT seq FROM grams WHERE gram IN ({','.join('?' * len(grams))}) "
+                "GROUP BY seq HAVING COUNT(*) = ?", (*grams, len(grams))
+            ).fetchall()
+        else:
+            # 1글자 단어: 그 글자로 시작하는 조각 범위
+            found = self.conn.execute(
+                "SELECT DISTINCT seq FROM grams WHERE gram >= ? AND gram < ?", (term, term + "\U0010ffff")
+            ).fetchall()
+        seqs = [seq for (seq,) in found]
+        if not seqs:
+            return set()
+        # 조각이 모두 있어도 연속이 아닐 수 있으니 실제 포함 여부 확인
+        result = set()
+        query = "SELECT seq, keyword, title, rules_hash FROM verdicts WHERE seq IN ({})"
+        for start in range(0, len(seqs), 900):
+            batch = seqs[start:start + 900]
+            for seq, kw, title, row_hash in self.conn.execute(query.format(",".join("?" * len(batch))), batch):
+                if row_hash == digest and (keyword is None or kw == keyword) and term in title.lower():
+                    result.add(seq)
+        return result
+
+    def candidates(self, new_snapshot):
+        """현재와 다른 규칙으로 판정된 행 중, 규칙 차이로 결과가 바뀔 수 있는 행의 수집순번."""
+        new_digest = rules_hash(new_snapshot)
+        seqs = set()
+        old_digests = [d for (d,) in self.conn.execute("SELECT DISTINCT rules_hash FROM verdicts") if d != new_digest]
+        for digest in old_digests:
+            old_snapshot = self._snapshot(digest)
+            if old_snapshot is None:
+                everything = True
+            else:
+                global_terms, keyword_terms, whole_keywords, everything = changed_terms(old_snapshot, new_snapshot)
+            if everything:
+                seqs |= {seq for (seq,) in self.conn.execute("SELECT seq FROM verdicts WHERE rules_hash = ?", (digest,))}
+                continue
+            for term in global_terms:
+                seqs |= self._containing(term, digest)
+            for keyword, terms in keyword_terms.items():
+                for term in terms:
+                    seqs |= self._containing(term, digest, keyword)
+            for keyword in whole_keywords:
+                seqs |= {seq for (seq,) in self.conn.execute(
+                    "SELECT seq FROM verdicts WHERE rules_hash = ? AND keyword = ?", (digest, keyword)
+                )}
+        return sorted(seqs), old_digests
+
+    # --------------------------------------------------
+    # 재판정·diff
+    # --------------------------------------------------
+    def _reevaluate(self, seqs):
+        frames = []
+        query = "SELECT seq, keyword, title, reason, kept FROM verdicts WHERE seq IN ({})"
+        for start in range(0, len(seqs), 900):
+            batch = seqs[start:start + 900]
+            frames.append(pd.read_sql_query(query.format(",".join("?" * len(batch))), self.conn, params=batch))
+        if not frames:
+            return pd.DataFrame(columns=["seq", "keyword", "title", "reason", "kept", "new_reason", "new_matched", "new_kept"])
+        old = pd.concat(frames, ignore_index=True)
+        verdict = _verdicts(old)
+        return old.assign(new_reason=verdict["reason"], new_matched=verdict["matched"], new_kept=verdict["kept"])
+
+    def diff(self):
+        """현재 규칙으로 바꿀 때 유지/삭제가 뒤집히는 행. (diff DataFrame, 재판정한 행 수, 전체 행 수)."""
+        seqs, _ = self.candidates(rules_snapshot())
+        evaluated = self._reevaluate(seqs)
+        flipped = evaluated[evaluated["kept"].astype(bool) != evaluated["new_kept"].astype(bool)]
+        diff = pd.DataFrame({
+            SEQ_COLUMN: flipped["seq"],
+            "키워드": flipped["keyword"],
+            "제목": flipped["title"],
+            "이전 사유": flipped["reason"],
+            "새 사유": flipped["new_reason"],
+            "이전 유지": flipped["kept"].astype(bool),
+            "새 유지": flipped["new_kept"].astype(bool),
+        }, columns=DIFF_COLUMNS).reset_index(drop=True)
+        total = self.conn.execute("SELECT COUNT(*) FROM verdicts").fetchone()[0]
+        return diff, len(seqs), total
+
+    def apply(self):
+        """후보 행만 재판정해 저장하고, 나머지 행은 규칙 해시만 현재 규칙으로 옮김. 갱신한 행 수."""
+        snapshot = rules_snapshot()
+        seqs, old_digests = self.candidates(snapshot)
+        evaluated = self._reevaluate(seqs)
+        with self.conn:
+            digest = self._register_rules(snapshot)
+            self.conn.executemany(
+                "UPDATE verdicts SET reason = ?, matched = ?, kept = ? WHERE seq = ?",
+                zip(evaluated["new_reason"], evaluated["new_matched"], evaluated["new_kept"].astype(int).tolist(),
+                    evaluated["seq"].tolist()),
+            )
+            for old in old_digests:
+                self.conn.execute("UPDATE verdicts SET rules_hash = ? WHERE rules_hash = ?", (digest, old))
+        write_baseline(self.rules_path, snapshot)
+        return len(evaluated)
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description="필터 규칙 변경 영향 분석")
+    parser.add_argument("command", choices=["init", "sync", "diff", "apply"])
+    parser.add_argument("--out", help="diff 결과를 저장할 CSV 경로")
+    args = parser.parse_args()
+
+    if args.command == "init":
+        if not seed_baseline(STORE_DIR):
+            parser.exit(1, f"이미 기준 규칙표가 있습니다: {os.path.join(STORE_DIR, RULES_FILE)} (갱신은 apply)\n")
+        print(f"✅ 현재 규칙 {rules_hash(rules_snapshot())}을 기준으로 {os.path.join(STORE_DIR, RULES_FILE)} 생성")
+        sys.exit(0)
+
+    store = VocStore(STORE_DIR)
+    index = VerdictIndex.of_store(store)
+    try:
+        added = index.sync(store)
+        index.baseline()
+    except FileNotFoundError as e:
+        index.close()
+        parser.exit(1, f"❌ {e}\n")
+    if added:
+        print(f"📇 새 행 {added}건 판정·색인 (기준 규칙 {rules_hash(index.baseline())})")
+
+    if args.command == "diff":
+        diff, evaluated, total = index.diff()
+        print(f"🔎 전체 {total}행 중 후보 {evaluated}행 재판정 → 뒤집히는 행 {len(diff)}건 "
+              f"(삭제 {int((~diff['새 유지']).sum())} / 복구 {int(diff['새 유지'].sum())})")
+        if args.out:
+            diff.to_csv(args.out, index=False, encoding="utf-8-sig")
+            print(f"   → {args.out}")
+        else:
+            with pd.option_context("display.max_rows", 200, "display.width", 200, "display.max_colwidth", 60):
+                print(diff.to_string(index=False) if not diff.empty else "   (변화 없음)")
+    elif args.command == "apply":
+        print(f"✅ {index.apply()}행 재판정, 저장된 판정을 규칙 {rules_hash(rules_snapshot())} 기준으로 갱신 "
+              f"(→ {index.rules_path}를 규칙 수정과 함께 커밋)")
+    index.close()
@@ -0,0 +1,107 @@
+# VoC 행 스키마: 디스크(CSV·저장소 파티션)는 문자열 그대로, 메모리에서는 타입이 있는 컴팩트한 DataFrame
+#  - 작성일·수집시점 → KST datetime (정렬·기간 필터가 문자열 비교가 아닌 시각 비교)
+#  - 키워드·카페명·실행ID·출처 → category (반복되는 값은 코드 1개로)
+#  - 수집순번 → Int64
+#  다시 저장할 때는 to_storage()로 원래 문자열 형식으로 되돌린다.
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import pandas as pd
+
+KST = "Asia/Seoul"
+DATE_FORMAT = "%Y-%m-%d"          # 작성일
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M"  # 수집시점
+
+COLUMNS = ["작성일", "키워드", "카페명", "제목", "링크", "수집시점"]
+SEQ_COLUMN = "수집순번"
+RUN_COLUMN = "실행ID"
+STORED_COLUMNS = COLUMNS + [SEQ_COLUMN, RUN_COLUMN]
+SOURCE_COLUMN = "출처"  # 메모리에서만 쓰는 파생 컬럼 (저장하지 않음)
+
+# 예전 포맷의 신규 표시 — 날짜로 읽을 때는 떼어냄
+NEW_TAG = " (New)"
+
+# 출처 (키워드로 결정)
+SOURCE_NAVER = "naver"
+SOURCE_YT_VIDEO = "youtube_video"
+SOURCE_YT_COMMENT = "youtube_comment"
+YOUTUBE_SOURCES = {"유튜브(영상)": SOURCE_YT_VIDEO, "유튜브(댓글)": SOURCE_YT_COMMENT}
+
+DATETIME_COLUMNS = {"작성일": DATE_FORMAT, "수집시점": TIMESTAMP_FORMAT}
+CATEGORY_COLUMNS = ["키워드", "카페명", RUN_COLUMN, SOURCE_COLUMN]
+# 수집 레코드에서 줄바꿈을 정리할 자유 텍스트 컬럼
+TEXT_COLUMNS = ["카페명", "제목", "링크"]
+
+
+def source_of(keywords: pd.Series) -> pd.Series:
+    return keywords.astype(str).map(YOUTUBE_SOURCES).fillna(SOURCE_NAVER)
+
+
+def parse_datetime(values: pd.Series, fmt) -> pd.Series:
+    """문자열 → KST datetime. " (New)" 표시는 무시하고, 형식이 다른 값은 NaT."""
+    values = values.astype(str).str.replace(NEW_TAG, "", regex=False)
+    return pd.to_datetime(values, format=fmt, errors="coerce").dt.tz_localize(KST)
+
+
+def typed(df: pd.DataFrame) -> pd.DataFrame:
+    """문자열 DataFrame(read_csv dtype=str 등) → 스키마 타입. 없는 컬럼은 건너뜀."""
+    df = df.copy()
+    for column, fmt in DATETIME_COLUMNS.items():
+        if column in df.columns:
+            df[column] = parse_datetime(df[column], fmt)
+    if SEQ_COLUMN in df.columns:
+        df[SEQ_COLUMN] = pd.to_numeric(df[SEQ_COLUMN], errors="coerce").astype("Int64")
+    if "키워드" in df.columns:
+        df[SOURCE_COLUMN] = source_of(df["키워드"])
+    for column in CATEGORY_COLUMNS:
+        if column in df.columns:
+            df[column] = df[column].astype("category")
+    return df
+
+
+def to_storage(df: pd.DataFrame) -> pd.DataFrame:
+    """스키마 타입 DataFrame → 저장용 문자열 (파생 컬럼 제외, 날짜는 원래 형식)."""
+    df = df.drop(columns=[SOURCE_COLUMN], errors="ignore").copy()
+    for column, fmt in DATETIME_COLUMNS.items():
+        if column in df.columns and isinstance(df[column].dtype, pd.DatetimeTZDtype):
+            df[column] = df[column].dt.strftime(fmt).fillna("")
+    for column in df.columns:
+        df[column] = df[column].astype(str).where(df[column].notna(), "")
+    return df
+
+
+def read_voc_csv(path, **kwargs) -> pd.DataFrame:
+    """electlink_voc.csv·저장소 파티션 형식 파일을 스키마 타입으로 읽기 (chunksize를 주면 청크 반복자)."""
+    reader = pd.read_csv(path, dtype=str, keep_default_na=False, **kwargs)
+    if kwargs.get("chunksize"):
+        return (typed(chunk) for chunk in reader)
+    return typed(reader)
+
+
+def kst_now() -> datetime:
+    """현재 한국 시각 (tz 없는 datetime — 실행 환경의 시간대와 무관)."""
+    return datetime.now(ZoneInfo(KST)).replace(tzinfo=None)
+
+
+def new_record(keyword, cafe, title, link, now=None) -> dict:
+    """수집 레코드 1개 (COLUMNS 필드). 작성일·수집시점은 now(기본: 현재 KST) 기준."""
+    now = now or kst_now()
+    return {
+        "작성일": now.strftime(DATE_FORMAT),
+        "키워드": keyword,
+        "카페명": cafe,
+        "제목": title,
+        "링크": link,
+        "수집시점": now.strftime(TIMESTAMP_FORMAT),
+    }
+
+
+def records_frame(records) -> pd.DataFrame:
+    """수집 레코드(dict 목록) → 저장용 문자열 DataFrame (COLUMNS 순서).
+
+    CSV 행이 깨지지 않도록 자유 텍스트 컬럼의 줄바꿈만 공백으로 바꾼다.
+    """
+    df = pd.DataFrame(records, columns=COLUMNS).fillna("").astype(str)
+    for column in TEXT_COLUMNS:
+        df[column] = df[column].str.replace(r"[\r\n]+", " ", regex=True).str.strip()
+    return df
@@ -0,0 +1,165 @@
+# 제목 전문 검색 색인 (SQLite FTS5, 한글 2글자 조각 토큰화) — 대시보드(app.py) 검색창에서 사용
+#  - voc_store/search.sqlite3 (커밋하지 않음 — 없으면 sync가 저장소 전체를 다시 색인, 대시보드는 뜰 때 한 번)
+#      docs : 수집순번별 작성일·키워드·출처·카페명·제목·링크 (키워드·출처·기간 필터용)
+#      fts  : 제목을 단어별 2글자 조각으로 바꾼 토큰열 + 키워드·출처 토큰 (rowid = 수집순번)
+#  - 검색어도 같은 방식으로 조각내 '연속한 조각' 구문 검색 → 부분 문자열 일치 (예: '카드' → '채비카드')
+#    (FTS5 trigram 토크나이저는 3글자 미만 검색어를 못 찾아 2글자가 많은 한글 검색어에 맞지 않음)
+#  - 키워드·출처 필터도 FTS 안에서 처리하고 수집순번 역순으로 읽다가 limit에서 멈춤 (건수는 COUNT_CAP까지만 셈)
+#  - 저장소에 새 행이 생기면 수집순번 이후만 추가 (crawler.py가 매 실행 sync)
+#    python voc_search.py "충전 오류" --keyword 채비 --since 2026-01-01
+import os
+import re
+import sqlite3
+import threading
+
+import pandas as pd
+
+from voc_schema import DATE_FORMAT, SEQ_COLUMN, source_of
+from voc_store import STORE_DIR, VocStore
+
+SEARCH_FILE = "search.sqlite3"
+SYNC_CHUNK_ROWS = 50_000
+MAX_RESULTS = 500
+COUNT_CAP = 5000  # 일치 건수를 이 수까지만 셈 (넘으면 'COUNT_CAP건 이상')
+RESULT_COLUMNS = [SEQ_COLUMN, "작성일", "키워드", "출처", "카페명", "제목", "링크"]
+
+_NON_WORD = re.compile(r"[\W_]+")
+
+
+def _words(text):
+    return _NON_WORD.sub(" ", str(text).lower()).split()
+
+
+def title_tokens(title) -> str:
+    """제목 → FTS 토큰열. 단어마다 2글자 조각 + 마지막 글자 1개 (1글자 검색어는 이 글자로 시작하는 조각과 접두 일치)."""
+    tokens = []
+    for word in _words(title):
+        tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+        tokens.append(word[-1])
+    return " ".join(tokens)
+
+
+def label_token(value) -> str:
+    """키워드·출처 값 → FTS 토큰 1개 (예: '유튜브(영상)' → '유튜브영상')."""
+    return "".join(_words(value))
+
+
+def match_query(query, keywords=None, sources=None):
+    """검색어 → FTS5 MATCH 식 (공백으로 나눈 단어 모두 포함, AND). 검색할 단어가 없으면 None."""
+    terms = []
+    for word in _words(query):
+        if len(word) == 1:
+            terms.append(f'tokens : "{word}"*')
+        else:
+            terms.append('tokens : "' + " ".join(word[i:i + 2] for i in range(len(word) - 1)) + '"')
+    if not terms:
+        return None
+    for column, values in (("keyword", keywords), ("source", sources)):
+        if values:
+            terms.append(f"{column} : (" + " OR ".join(f'"{label_token(v)}"' for v in values) + ")")
+    return " AND ".join(terms)
+
+
+class SearchIndex:
+    """저장소 행의 제목 검색 색인. 대시보드 세션(스레드)끼리 공유하므로 연결 1개를 잠금으로 보호."""
+
+    def __init__(self, path):
+        self.path = path
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self.conn.executescript(
+            "CREATE TABLE IF NOT EXISTS docs (seq INTEGER PRIMARY KEY, date TEXT, keyword TEXT, source TEXT, "
+            "cafe TEXT, title TEXT, link TEXT);"
+            "CREATE INDEX IF NOT EXISTS docs_date ON docs (date);"
+            "CREATE VIRTUAL TABLE IF NOT EXISTS fts USING fts5(tokens, keyword, source, content='', tokenize='unicode61');"
+        )
+        self.conn.commit()
+
+    @classmethod
+    def of_store(cls, store):
+        os.makedirs(store.root, exist_ok=True)
+        return cls(os.path.join(store.root, SEARCH_FILE))
+
+    def close(self):
+        self.conn.close()
+
+    def last_seq(self) -> int:
+        with self._lock:
+            return self.conn.execute("SELECT COALESCE(MAX(seq), 0) FROM docs").fetchone()[0]
+
+    def sync(self, store: VocStore, chunksize=SYNC_CHUNK_ROWS) -> int:
+        """저장소에서 아직 색인하지 않은 행(수집순번 기준)을 추가. 추가한 행 수."""
+        if store.last_seq() <= self.last_seq():
+            return 0
+        rows = store.rows_after(self.last_seq())
+        with self._lock, self.conn:
+            for start in range(0, len(rows), chunksize):
+                chunk = rows.iloc[start:start + chunksize]
+                seqs = chunk[SEQ_COLUMN].astype(int).tolist()
+                titles = chunk["제목"].astype(str).tolist()
+                keywords = chunk["키워드"].astype(str).tolist()
+                sources = source_of(chunk["키워드"]).tolist()
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO docs VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    zip(seqs, chunk["작성일"].astype(str), keywords, sources,
+                        chunk["카페명"].astype(str), titles, chunk["링크"].astype(str)),
+                )
+                self.conn.executemany(
+                    "INSERT INTO fts (rowid, tokens, keyword, source) VALUES (?, ?, ?, ?)",
+                    ((seq, title_tokens(title), label_token(kw), label_token(src))
+                     for seq, title, kw, src in zip(seqs, titles, keywords, sources)),
+                )
+        return len(rows)
+
+    def search(self, query, keywords=None, sources=None, start=None, end=None, limit=MAX_RESULTS):
+        """제목 검색 (최신 수집순). (결과 DataFrame, 일치 건수 — 최대 COUNT_CAP). start·end는 'YYYY-MM-DD' (포함)."""
+        match = match_query(query, keywords, sources)
+        if match is None:
+            return pd.DataFrame(columns=RESULT_COLUMNS), 0
+        where, params = ["fts MATCH ?"], [match]
+        if start:
+            where.append("d.date >= ?")
+            params.append(start)
+        if end:
+            where.append("d.date <= ?")
+            params.append(end)
+        body = f"FROM fts JOIN docs d ON d.seq = fts.rowid WHERE {' AND '.join(where)}"
+        with self._lock:
+            rows = self.conn.execute(
+                f"SELECT d.seq, d.date, d.keyword, d.source, d.cafe, d.title, d.link {body} "
+                "ORDER BY fts.rowid DESC LIMIT ?",
+                params + [limit],
+            ).fetchall()
+            total = len(rows) if len(rows) < limit else self.conn.execute(
+                f"SELECT COUNT(*) FROM (SELECT 1 {body} LIMIT ?)", params + [COUNT_CAP]
+            ).fetchone()[0]
+        result = pd.DataFrame(rows, columns=RESULT_COLUMNS)
+        result["작성일"] = pd.to_datetime(result["작성일"], format=DATE_FORMAT, errors="coerce")
+        return result, total
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="VoC 제목 검색")
+    parser.add_argument("query")
+    parser.add_argument("--keyword", action="append", help="키워드 필터 (여러 번 지정 가능)")
+    parser.add_argument("--source", action="append", help="출처 필터: naver / youtube_video / youtube_comment")
+    parser.add_argument("--since", help="작성일 시작 (YYYY-MM-DD)")
+    parser.add_argument("--until", help="작성일 끝 (YYYY-MM-DD)")
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    store = VocStore(STORE_DIR)
+    index = SearchIndex.of_store(store)
+    added = index.sync(store)
+    if added:
+        print(f"📇 새 행 {added}건 색인")
+    started = time.perf_counter()
+    result, total = index.search(args.query, args.keyword, args.source, args.since, args.until, args.limit)
+    unit = "건 이상" if total >= COUNT_CAP else "건"
+    print(f"🔎 '{args.query}' {total}{unit} ({(time.perf_counter() - started) * 1000:.1f}ms)")
+    with pd.option_context("display.width", 200, "display.max_colwidth", 60):
+        print(result.drop(columns=["링크"]).to_string(index=False))
+    index.close()
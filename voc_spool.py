@@ -0,0 +1,78 @@
+# 크롤링 중간 결과 보관(spool): 키워드(수집 단위) 1개가 끝날 때마다 레코드를 JSON lines 파일에 1줄로 추가
+#  - crawl_spool/run-<실행ID>.jsonl — 1줄 = {"unit": "naver:채비", "records": [...], "at": ...}
+#  - 실행이 중간에 죽어도(크롬 크래시·작업 시간 초과) 끝난 키워드의 결과는 남음
+#  - 저장소 병합이 끝나면 파일 삭제. 남아 있는 파일 = 병합하지 못한 실행
+#    python crawler.py --resume   # 마지막 미완료 실행을 이어서: 끝난 키워드는 건너뛰고 보관분과 합쳐 저장
+import json
+import os
+import threading
+from datetime import datetime
+
+SPOOL_DIR = os.environ.get("CRAWL_SPOOL_DIR", "crawl_spool")
+_PREFIX, _SUFFIX = "run-", ".jsonl"
+
+
+class CrawlSpool:
+    """실행 1회의 수집 단위별 결과 (여러 워커 스레드가 함께 기록)."""
+
+    def __init__(self, path):
+        self.path = path
+        self.units = {}
+        self._lock = threading.Lock()
+        self._broken_tail = False
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                # 마지막 줄이 잘려 있으면 다음 기록은 새 줄에서 시작 (잘린 줄에 이어 붙지 않도록)
+                if f.seek(0, os.SEEK_END):
+                    f.seek(-1, os.SEEK_END)
+                    self._broken_tail = f.read(1) != b"\n"
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # 기록 도중 죽어 잘린 마지막 줄 — 그 단위는 끝나지 않은 것으로 봄
+                        continue
+                    self.units[entry["unit"]] = entry["records"]
+
+    @property
+    def run_id(self):
+        return os.path.basename(self.path)[len(_PREFIX):-len(_SUFFIX)]
+
+    @classmethod
+    def create(cls, run_id, spool_dir=SPOOL_DIR):
+        os.makedirs(spool_dir, exist_ok=True)
+        return cls(os.path.join(spool_dir, f"{_PREFIX}{run_id}{_SUFFIX}"))
+
+    @classmethod
+    def pending(cls, spool_dir=SPOOL_DIR):
+        """병합하지 못하고 남은 실행들 (오래된 것부터)."""
+        if not os.path.isdir(spool_dir):
+            return []
+        names = sorted(n for n in os.listdir(spool_dir) if n.startswith(_PREFIX) and n.endswith(_SUFFIX))
+        return [cls(os.path.join(spool_dir, name)) for name in names]
+
+    def done(self, unit) -> bool:
+        return unit in self.units
+
+    def record(self, unit, records):
+        """수집 단위 1개의 결과를 파일 끝에 1줄로 추가하고 디스크까지 내려씀."""
+        line = json.dumps(
+            {"unit": unit, "records": records, "at": datetime.now().isoformat(timespec="seconds")}, ensure_ascii=False
+        )
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(("\n" if self._broken_tail else "") + line + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self._broken_tail = False
+            self.units[unit] = records
+
+    def records(self, order=()):
+        """보관된 레코드 전체. order에 있는 단위를 그 순서로 먼저, 나머지는 기록 순서대로."""
+        units = [u for u in order if u in self.units] + [u for u in self.units if u not in order]
+        return [record for unit in units for record in self.units[unit]]
+
+    def remove(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
@@ -0,0 +1,440 @@
+# VoC 저장소: 수집월별 파티션 CSV에 신규 행만 이어 쓰는 append-only 저장 계층
+#  - voc_store/YYYY-MM.csv : 수집시점 기준 월 파티션 (한 번 쓴 행은 다시 쓰지 않음)
+#  - voc_store/state.json  : 파티션별 행 수·수집순번 범위, 다음 수집순번, 마지막으로 보고한 수집순번
+#  - voc_store/dedup.sqlite3 : 정규화된 (키워드, 링크) 중복 제거 인덱스 (저장소에서 언제든 재구성 가능)
+#  - voc_store/rollup.json : 일별 (키워드, 출처, 이슈 여부) 건수 집계 (voc_rollup.py, 저장소에서 재구성 가능)
+#  - electlink_voc.csv     : 대시보드 호환용 export (새 행만 이어 씀)
+#  모든 행에는 수집순번(저장 순서대로 1, 2, 3 …)과 실행ID가 붙는다. "보고 후 새로 들어온 행"은
+#  state.json의 reported_seq보다 큰 수집순번 — 예전처럼 작성일에 " (New)"를 붙였다 떼며 파일을 고쳐 쓰지 않는다.
+import json
+import os
+import sqlite3
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from voc_filters import canonicalize_link
+from voc_rollup import ROLLUP_FILE, Rollup
+# 컬럼 정의는 voc_schema가 원본 (기존 import 경로 유지를 위해 여기서도 노출)
+# NEW_TAG: 예전 포맷의 신규 표시 — 이관할 때 '아직 보고 안 된 행'으로 해석하고 떼어냄
+from voc_schema import COLUMNS, NEW_TAG, RUN_COLUMN, SEQ_COLUMN, STORED_COLUMNS
+
+STORE_DIR = "voc_store"
+STATE_FILE = "state.json"
+DEDUP_FILE = "dedup.sqlite3"
+STATE_VERSION = 2
+LEGACY_RUN_ID = "legacy"  # 수집순번 도입 전 행 (마이그레이션)
+IMPORT_CHUNK_ROWS = 100_000
+
+
+def atomic_write_text(path, text):
+    """임시 파일에 쓴 뒤 교체 (쓰는 도중 죽어도 기존 파일은 온전히 남음)."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+def atomic_write_csv(df, path):
+    tmp_path = f"{path}.tmp"
+    df.to_csv(tmp_path, index=False, encoding="utf-8-sig")
+    os.replace(tmp_path, path)
+
+
+def new_run_id() -> str:
+    return datetime.now().strftime("%Y%m%d-%H%M%S")
+
+
+def partition_key(row_time) -> str:
+    """'2026-08-22 08:21' / '2026-08-22 (New)' → '2026-08'."""
+    return str(row_time)[:7]
+
+
+class DedupIndex:
+    """정규화된 (키워드, 링크) 키를 담는 SQLite 인덱스.
+
+    신규 배치의 중복 판정이 배치 크기에만 비례하도록, 과거 데이터를 읽지 않고
+    기본키 조회로만 확인한다. meta.rows에 마지막 동기화 시점의 저장소 행 수를 기록해
+    저장소와 어긋나면 재구성 대상임을 알 수 있게 한다.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        # 상주 실행은 수집기별 스레드에서 저장 (voc_daemon의 _save_lock으로 한 번에 하나씩이라 연결 공유 가능)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS voc_keys (keyword TEXT NOT NULL, link TEXT NOT NULL, "
+            "PRIMARY KEY (keyword, link)) WITHOUT ROWID"
+        )
+        self.conn.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value INTEGER)")
+        self.conn.commit()
+
+    @staticmethod
+    def keys_of(df):
+        return list(zip(df["키워드"].astype(str), df["링크"].astype(str).map(canonicalize_link)))
+
+    def contains(self, keys):
+        """키 목록 중 인덱스에 이미 있는 것마다 True."""
+        lookup = "SELECT 1 FROM voc_keys WHERE keyword = ? AND link = ?"
+        return [self.conn.execute(lookup, key).fetchone() is not None for key in keys]
+
+    def add(self, keys, synced_rows=None):
+        with self.conn:
+            self.conn.executemany("INSERT OR IGNORE INTO voc_keys VALUES (?, ?)", keys)
+            if synced_rows is not None:
+                self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('rows', ?)", (synced_rows,))
+
+    def synced_rows(self):
+        row = self.conn.execute("SELECT value FROM meta WHERE name = 'rows'").fetchone()
+        return row[0] if row else None
+
+    def rebuild(self, frames, synced_rows):
+        """(키워드, 링크) 컬럼이 있는 DataFrame 순회로 인덱스를 처음부터 다시 만듦 (저장소/CSV 공용)."""
+        # 도중에 실패하면 동기화 기록이 없는 상태로 남아 다음 사용 시 다시 재구성됨
+        with self.conn:
+            self.conn.execute("DELETE FROM voc_keys")
+            self.conn.execute("DELETE FROM meta")
+        for df in frames:
+            self.add(self.keys_of(df))
+        self.add([], synced_rows)
+
+    def close(self):
+        self.conn.close()
+
+
+class VocStore:
+    """월 파티션 CSV + 상태 파일로 구성된 VoC 저장소.
+
+    append()는 새 행에 수집순번을 매겨 속한 파티션 끝에만 쓴다. 수집순번은 파티션 안에서도
+    증가 순이라, 어떤 순번 이후의 행(rows_after)은 해당 파티션만 골라 이진 탐색으로 읽는다.
+    """
+
+    def __init__(self, root=STORE_DIR):
+        self.root = root
+        self.state_path = os.path.join(root, STATE_FILE)
+        self.state = self._load_state()
+        self._dedup = None
+        self._rollup = None
+
+    # --------------------------------------------------
+    # 상태 파일
+    # --------------------------------------------------
+    def _load_state(self):
+        state = {"rows": {}, "recent": {}}
+        if os.path.exists(self.state_path):
+            with open(self.state_path, encoding="utf-8") as f:
+                state = json.load(f)
+        if state.get("version") == STATE_VERSION:
+            return state
+        # 예전 포맷(최근 배치 범위 방식)이거나 상태 파일이 없으면 파티션에서 다시 구성
+        return self._migrate_v1(state.get("recent", {}))
+
+    def _migrate_v1(self, recent):
+        """수집순번이 없는 파티션에 순번·실행ID를 붙여 고쳐 쓰고 상태 파일을 새 포맷으로 만든다.
+
+        최근 배치 범위(recent, 파티션 끝부분)에 있던 행은 다른 행보다 큰 순번을 받아
+        '아직 보고되지 않은 행'으로 남는다. 이미 순번이 있는 파티션은 그대로 둔다.
+        """
+        frames = {key: self._read_partition(key) for key in self.partitions()}
+        next_seq = 1 + max(
+            (int(f[SEQ_COLUMN].astype(int).max()) for f in frames.values() if SEQ_COLUMN in f and len(f)), default=0
+        )
+        legacy = [key for key, f in frames.items() if SEQ_COLUMN not in f.columns]
+        for key in legacy:
+            frames[key] = frames[key].reindex(columns=STORED_COLUMNS, fill_value="")
+            frames[key][RUN_COLUMN] = LEGACY_RUN_ID
+
+        def number(key, start, end):
+            nonlocal next_seq
+            column = frames[key].columns.get_loc(SEQ_COLUMN)
+            frames[key].iloc[start:end, column] = [str(n) for n in range(next_seq, next_seq + end - start)]
+            next_seq += end - start
+
+        tails = {key: recent.get(key, [len(frames[key])])[0] for key in legacy}
+        for key in legacy:
+            number(key, 0, tails[key])
+        reported_seq = next_seq - 1
+        for key in legacy:
+            number(key, tails[key], len(frames[key]))
+            atomic_write_csv(frames[key], self._partition_path(key))
+
+        self.state = {
+            "version": STATE_VERSION,
+            "rows": {key: len(f) for key, f in frames.items()},
+            "seq": {key: [int(f[SEQ_COLUMN].iloc[0]), int(f[SEQ_COLUMN].iloc[-1])] for key, f in frames.items() if len(f)},
+            "next_seq": next_seq,
+            "reported_seq": reported_seq,
+        }
+        if frames:
+            self._save_state()
+        return self.state
+
+    def refresh(self):
+        """상태 파일을 다시 읽음 (상주 실행 중 다른 프로세스가 고친 보고 위치 등을 덮어쓰지 않도록)."""
+        self.state = self._load_state()
+
+    def _save_state(self):
+        os.makedirs(self.root, exist_ok=True)
+        atomic_write_text(self.state_path, json.dumps(self.state, ensure_ascii=False, indent=1, sort_keys=True))
+
+    # --------------------------------------------------
+    # 파티션
+    # --------------------------------------------------
+    def exists(self) -> bool:
+        return os.path.isdir(self.root) and bool(self.partitions())
+
+    def partitions(self):
+        """저장된 파티션 키 목록 (오래된 순)."""
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(name[:-4] for name in os.listdir(self.root) if name.endswith(".csv"))
+
+    def _partition_path(self, key):
+        return os.path.join(self.root, f"{key}.csv")
+
+    def _read_partition(self, key, usecols=None):
+        return pd.read_csv(self._partition_path(key), usecols=usecols, dtype=str, keep_default_na=False)
+
+    # --------------------------------------------------
+    # 쓰기
+    # --------------------------------------------------
+    def append(self, df_new: pd.DataFrame, run_id=None) -> int:
+        """신규 행에 수집순번·실행ID를 붙여 수집월 파티션 끝에 이어 씀. 기록한 행 수를 반환."""
+        if df_new is None or df_new.empty:
+            return 0
+        df_new = df_new[COLUMNS].astype(str)
+        df_new["작성일"] = df_new["작성일"].str.replace(NEW_TAG, "", regex=False)
+        first = self.state["next_seq"]
+        df_new[SEQ_COLUMN] = [str(n) for n in range(first, first + len(df_new))]
+        df_new[RUN_COLUMN] = run_id or new_run_id()
+        return self._write(df_new)
+
+    def _write(self, df_new):
+        """수집순번이 붙은 행(순번 오름차순)을 파티션별로 이어 쓰고 상태·집계 갱신."""
+        if df_new.empty:
+            return 0
+        os.makedirs(self.root, exist_ok=True)
+        rollup = self.rollup  # 이번 배치를 쓰기 전 상태와 맞춰 둠
+        keys = df_new["수집시점"].map(partition_key)
+        for key, part in df_new[STORED_COLUMNS].groupby(keys, sort=True):
+            path = self._partition_path(key)
+            is_new_file = not os.path.exists(path)
+            part.to_csv(path, mode="a", header=is_new_file, index=False, encoding="utf-8-sig")
+
+            self.state["rows"][key] = self.state["rows"].get(key, 0) + len(part)
+            first = self.state["seq"].get(key, [int(part[SEQ_COLUMN].iloc[0])])[0]
+            self.state["seq"][key] = [first, int(part[SEQ_COLUMN].iloc[-1])]
+        self.state["next_seq"] = max(self.state["next_seq"], int(df_new[SEQ_COLUMN].astype(int).max()) + 1)
+        self._save_state()
+        rollup.add(df_new, self.total_rows())
+        self._save_rollup()
+        return len(df_new)
+
+    def total_rows(self) -> int:
+        return sum(self.state["rows"].values())
+
+    def _open_dedup(self) -> DedupIndex:
+        if self._dedup is None:
+            os.makedirs(self.root, exist_ok=True)
+            self._dedup = DedupIndex(os.path.join(self.root, DEDUP_FILE))
+        return self._dedup
+
+    @property
+    def dedup(self) -> DedupIndex:
+        """중복 제거 인덱스 (없거나 저장소와 행 수가 어긋나면 저장소에서 재구성)."""
+        index = self._open_dedup()
+        if index.synced_rows() != self.total_rows():
+            self.rebuild_dedup()
+        return index
+
+    def rebuild_dedup(self, frames=None):
+        """저장소 파티션(또는 주어진 CSV 청크 등)으로 중복 인덱스를 다시 만듦."""
+        if frames is None:
+            frames = self.iter_columns(["키워드", "링크"])
+        self._open_dedup().rebuild(frames, self.total_rows())
+
+    def _open_rollup(self) -> Rollup:
+        if self._rollup is None:
+            self._rollup = Rollup(os.path.join(self.root, ROLLUP_FILE))
+        return self._rollup
+
+    @property
+    def rollup(self) -> Rollup:
+        """일별 집계 (없거나 저장소와 행 수가 어긋나면 저장소에서 재구성)."""
+        rollup = self._open_rollup()
+        if rollup.synced_rows != self.total_rows():
+            self.rebuild_rollup()
+        return rollup
+
+    def rebuild_rollup(self):
+        self._open_rollup().rebuild(self.iter_columns(["작성일", "키워드", "제목"]), self.total_rows())
+        self._save_rollup()
+
+    def _save_rollup(self):
+        os.makedirs(self.root, exist_ok=True)
+        atomic_write_text(self._rollup.path, self._rollup.to_json())
+
+    def append_unique(self, df_new: pd.DataFrame, run_id=None) -> pd.DataFrame:
+        """(키워드, 정규화 링크) 기준 신규 행만 append. 실제로 추가된 행을 반환.
+
+        네이버 링크의 ?art= 토큰이 검색 시점마다 달라지므로 정규화한 링크로 비교하고,
+        같은 글도 키워드별로는 각각 1건 허용한다.
+        """
+        if df_new is None or df_new.empty:
+            return pd.DataFrame(columns=COLUMNS)
+        df_new = df_new.assign(링크=df_new["링크"].astype(str).map(canonicalize_link))
+        df_new = df_new.drop_duplicates(subset=["키워드", "링크"])
+        keys = DedupIndex.keys_of(df_new)
+        dedup = self.dedup  # 쓰기 전에 한 번만 확인 (쓴 뒤 다시 property를 거치면 행 수가 어긋나 재구성됨)
+        is_dup = dedup.contains(keys)
+        df_final = df_new[[not dup for dup in is_dup]]
+        self.append(df_final, run_id)
+        dedup.add([key for key, dup in zip(keys, is_dup) if not dup], self.total_rows())
+        return df_final
+
+    def last_seq(self) -> int:
+        """지금까지 저장된 마지막 수집순번 (없으면 0)."""
+        return self.state["next_seq"] - 1
+
+    def mark_reported(self, upto=None):
+        """upto(기본: 마지막 수집순번)까지 보고 완료로 기록 (행은 건드리지 않고 상태만 갱신)."""
+        upto = self.last_seq() if upto is None else upto
+        if upto != self.state["reported_seq"]:
+            self.state["reported_seq"] = upto
+            self._save_state()
+
+    # --------------------------------------------------
+    # 읽기
+    # --------------------------------------------------
+    def __iter__(self):
+        """파티션 단위 DataFrame을 오래된 순으로 순회 (전체를 한 번에 메모리에 올리지 않음)."""
+        for key in self.partitions():
+            yield self._read_partition(key)
+
+    def iter_columns(self, usecols):
+        """필요한 컬럼만 파티션 단위로 순회 (중복 키 수집 등)."""
+        for key in self.partitions():
+            yield self._read_partition(key, usecols=usecols)
+
+    def rows_after(self, seq) -> pd.DataFrame:
+        """수집순번이 seq보다 큰 행 (해당 순번 범위를 가진 파티션만 읽음)."""
+        frames = []
+        for key, (_, last) in sorted(self.state["seq"].items()):
+            if last <= seq:
+                continue
+            part = self._read_partition(key)
+            start = np.searchsorted(part[SEQ_COLUMN].astype(int).to_numpy(), seq, side="right")
+            frames.append(part.iloc[start:])
+        if not frames:
+            return pd.DataFrame(columns=STORED_COLUMNS)
+        return pd.concat(frames, ignore_index=True).sort_values(
+            SEQ_COLUMN, key=lambda col: col.astype(int), kind="stable", ignore_index=True
+        )
+
+    def unreported(self) -> pd.DataFrame:
+        """마지막 보고 이후 저장된 행 (슬랙 리포트 대상)."""
+        return self.rows_after(self.state["reported_seq"])
+
+    def load(self) -> pd.DataFrame:
+        frames = list(self)
+        if not frames:
+            return pd.DataFrame(columns=STORED_COLUMNS)
+        return pd.concat(frames, ignore_index=True)
+
+    # --------------------------------------------------
+    # 기존 CSV 호환 (export / 최초 이관)
+    # --------------------------------------------------
+    def export_csv(self, path):
+        """electlink_voc.csv 형식(+수집순번·실행ID)으로 내보내기. 기존 export 뒤에 새 행만 이어 씀.
+
+        파일이 없거나 지난 export 이후 바뀌었으면(크기 불일치) 전체를 다시 쓴다. 기록한 행 수를 반환.
+        """
+        exported = self.state.get("export") or {}
+        if exported.get("path") == path and os.path.exists(path) and os.path.getsize(path) == exported.get("size"):
+            df = self.rows_after(exported["seq"])
+            if not df.empty:
+                df.to_csv(path, mode="a", header=False, index=False, encoding="utf-8-sig")
+        else:
+            df = self.load()
+            atomic_write_csv(df, path)
+        self.state["export"] = {"path": path, "seq": self.last_seq(), "size": os.path.getsize(path)}
+        self._save_state()
+        return len(df)
+
+    @classmethod
+    def import_csv(cls, csv_path, root=STORE_DIR, replace=False, reported_seq=None, chunksize=IMPORT_CHUNK_ROWS):
+        """electlink_voc.csv 형식 파일로 저장소를 구성 (chunksize행씩 읽어 메모리 사용량 제한).
+
+        - 수집순번이 있는 export: 순번·실행ID를 그대로 유지. reported_seq가 없으면 전부 보고된 것으로 봄
+          (파티션별로는 파일 순서가 순번 순서여야 함 — export_csv·clean_history.py 출력은 항상 그렇다)
+        - 예전 포맷: 작성일에 " (New)"가 붙은 행만 '아직 보고 안 된 행'으로 이관 (파일을 두 번 읽음)
+        replace=True면 기존 저장소(파티션·상태·집계·sqlite 색인)를 지우고 다시 만든다 (clean_history.py 등).
+        같은 폴더의 실행 로그·YouTube 수집 상태·규칙 기준(rules.json) 등 다른 파일은 그대로 둔다.
+        다음 수집순번은 이전 저장소 것을 이어받는다 (정리로 끝 행이 지워져도 이미 쓴·보고한 순번을 다시 쓰지 않도록).
+        """
+        carried_seq = 1
+        state_path = os.path.join(root, STATE_FILE)
+        if replace and os.path.exists(state_path):
+            with open(state_path, encoding="utf-8") as f:
+                carried_seq = json.load(f).get("next_seq", 1)
+        if replace and os.path.isdir(root):
+            for name in os.listdir(root):
+                if name.endswith(".csv") or name in (STATE_FILE, ROLLUP_FILE) or ".sqlite3" in name:
+                    os.remove(os.path.join(root, name))
+        store = cls(root)
+        if store.exists():
+            raise FileExistsError(f"이미 저장소가 있습니다: {root}")
+        header = pd.read_csv(csv_path, dtype=str, nrows=0).columns
+        if "키워드" not in header:
+            # 구버전 포맷은 이관하지 않음 (빈 저장소로 시작)
+            return store
+
+        def chunks():
+            for chunk in pd.read_csv(csv_path, dtype=str, keep_default_na=False, chunksize=chunksize):
+                chunk["링크"] = chunk["링크"].map(canonicalize_link)
+                yield chunk
+
+        if SEQ_COLUMN in header:
+            for chunk in chunks():
+                chunk = chunk.reindex(columns=STORED_COLUMNS, fill_value="")
+                chunk = chunk.sort_values(SEQ_COLUMN, key=lambda col: col.astype(int), kind="stable")
+                store._write(chunk)
+            store.mark_reported(reported_seq)
+        else:
+            for new_pass in (False, True):
+                for chunk in chunks():
+                    chunk = chunk.reindex(columns=COLUMNS, fill_value="")
+                    is_new = chunk["작성일"].str.contains(NEW_TAG, regex=False)
+                    store.append(chunk[is_new if new_pass else ~is_new], LEGACY_RUN_ID)
+                if not new_pass:
+                    store.mark_reported()
+        if store.state["next_seq"] < carried_seq:
+            store.state["next_seq"] = carried_seq
+            store._save_state()
+        store.rebuild_dedup()
+        return store
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="VoC 저장소 관리")
+    parser.add_argument("command", choices=["rebuild-dedup", "rebuild-rollup", "migrate"])
+    parser.add_argument("--csv", help="rebuild-dedup: 저장소 대신 이 CSV로 재구성 / migrate: 저장소가 없을 때 이관할 CSV")
+    args = parser.parse_args()
+
+    store = VocStore(STORE_DIR)
+    if args.command == "rebuild-dedup":
+        frames = pd.read_csv(args.csv, usecols=["키워드", "링크"], dtype=str, keep_default_na=False, chunksize=50_000) if args.csv else None
+        store.rebuild_dedup(frames)
+        count = store.dedup.conn.execute("SELECT COUNT(*) FROM voc_keys").fetchone()[0]
+        print(f"✅ 중복 인덱스 재구성 완료: 키 {count}개")
+    elif args.command == "migrate":
+        # 예전 저장소는 VocStore()를 여는 순간 새 포맷으로 바뀜. CSV만 있으면 저장소로 이관
+        if not store.exists() and args.csv:
+            store = VocStore.import_csv(args.csv, STORE_DIR)
+        print(f"✅ 저장소 포맷 v{store.state['version']}: {store.total_rows()}행, "
+              f"마지막 수집순번 {store.last_seq()}, 보고 완료 {store.state['reported_seq']}")
+    elif args.command == "rebuild-rollup":
+        store.rebuild_rollup()
+        print(f"✅ 일별 집계 재구성 완료: {len(store.rollup.counts)}행")
@@ -0,0 +1,220 @@
+# YouTube Data API 호출 계층: 재시도·백오프, 쿼터(unit) 집계, 댓글 병렬 조회 (crawler.py에서 사용)
+#  - 서비스 객체는 service_factory로 주입 → 로컬 가짜 API 객체로도 그대로 돌려볼 수 있음
+#  - googleapiclient 서비스(httplib2)는 스레드 간 공유가 안전하지 않아 스레드마다 따로 만든다
+import json
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from googleapiclient.errors import HttpError
+
+from voc_store import atomic_write_text
+
+# 메서드별 쿼터 비용 (https://developers.google.com/youtube/v3/determine_quota_cost)
+QUOTA_COST = {"search.list": 100, "videos.list": 1, "commentThreads.list": 1}
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+RETRY_REASONS = {"rateLimitExceeded", "userRateLimitExceeded", "backendError"}
+MAX_RETRIES = 3
+SEARCH_PAGE_SIZE = 50   # search.list maxResults 상한
+VIDEOS_BATCH_SIZE = 50  # videos.list id 개수 상한
+COMMENT_PAGE_SIZE = 100 # commentThreads.list maxResults 상한
+API_TIME_FORMAT = "%Y-%m-%dT%H:%M:%SZ"  # RFC 3339 (UTC) — 문자열 비교로 선후 판정 가능
+
+
+class QuotaBudgetExceeded(Exception):
+    """이번 실행에 허용한 쿼터 예산을 넘기는 호출을 막을 때 발생."""
+
+
+class QuotaMeter:
+    """실행 1회 동안 쓴 쿼터 unit과 메서드별 호출 수 (여러 스레드에서 함께 기록)."""
+
+    def __init__(self, budget=None):
+        self.budget = budget
+        self.units = 0
+        self.calls = {}
+        self._lock = threading.Lock()
+
+    def charge(self, method):
+        cost = QUOTA_COST.get(method, 1)
+        with self._lock:
+            if self.budget is not None and self.units + cost > self.budget:
+                raise QuotaBudgetExceeded(f"{method}: {self.units}+{cost} > 예산 {self.budget}")
+            self.units += cost
+            self.calls[method] = self.calls.get(method, 0) + 1
+
+    def summary(self):
+        return {"units": self.units, "calls": dict(self.calls), "budget": self.budget}
+
+
+def _error_reason(err):
+    try:
+        return json.loads(err.content)["error"]["errors"][0]["reason"]
+    except Exception:
+        return ""
+
+
+def _is_retryable(err):
+    status = getattr(err.resp, "status", None)
+    return status in RETRY_STATUSES or _error_reason(err) in RETRY_REASONS
+
+
+class YouTubeClient:
+    def __init__(self, service_factory, meter=None, max_retries=MAX_RETRIES):
+        self.service_factory = service_factory
+        self.meter = meter or QuotaMeter()
+        self.max_retries = max_retries
+        self._local = threading.local()
+
+    @property
+    def service(self):
+        if getattr(self._local, "service", None) is None:
+            self._local.service = self.service_factory()
+        return self._local.service
+
+    def execute(self, method, make_request):
+        """요청 1건 실행. 일시적 오류(429/5xx/rate limit)는 지수 백오프로 재시도하고, 시도마다 쿼터를 집계."""
+        for attempt in range(self.max_retries + 1):
+            self.meter.charge(method)
+            try:
+                return make_request(self.service).execute()
+            except HttpError as err:
+                if attempt == self.max_retries or not _is_retryable(err):
+                    raise
+                time.sleep(2 ** attempt + random.random())
+
+    def search_video_ids(self, max_videos, **params):
+        """search.list를 nextPageToken으로 이어 받아 중복 없는 영상 ID를 최대 max_videos개 반환."""
+        video_ids = []
+        seen_ids = set()
+        page_token = None
+        while len(video_ids) < max_videos:
+            page_params = dict(params, part="id", type="video", maxResults=min(SEARCH_PAGE_SIZE, max_videos - len(video_ids)))
+            if page_token:
+                page_params["pageToken"] = page_token
+            response = self.execute("search.list", lambda s: s.search().list(**page_params))
+            for item in response.get("items", []):
+                vid_id = item["id"]["videoId"]
+                if vid_id not in seen_ids:
+                    video_ids.append(vid_id)
+                    seen_ids.add(vid_id)
+            page_token = response.get("nextPageToken")
+            if not page_token:
+                break
+        return video_ids[:max_videos]
+
+    def videos(self, video_ids):
+        """videos.list(snippet, statistics)를 50개 단위로 조회."""
+        items = []
+        for i in range(0, len(video_ids), VIDEOS_BATCH_SIZE):
+            ids = ",".join(video_ids[i:i + VIDEOS_BATCH_SIZE])
+            response = self.execute("videos.list", lambda s: s.videos().list(id=ids, part="snippet,statistics"))
+            items.extend(response.get("items", []))
+        return items
+
+    def comment_threads(self, video_id, since=None, page_size=COMMENT_PAGE_SIZE, max_pages=1):
+        """영상 1개의 최상위 댓글 (최신순). since(워터마크)보다 새 댓글만, 최대 max_pages 페이지.
+
+        반환: (items, truncated). 댓글 비활성화·예산 초과 등으로 페이지를 다 못 읽으면 그때까지 받은 댓글과
+        truncated=True — 이때는 워터마크를 옮기지 말아야 읽지 못한 예전 댓글을 다음 실행이 다시 읽음.
+        """
+        items = []
+        page_token = None
+        for _ in range(max_pages):
+            params = dict(videoId=video_id, part="snippet", textFormat="plainText", order="time", maxResults=page_size)
+            if page_token:
+                params["pageToken"] = page_token
+            try:
+                response = self.execute("commentThreads.list", lambda s: s.commentThreads().list(**params))
+            except (HttpError, QuotaBudgetExceeded):
+                return items, True
+            for item in response.get("items", []):
+                if since and comment_published_at(item) <= since:
+                    return items, False  # 최신순이라 이후는 모두 이미 본 댓글
+                items.append(item)
+            page_token = response.get("nextPageToken")
+            if not page_token:
+                break
+        return items, False
+
+    def comment_threads_many(self, watermarks, page_size, max_pages, workers):
+        """{video_id: 워터마크(없으면 None)}의 새 댓글을 최대 workers개 동시 조회.
+
+        반환: ({video_id: items} (입력 순서 유지), 페이지가 중간에 끊긴 video_id 집합).
+        """
+        video_ids = list(watermarks)
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            results = dict(zip(video_ids, executor.map(
+                lambda vid: self.comment_threads(vid, watermarks[vid], page_size, max_pages), video_ids
+            )))
+        comments = {vid: items for vid, (items, _) in results.items()}
+        return comments, {vid for vid, (_, truncated) in results.items() if truncated}
+
+
+def comment_published_at(item):
+    return item["snippet"]["topLevelComment"]["snippet"].get("publishedAt", "")
+
+
+class YouTubeCrawlState:
+    """증분 수집 상태 (JSON 파일).
+
+    - cursor: 마지막으로 성공한 검색 시각 — 다음 실행은 이 시각(조금 겹치게) 이후 영상만 검색
+    - cursors: 주제별 검색 시각 (상주 실행에서 주제를 따로 검색할 때, 전체 cursor보다 늦은 쪽을 씀)
+    - videos: 추적 중인 영상별 {first_seen, watermark(본 댓글 중 가장 새 publishedAt)}
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.cursor = None
+        self.cursors = {}
+        self.videos = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            self.cursor = data.get("cursor")
+            self.cursors = data.get("cursors", {})
+            self.videos = data.get("videos", {})
+
+    def published_after(self, now, default_window, overlap, topic=None):
+        """검색 시작 시각: 커서가 있으면 커서-overlap, 없으면(첫 실행) now-default_window."""
+        cursor = max(filter(None, [self.cursor, self.cursors.get(topic)]), default=None)
+        if cursor:
+            start = datetime.strptime(cursor, API_TIME_FORMAT) - overlap
+        else:
+            start = now - default_window
+        return start.strftime(API_TIME_FORMAT)
+
+    def tracked(self, now, horizon):
+        """추적 기간(horizon) 안의 영상 {video_id: watermark}."""
+        limit = (now - horizon).strftime(API_TIME_FORMAT)
+        return {vid: info.get("watermark") for vid, info in self.videos.items() if info["first_seen"] >= limit}
+
+    def track(self, video_id, now):
+        self.videos.setdefault(video_id, {"first_seen": now.strftime(API_TIME_FORMAT), "watermark": None})
+
+    def advance_watermark(self, video_id, comments):
+        if comments and video_id in self.videos:
+            newest = max(comment_published_at(c) for c in comments)
+            current = self.videos[video_id].get("watermark")
+            if not current or newest > current:
+                self.videos[video_id]["watermark"] = newest
+
+    def save(self, now, horizon, topic=None, advance=True):
+        """커서(topic이면 그 주제의 커서)를 now로 옮기고, 추적 기간이 지난 영상은 정리한 뒤 저장.
+
+        advance=False면 커서는 그대로 둠 (검색 없이 추적 영상 댓글만 확인한 경우).
+        """
+        if advance and topic:
+            self.cursors[topic] = now.strftime(API_TIME_FORMAT)
+        elif advance:
+            self.cursor = now.strftime(API_TIME_FORMAT)
+        tracked = self.tracked(now, horizon)
+        self.videos = {vid: info for vid, info in self.videos.items() if vid in tracked}
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        atomic_write_text(self.path, json.dumps(
+            {"cursor": self.cursor, "cursors": self.cursors, "videos": self.videos},
+            ensure_ascii=False, indent=1, sort_keys=True,
+        ))